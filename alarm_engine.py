@@ -0,0 +1,199 @@
+import numpy as np
+
+
+# Client-side alarm evaluation: the low / high limits of sensors_config.json compiled
+# into NumPy arrays, a whole frame (evaluate) or a batch of frames (evaluate_block)
+# checked in one call.
+# A real PLC feed carries no alarm status, and a value hovering around a limit would
+# flap the alarm table every sample, so every sensor can also have:
+#   hysteresis   an alarm only clears once the value is back inside the band by this much
+#   debounce_s   a new state must hold this long before it is reported (both directions)
+#   rate_limit   max |change| per second, faster changes raise a RATE ALARM
+# Only transitions are reported; the state of each sensor is kept between calls.
+
+STATUS_OK = 0
+STATUS_LOW = 1
+STATUS_HIGH = 2
+STATUS_RATE = 3
+STATUS_NAMES = ["OK", "LOW ALARM", "HIGH ALARM", "RATE ALARM"]  # first three match wire_protocol
+
+DEFAULTS = {"hysteresis": 0.0, "debounce_s": 0.0, "rate_limit": None}
+
+
+class AlarmEngine:
+
+    def __init__(self, sensor_settings, defaults=None):
+        defaults = {**DEFAULTS, **(defaults or {})}
+        self.names = list(sensor_settings)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        settings = [sensor_settings[name] for name in self.names]
+
+        def column(key, missing):
+            # per-sensor setting, the engine default, `missing` where neither is set
+            values = [s.get(key, defaults.get(key)) for s in settings]
+            return np.array([missing if v is None else v for v in values], dtype=np.float64)
+
+        self.low = column('low', -np.inf)  # sensors without limits never alarm
+        self.high = column('high', np.inf)
+        self.hysteresis = column('hysteresis', 0.0)
+        self.debounce = column('debounce_s', 0.0)
+        self.rate_limit = column('rate_limit', np.inf)
+        # Stages no sensor uses are skipped, a frame costs a handful of array operations
+        self._hysteresis = bool(np.any(self.hysteresis))
+        self._debounce = bool(np.any(self.debounce > 0))
+        self._rate = bool(np.any(np.isfinite(self.rate_limit)))
+
+        n = len(self.names)
+        self.state = np.zeros(n, dtype=np.int8)  # reported status code
+        self.pending = np.zeros(n, dtype=np.int8)  # status waiting for its debounce time
+        self.pending_since = np.zeros(n)
+        self.last_value = np.full(n, np.nan)  # previous sample, for the rate of change
+        self.last_time = np.full(n, np.nan)
+
+    @classmethod
+    def from_config(cls, config, sensor_settings=None):
+        """Engine over `sensor_settings` (default: config['sensors']) with the config['alarms'] defaults."""
+        return cls(config['sensors'] if sensor_settings is None else sensor_settings, config.get('alarms'))
+
+    def __len__(self):
+        return len(self.names)
+
+    def evaluate(self, ids, values, now):
+        """Check one sample of the sensors `ids` (indices into names) taken at unix time `now`.
+
+        Returns (codes, changed): the reported status code of every sample and the
+        positions in `ids` whose status changed with this sample.
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        state = self.state[ids]
+
+        # Limits, widened by the hysteresis band while the sensor is in that alarm
+        low, high = self.low[ids], self.high[ids]
+        if self._hysteresis:
+            band = self.hysteresis[ids]
+            low = np.where(state == STATUS_LOW, low + band, low)
+            high = np.where(state == STATUS_HIGH, high - band, high)
+        target = (values > high).astype(np.int8) * STATUS_HIGH
+        target[values < low] = STATUS_LOW
+
+        # Rate of change since the previous sample (none for the first one)
+        if self._rate:
+            elapsed = now - self.last_time[ids]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rate = np.abs(values - self.last_value[ids]) / elapsed
+            target[(target == STATUS_OK) & (elapsed > 0) & (rate > self.rate_limit[ids])] = STATUS_RATE
+            self.last_value[ids] = values
+            self.last_time[ids] = now
+
+        if not self._debounce:
+            self.state[ids] = target
+            return target, np.flatnonzero(target != state)
+
+        # Debounce: a new target restarts the clock, it is reported once it held long enough
+        differs = target != state
+        restart = differs & (target != self.pending[ids])
+        since = np.where(restart, now, self.pending_since[ids])
+        self.pending_since[ids] = since
+        self.pending[ids] = np.where(differs, target, state)
+        due = differs & (now - since >= self.debounce[ids])
+
+        codes = np.where(due, target, state)
+        self.state[ids] = codes
+        return codes, np.flatnonzero(due)
+
+    def evaluate_block(self, ids, values, times):
+        """Check a block of samples at once: sensor `ids[i]` read `values[i]` at unix time `times[i]`.
+
+        Samples of one sensor are taken in block order (a batch of frames, flattened).
+        Returns (codes, changed) like evaluate(), `changed` being positions in the block.
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        times = np.broadcast_to(np.asarray(times, dtype=np.float64), ids.shape)
+        if not len(ids):
+            return np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.intp)
+
+        # Each sensor's samples in order, next to each other
+        order = np.argsort(ids, kind='stable')
+        sid, v, t = ids[order], values[order], times[order]
+        n = len(sid)
+        first = np.ones(n, dtype=bool)
+        first[1:] = sid[1:] != sid[:-1]
+        last = np.ones(n, dtype=bool)
+        last[:-1] = first[1:]
+
+        # Transitions are found against the previous sample of the same sensor
+        previous = np.empty(n, dtype=np.int8)
+        previous[first] = self.state[sid[first]]
+        if self._debounce:
+            codes = self._evaluate_rounds(sid, v, t, first)
+        else:
+            codes = self._evaluate_sorted(sid, v, t, first)
+        previous[1:][~first[1:]] = codes[:-1][~first[1:]]
+        if not self._debounce:
+            self.state[sid[last]] = codes[last]
+
+        result = np.empty(n, dtype=np.int8)
+        result[order] = codes
+        return result, np.sort(order[codes != previous])
+
+    def _evaluate_sorted(self, sid, v, t, first):
+        # Limits, hysteresis and rate without a debounce clock: nothing depends on the previous
+        # reported state except the hysteresis hold, which is resolved per run of samples in a band
+        n = len(sid)
+        low, high = self.low[sid], self.high[sid]
+        codes = (v > high).astype(np.int8) * STATUS_HIGH
+        codes[v < low] = STATUS_LOW
+
+        if self._hysteresis:
+            band = self.hysteresis[sid]
+            in_low = (v >= low) & (v < low + band)
+            in_high = (v <= high) & (v > high - band)
+            hold = in_low | in_high
+
+            # The alarm a run of band samples may keep: the code right before the run
+            position = np.arange(n)
+            group = np.maximum.accumulate(np.where(first, position, 0))
+            decisive = np.maximum.accumulate(np.where(hold, -1, position))
+            carried = np.where(decisive >= group, codes[np.maximum(decisive, 0)], self.state[sid])
+
+            # It is kept until the first sample of the run leaving that alarm's band
+            inside = ((carried == STATUS_LOW) & in_low) | ((carried == STATUS_HIGH) & in_high)
+            breaks = np.cumsum(hold & ~inside)
+            run_start = np.maximum(decisive + 1, group)
+            before = np.where(run_start > 0, breaks[np.maximum(run_start - 1, 0)], 0)
+            keep = hold & (breaks == before)
+            codes[keep] = carried[keep]
+
+        if self._rate:
+            pv, pt = np.empty(n), np.empty(n)
+            pv[1:], pt[1:] = v[:-1], t[:-1]
+            pv[first], pt[first] = self.last_value[sid[first]], self.last_time[sid[first]]
+            elapsed = t - pt
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rate = np.abs(v - pv) / elapsed
+            codes[(codes == STATUS_OK) & (elapsed > 0) & (rate > self.rate_limit[sid])] = STATUS_RATE
+            last = np.ones(n, dtype=bool)
+            last[:-1] = first[1:]
+            self.last_value[sid[last]] = v[last]
+            self.last_time[sid[last]] = t[last]
+        return codes
+
+    def _evaluate_rounds(self, sid, v, t, first):
+        # A debounce clock is sequential: evaluate() once per round, round r holding the
+        # r-th sample of every sensor (a handful of rounds for a batch of frames)
+        position = np.arange(len(sid))
+        rank = position - np.maximum.accumulate(np.where(first, position, 0))
+        codes = np.empty(len(sid), dtype=np.int8)
+        for r in range(int(rank.max()) + 1):
+            sel = np.flatnonzero(rank == r)
+            codes[sel] = self.evaluate(sid[sel], v[sel], t[sel])[0]
+        return codes
+
+    def clear(self):
+        self.state[:] = STATUS_OK
+        self.pending[:] = STATUS_OK
+        self.pending_since[:] = 0.0
+        self.last_value[:] = np.nan
+        self.last_time[:] = np.nan
@@ -1,12 +1,12 @@
 import sys
 import time
-import json
 
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                             QHBoxLayout, QTableWidget, QTableWidgetItem, 
-                             QHeaderView, QGroupBox, QTextEdit, QLabel, 
+                             QHBoxLayout, QTableView, 
+                             QHeaderView, QGroupBox, QLabel, 
                              QGridLayout, QPushButton, QTabWidget, QInputDialog, 
-                             QMessageBox, QLineEdit, QFrame, QCheckBox, QSplashScreen, QFileDialog, QGraphicsOpacityEffect)
+                             QMessageBox, QLineEdit, QFrame, QCheckBox, QSplashScreen, QFileDialog, QGraphicsOpacityEffect,
+                             QSpinBox, QProgressBar, QComboBox, QSlider)
 
 
 
@@ -15,15 +15,54 @@ from PyQt6.QtCore import Qt, QTimer
 import pyqtgraph as pg
 
 
-from sensor_worker import SensorWorker, OfflineReplayWorker, WebSocketWorker
+from sensor_worker import SensorWorker, OfflineReplayWorker, WebSocketWorker, SessionExportWorker, MultiEndpointWorker
+import session_export
+from lod import decimate_minmax
+from rollup import bucket_means
+from latency import LatencyTracker, STAGES
+from render_scheduler import RenderScheduler
+from session_recorder import SessionRecorder
+from table_models import AlarmHistoryModel, LiveSensorModel
+from log_console import LogConsole
+from ingest_core import (IngestCore, SensorStore, RecorderSink, endpoints_from_config, group_by_sensor, sensor_space,
+                         split_name, NAMESPACE_SEP)
+from health import (HEALTH_OFFLINE, HEALTH_DISCONNECTED, HEALTH_OK, HEALTH_ALARM,
+                    HEALTH_REPLAY, MODE_LIVE, MODE_REPLAY, endpoint_health)
 
 
 from plyer import notification
 
 import simulator
 
+
+# Plot window choices: (label, seconds)
+PLOT_WINDOWS = [("20 s", 20), ("1 min", 60), ("10 min", 600), ("1 h", 3600)]
+PLOT_MIN_COLUMNS = 100  # decimation floor while a plot has no real width yet
+
+# Trend tab: span choices (label, seconds), drawn from the rollup buckets
+TREND_SPANS = [("1 h", 3600), ("8 h", 8 * 3600), ("24 h", 24 * 3600), ("7 d", 7 * 24 * 3600)]
+TREND_MAX_POINTS = 4000  # buckets per sensor, the finest rollup level staying below is drawn
+TREND_TAB = 2
+
+# Replay speed choices: (label, multiplier), MAX replays without pacing
+REPLAY_SPEEDS = [("0.25x", 0.25), ("0.5x", 0.5), ("1x", 1.0), ("2x", 2.0), ("5x", 5.0),
+                 ("10x", 10.0), ("25x", 25.0), ("50x", 50.0), ("100x", 100.0), ("MAX", OfflineReplayWorker.SPEED_MAX)]
+REPLAY_SLIDER_STEPS = 1000
+
+# Global status indicator: health state -> (text, color)
+HEALTH_STYLES = {
+    HEALTH_OFFLINE: ("SYSTEM OFFLINE", "#8E8E93"),
+    HEALTH_DISCONNECTED: ("SYSTEM STATUS", "#FF453A"),
+    HEALTH_OK: ("SYSTEM STATUS", "#32D74B"),
+    HEALTH_ALARM: ("SYSTEM STATUS", "#FF453A"),
+    HEALTH_REPLAY: ("REPLAY MODE", "#0A84FF"),
+}
+
+# Curve colors, one per production line when several endpoints share a plot
+LINE_COLORS = ["#0A84FF", "#FF9F0A", "#32D74B", "#BF5AF2", "#64D2FF", "#FFD60A", "#FF375F", "#AC8E68"]
+
 class Dashboard(QMainWindow):
-    def __init__(self):    
+    def __init__(self, config=None):    
         super().__init__()
         
         self.setWindowTitle("Real-Time Production Line Sensor Dashboard")
@@ -34,11 +73,27 @@ class Dashboard(QMainWindow):
         self.maintenance_unlocked = False 
         self.timeout_seconds = 600  # 10 minutes of inactivity to lock maintenance tab
         
-        self.sensor_config = simulator.load_config()['sensors'] # load sensor config once
-        
-        self.plot_data = {name: [] for name in self.sensor_config.keys()}
-        self.plot_times = {name: [] for name in self.sensor_config.keys()}
-        self.name_to_row = {name: i for i, name in enumerate(self.sensor_config.keys())}
+        config = config or simulator.load_config()  # load config once (benchmarks pass their own)
+        self.connection_config = config['connection']  # cached, live workers are created with it
+        # Several production lines: readings are namespaced "line1/Temperature", one plot per
+        # sensor type shows a curve per line; without endpoints the plain sensor names are used
+        self.endpoints = endpoints_from_config(self.connection_config)
+        self.endpoint_stats = {}  # endpoint name -> latest supervisor stats, None until connected
+        self.shown_line_health = None  # per-line health the line status label currently shows
+        self.sensor_config = sensor_space(config)
+        self.plot_sensors = group_by_sensor(self.sensor_config)  # plot name -> its sensors (curves)
+        self.sensor_plot = {name: plot for plot, names in self.plot_sensors.items() for name in names}
+        
+        # Sensor state lives in the Qt-free ingestion core (ingest_core.py): one preallocated
+        # plot ring buffer per sensor, 1 s / 1 min / 15 min rollups for the Trend tab and the
+        # per-sensor alarm state aggregated into the global status indicator once per frame
+        dashboard_config = config.get('dashboard', {})
+        self.plot_window = dashboard_config.get('plot_window_seconds', 20)  # sliding window length
+        self.store = SensorStore.from_config(config, self.start_time)
+        self.plot_buffers = self.store.buffers
+        self.rollups = self.store.rollups
+        self.health = self.store.health
+        self.latency = LatencyTracker()  # simulator send -> render latency per stage, shared with the live worker
         
         self.session_timer = QTimer()
         self.session_timer.setSingleShot(True) # One-time timer
@@ -48,15 +103,37 @@ class Dashboard(QMainWindow):
         QApplication.instance().installEventFilter(self)   # Monitor user activity globally 
         # observer pattern 
         
-        self.active_alarms = set() # Track active alarms to prevent duplicates
+        self.shown_health = None  # health state the indicator is currently styled for
+        
+        # Alarm history backing the alarm log view (bounded ring, optional overflow file)
+        self.alarm_model = AlarmHistoryModel.from_config(dashboard_config, self)
         
-        # Buffer to store the current session for export
-        self.session_archive = []
+        # Maintenance log: bounded line count, repeats collapsed, written once per render frame
+        self.log_display = LogConsole.from_config(dashboard_config)
+        
+        # Disk-backed recorder storing the current session for export (bounded memory)
+        self.recorder = SessionRecorder.from_config(config)
+        self.core = IngestCore(self.store, [RecorderSink(self.recorder)], self.latency)
         
         # Dictionary to track last alert times for rate limiting
         self.last_alert_time = {}
         
+        # Render state: packets only mark rows/plots dirty, the scheduler repaints at max_fps
+        self.sensor_model = LiveSensorModel(self.sensor_config.keys(), self)  # live table, updated in place
+        self.dirty_plots = set()  # plot names
+        self.zoomed_plots = set()  # zoomed / panned by the user, not following the newest samples
+        self.last_sample_time = 0.0
+        self.render_scheduler = RenderScheduler(self.render_frame, dashboard_config.get('max_fps', 30), self)
+        
         self.init_ui()
+        
+        self.render_scheduler.start()
+        
+        # Refresh the render counters once per second
+        self.stats_timer = QTimer(self)
+        self.stats_timer.timeout.connect(self.update_render_stats)
+        self.stats_timer.timeout.connect(self.refresh_trend)
+        self.stats_timer.start(1000)
 
 
 
@@ -95,7 +172,7 @@ class Dashboard(QMainWindow):
             QGroupBox::title { subcontrol-origin: margin; left: 20px; padding: 0 10px; top: 5px; }
 
             /* Table Styling - Entries are Read-Only via setEditTriggers in setup_monitoring_ui */
-            QTableWidget { 
+            QTableView { 
                 background-color: transparent; color: #FFFFFF; 
                 gridline-color: #3A3A3C; border: none; 
                 font-size: 13px; outline: none;
@@ -135,7 +212,7 @@ class Dashboard(QMainWindow):
                 background-color: #660000; 
             }
             
-            QTextEdit { 
+            QPlainTextEdit { 
                 background-color: #1C1C1E; color: #D1D1D6; 
                 border-radius: 12px; padding: 10px; font-family: 'Consolas';
             }
@@ -175,7 +252,12 @@ class Dashboard(QMainWindow):
         self.setup_maintenance_ui()
         self.tabs.addTab(self.maintenance_tab, "Maintenance Console")
         
+        self.trend_tab = QWidget()
+        self.setup_trend_ui()
+        self.tabs.addTab(self.trend_tab, "Trends")
+        
         self.tabs.currentChanged.connect(self.check_tab_access)
+        self.tabs.currentChanged.connect(self.refresh_trend)
         
             # Global Status Indicator in Status Bar
         self.global_status_circle = QLabel()
@@ -224,8 +306,31 @@ class Dashboard(QMainWindow):
         self.pause_btn = QPushButton("Pause Replay")
         self.pause_btn.clicked.connect(self.pause_offline_replay)
         self.pause_btn.setEnabled(False) # Only enable during Replay
-
-        conn_bar.addWidget(self.status_led); conn_bar.addStretch(); conn_bar.addWidget(self.btn_toggle); conn_bar.addWidget(self.pause_btn)
+        
+        # Replay speed and seek controls, enabled with the pause button
+        self.replay_speed = QComboBox()
+        for label, speed in REPLAY_SPEEDS:
+            self.replay_speed.addItem(label, speed)
+        self.replay_speed.setCurrentIndex(REPLAY_SPEEDS.index(("1x", 1.0)))
+        self.replay_speed.currentIndexChanged.connect(self.set_replay_speed)
+        self.replay_speed.setEnabled(False)
+        
+        self.replay_slider = QSlider(Qt.Orientation.Horizontal)
+        self.replay_slider.setRange(0, REPLAY_SLIDER_STEPS)
+        self.replay_slider.setFixedWidth(220)
+        self.replay_slider.sliderReleased.connect(self.seek_offline_replay)
+        self.replay_slider.setEnabled(False)  # until the replay file is indexed
+        self.replay_range = None
+        
+        self.replay_time_label = QLabel("--:--:--")
+
+        # Per production line status, only shown with several endpoints
+        self.line_status = QLabel()
+        self.line_status.setTextFormat(Qt.TextFormat.RichText)
+        self.line_status.setVisible(bool(self.endpoints))
+
+        conn_bar.addWidget(self.status_led); conn_bar.addWidget(self.line_status); conn_bar.addStretch(); conn_bar.addWidget(self.btn_toggle); conn_bar.addWidget(self.pause_btn)
+        conn_bar.addWidget(self.replay_speed); conn_bar.addWidget(self.replay_slider); conn_bar.addWidget(self.replay_time_label)
         layout.addLayout(conn_bar)
         upper_layout = QHBoxLayout()
         
@@ -233,21 +338,23 @@ class Dashboard(QMainWindow):
         # 1. Live Sensors Table  --> requirement 1
         table_group = QGroupBox("Live Sensors")
         tv = QVBoxLayout(table_group)
-        self.table = QTableWidget(len(self.sensor_config), 4)
-        self.table.setHorizontalHeaderLabels(["Sensor", "Reading", "Time", "Status"])
+        self.table = QTableView()
+        self.table.setModel(self.sensor_model)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         tv.addWidget(self.table)
         
         
         # 2. Alarm Log Table  -->  requirement 2
         alarm_group = QGroupBox("Alarm Logs")
         av = QVBoxLayout(alarm_group)
-        self.alarm_table = QTableWidget(0, 4)
-        self.alarm_table.setHorizontalHeaderLabels(["Time", "Sensor", "Val", "Type"])
+        self.alarm_table = QTableView()
+        self.alarm_table.setModel(self.alarm_model)
         self.alarm_table.verticalHeader().setVisible(False)
+        self.alarm_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)  # uniform rows keep 1M-row scrolling cheap
         self.alarm_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.alarm_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.alarm_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         av.addWidget(self.alarm_table)
         
 
@@ -261,6 +368,20 @@ class Dashboard(QMainWindow):
         graph_group = QGroupBox("Real-Time Analytics Visualizer")
         gv = QVBoxLayout(graph_group)
         
+        # Window length selector, long windows are drawn min/max decimated
+        window_bar = QHBoxLayout()
+        self.plot_window_combo = QComboBox()
+        for label, seconds in PLOT_WINDOWS:
+            self.plot_window_combo.addItem(label, seconds)
+        if self.plot_window not in [seconds for _, seconds in PLOT_WINDOWS]:
+            self.plot_window_combo.addItem(f"{self.plot_window} s", self.plot_window)  # configured custom window
+        self.plot_window_combo.setCurrentIndex(self.plot_window_combo.findData(self.plot_window))
+        self.plot_window_combo.currentIndexChanged.connect(self.set_plot_window)
+        window_bar.addStretch()
+        window_bar.addWidget(QLabel("Window"))
+        window_bar.addWidget(self.plot_window_combo)
+        gv.addLayout(window_bar)
+        
         # Grid for the actual plots
         self.graph_grid = QGridLayout()
         self.graph_grid.setSpacing(10)
@@ -268,27 +389,34 @@ class Dashboard(QMainWindow):
         self.plot_widgets = {}
         self.curves = {}
 
-        brand_blue = QColor("#0A84FF")
         fill_brush = QColor(10, 132, 255, 30) 
 
-        for i, (name, config) in enumerate(self.sensor_config.items()):
+        for i, (name, sensors) in enumerate(self.plot_sensors.items()):
             # Create the widget
             pw = pg.PlotWidget(title=name)
             pw.setBackground('#1C1C1E') # Match the window background exactly
             pw.setAntialiasing(True)
+            if len(sensors) > 1:
+                pw.addLegend(offset=(5, 5))
             
-            # Styling the curve
-            pen = pg.mkPen(color=brand_blue, width=2)
-            self.curves[name] = pw.plot(pen=pen)
-            
-            self.curves[name].setFillLevel(0)
-            self.curves[name].setBrush(fill_brush)
+            # Styling the curves, one per production line (filled when alone)
+            for j, sensor in enumerate(sensors):
+                pen = pg.mkPen(color=LINE_COLORS[j % len(LINE_COLORS)], width=2)
+                self.curves[sensor] = pw.plot(pen=pen, name=split_name(sensor)[0])
+                if len(sensors) == 1:
+                    self.curves[sensor].setFillLevel(0)
+                    self.curves[sensor].setBrush(fill_brush)
 
             # Cleanup axes
             pw.showGrid(x=True, y=True, alpha=0.1)
             pw.getAxis('left').setPen('#8E8E93')
             pw.getAxis('bottom').setPen('#8E8E93')
             
+            # Level of detail follows the plot width and the user's zoom
+            view = pw.getViewBox()
+            view.sigResized.connect(lambda _, name=name: self.invalidate_plot(name))
+            view.sigRangeChangedManually.connect(lambda _, name=name: self.on_plot_zoomed(name))
+            
             self.plot_widgets[name] = pw
             self.graph_grid.addWidget(pw, 0, i)
             
@@ -297,6 +425,59 @@ class Dashboard(QMainWindow):
         
         
         
+    # setup the trend tab UI: min/max band and mean per sensor, from the rollups
+    def setup_trend_ui(self):
+        layout = QVBoxLayout(self.trend_tab)
+        layout.setContentsMargins(25, 20, 25, 25)
+        
+        trend_bar = QHBoxLayout()
+        self.trend_span = QComboBox()
+        for label, seconds in TREND_SPANS:
+            self.trend_span.addItem(label, seconds)
+        self.trend_span.setCurrentIndex(1)  # one shift
+        self.trend_span.currentIndexChanged.connect(self.refresh_trend)
+        self.trend_resolution_label = QLabel("Resolution: -")
+        self.trend_resolution_label.setStyleSheet("color: #8E8E93; font-size: 11px;")
+        trend_bar.addWidget(QLabel("Span"))
+        trend_bar.addWidget(self.trend_span)
+        trend_bar.addStretch()
+        trend_bar.addWidget(self.trend_resolution_label)
+        layout.addLayout(trend_bar)
+        
+        trend_grid = QGridLayout()
+        trend_grid.setSpacing(10)
+        self.trend_plots = {}
+        self.trend_curves = {}
+        
+        for i, (name, sensors) in enumerate(self.plot_sensors.items()):
+            pw = pg.PlotWidget(title=name, axisItems={'bottom': pg.DateAxisItem()})
+            pw.setBackground('#1C1C1E')
+            pw.showGrid(x=True, y=True, alpha=0.1)
+            pw.getAxis('left').setPen('#8E8E93')
+            pw.getAxis('bottom').setPen('#8E8E93')
+            if len(sensors) > 1:
+                pw.addLegend(offset=(5, 5))
+            
+            # Min/max envelope as a filled band, mean as a line on top (one pair per production line)
+            for j, sensor in enumerate(sensors):
+                color = QColor(LINE_COLORS[j % len(LINE_COLORS)])
+                low = pg.PlotCurveItem(pen=pg.mkPen(None))
+                high = pg.PlotCurveItem(pen=pg.mkPen(None))
+                pw.addItem(low)
+                pw.addItem(high)
+                band = QColor(color)
+                band.setAlpha(50 if len(sensors) == 1 else 25)
+                pw.addItem(pg.FillBetweenItem(low, high, brush=band))
+                mean = pw.plot(pen=pg.mkPen(color=color, width=2), name=split_name(sensor)[0])
+                self.trend_curves[sensor] = (low, high, mean)
+            
+            self.trend_plots[name] = pw
+            trend_grid.addWidget(pw, i // 3, i % 3)
+        
+        layout.addLayout(trend_grid)
+
+
+
     # setup the maintenance tab UI
     def setup_maintenance_ui(self):
     # Main horizontal layout to split Sidebar from Logs
@@ -338,10 +519,40 @@ class Dashboard(QMainWindow):
         self.notif_checkbox = QCheckBox("Enable Desktop Alerts")
         self.notif_checkbox.setChecked(False)
         pref_vbox.addWidget(self.notif_checkbox)
+        
+        # Render frame cap (FPS) and render counters
+        fps_row = QHBoxLayout()
+        fps_label = QLabel("Max FPS")
+        fps_label.setStyleSheet("color: #AEAEB2; font-weight: 600; font-size: 13px;")
+        self.fps_spinbox = QSpinBox()
+        self.fps_spinbox.setRange(1, 120)
+        self.fps_spinbox.setValue(self.render_scheduler.max_fps)
+        self.fps_spinbox.valueChanged.connect(self.set_max_fps)
+        fps_row.addWidget(fps_label)
+        fps_row.addStretch()
+        fps_row.addWidget(self.fps_spinbox)
+        pref_vbox.addLayout(fps_row)
+        
+        self.render_stats_label = QLabel("Frames: 0  |  Coalesced: 0  |  Dropped: 0")
+        self.render_stats_label.setStyleSheet("color: #8E8E93; font-size: 11px;")
+        pref_vbox.addWidget(self.render_stats_label)
+        
+        self.connection_stats_label = QLabel("Reconnects: 0  |  Downtime: 0.0s  |  Last gap: -")  # one row per line with endpoints
+        self.connection_stats_label.setStyleSheet("color: #8E8E93; font-size: 11px;")
+        pref_vbox.addWidget(self.connection_stats_label)
+
+
+        # Group 3: End-to-end latency of the live stream, per pipeline stage
+        latency_group = QGroupBox("LATENCY")
+        latency_vbox = QVBoxLayout(latency_group)
+        self.latency_label = QLabel()
+        self.latency_label.setStyleSheet("color: #8E8E93; font-size: 11px; font-family: 'Consolas', 'Courier New';")
+        latency_vbox.addWidget(self.latency_label)
 
 
         sidebar.addWidget(sys_group)
         sidebar.addWidget(pref_group)
+        sidebar.addWidget(latency_group)
         sidebar.addStretch() 
 
 
@@ -372,10 +583,8 @@ class Dashboard(QMainWindow):
         log_header.addStretch()
         log_header.addWidget(self.btn_clear_logs)
 
-        self.log_display = QTextEdit()
-        self.log_display.setReadOnly(True)
         self.log_display.setStyleSheet("""
-            QTextEdit { 
+            QPlainTextEdit { 
                 background-color: #000000; border: 1px solid #3A3A3C; 
                 border-radius: 8px; color: #32D74B; font-family: 'Consolas', 'Courier New';
             }
@@ -412,6 +621,20 @@ class Dashboard(QMainWindow):
         self.btn_export_data.clicked.connect(self.export_session_to_json)
         data_vbox.addWidget(self.btn_export_data)
         
+        # Export progress, only visible while a background export runs
+        self.export_progress = QProgressBar()
+        self.export_progress.setRange(0, 100)
+        self.export_progress.setTextVisible(True)
+        self.export_progress.setStyleSheet("""
+            QProgressBar { 
+                background-color: #1C1C1E; color: #FFFFFF; border: 1px solid #3A3A3C; 
+                border-radius: 6px; text-align: center; font-size: 10px;
+            }
+            QProgressBar::chunk { background-color: #32D74B; border-radius: 6px; }
+        """)
+        self.export_progress.hide()
+        data_vbox.addWidget(self.export_progress)
+        
         
         sidebar.addWidget(data_group)
         
@@ -428,7 +651,7 @@ class Dashboard(QMainWindow):
     def clear_system_alarms(self):
         """Logic to clear the history on the Monitoring tab"""
             
-        self.alarm_table.setRowCount(0)
+        self.alarm_model.clear()
         self.update_log("USER ACTION: Alarm history cleared.")
 
 
@@ -445,34 +668,30 @@ class Dashboard(QMainWindow):
             self.worker.wait() # Ensure it's fully closed
         
         
-        # 2. Clear local data buffers so graphs start from zero
-        for name in self.plot_data:
-            self.plot_data[name] = []
-            self.plot_times[name] = []
+        # 2. Clear local data buffers so graphs start from zero (plots, trends, alarm state)
+        self.store.clear()
+        self.latency.clear()
+        self.dirty_plots.clear()
+        self.zoomed_plots.clear()
             
             
         # 3. Clear the live sensor table
-        for row in range(self.table.rowCount()):
-            for col in range(self.table.columnCount()):
-                self.table.setItem(row, col, QTableWidgetItem(""))
-                self.table.item(row, col).setBackground(QColor(255, 255, 255, 0)) # Reset background color
-                
+        self.sensor_model.clear()
                 
         # 4. Clear the plots
         for name in self.curves:
             self.curves[name].setData([], [])
             
         # 5. Clear alarm history and reset active alarms
-        self.alarm_table.setRowCount(0)  
-        self.active_alarms.clear()      
+        self.alarm_model.clear()
         self.notif_checkbox.setChecked(False)  # Reset notification preference
         
         
         # Reset global status indicator
-        grey_circle_style = "background-color: #8E8E93; border-radius: 10px; min-width: 20px; max-width: 20px; min-height: 20px; max-height: 20px;"
-        self.global_status_circle.setStyleSheet(grey_circle_style)
+        self.health.set_mode(HEALTH_OFFLINE)
+        self.endpoint_stats = {}
+        self.refresh_health()
         
-        self.global_status_text.setText("SYSTEM OFFLINE")
         self.btn_toggle.setText("Connect System")
         self.status_led.setText("●  SYSTEM DISCONNECTED")
         self.status_led.setStyleSheet("color: #FF453A;")
@@ -486,7 +705,7 @@ class Dashboard(QMainWindow):
             
             self.handle_connection() # This will restart it if checked
             
-        self.session_archive = []  # Clear the session archive buffer
+        self.recorder.reset()  # Start a fresh recorded session
     
         self.update_log("SYSTEM: Simulator re-initialized successfully.")
         
@@ -510,21 +729,30 @@ class Dashboard(QMainWindow):
             
         if self.btn_toggle.isChecked():
             
-            self.worker = SensorWorker()  # TCP sensor Socket Worker initiation if connect system clicked
-            # self.worker = WebSocketWorker()  # WebSocket Worker initiation if connect system clicked
-            self.global_status_update(True)
+            if self.endpoints:
+                # Several production lines, all served by one worker thread
+                self.worker = MultiEndpointWorker(self.endpoints, self.latency)
+                self.endpoint_stats = dict.fromkeys(endpoint['name'] for endpoint in self.endpoints)
+            else:
+                self.worker = SensorWorker(self.connection_config, self.latency)  # TCP sensor Socket Worker initiation if connect system clicked
+                # self.worker = WebSocketWorker(connection=self.connection_config, latency=self.latency)  # WebSocket Worker initiation if connect system clicked
+            self.health.set_mode(MODE_LIVE)
+            self.refresh_health()
             
             
-            # data_received is a pyqtsignal, a messenger from worker thread to main thread carrying sensor data
+            # batch_received is a pyqtsignal, a messenger from worker thread to main thread carrying a batch of sensor frames
             # connect is the action of linking the signal to a slot (function) in main thread
             # "link the signal to a specific action"
-            self.worker.data_received.connect(self.update_dashboard)
+            self.worker.batch_received.connect(self.update_dashboard_batch)
             
             
-            # update_dashboard is the slot function in main thread that
+            # update_dashboard_batch is the slot function in main thread that
             # processes incoming sensor data and updates the GUI accordingly
             self.worker.log_message.connect(self.update_log)
             
+            # The worker reconnects on its own, the dashboard only follows the connection state
+            self.worker.connection_changed.connect(self.on_connection_changed)
+            
             self.worker.start() # start the worker thread, which begins its run() method
             # the OS here is commanded to allocate resources and schedule a new execution thread for the worker besides the main GUI thread
             
@@ -535,12 +763,16 @@ class Dashboard(QMainWindow):
             self.pause_btn.setText("Pause Replay")
             self.pause_btn.setEnabled(False)
             self.pause_btn.setStyleSheet("")
+            self.set_replay_controls_enabled(False)
             self.centralWidget().setGraphicsEffect(None)
             
             if isinstance(self.worker, WebSocketWorker):
                 self.status_led.setText("●  WEBSOCKET LIVE STREAM MODE")
                 self.status_led.setStyleSheet("color: #8B8000;")
 
+            elif isinstance(self.worker, MultiEndpointWorker):
+                self.show_lines_connected()
+
             else:
                 self.status_led.setText("●  SYSTEM CONNECTED")
                 self.status_led.setStyleSheet("color: #32D74B;") 
@@ -548,97 +780,221 @@ class Dashboard(QMainWindow):
             
         else:
             if hasattr(self, 'worker'): self.worker.stop()
+            self.endpoint_stats = {name: stats and {**stats, 'connected': False} for name, stats in self.endpoint_stats.items()}
             self.btn_toggle.setText("Connect System")
             self.status_led.setText("●  SYSTEM DISCONNECTED")
             self.status_led.setStyleSheet("color: #FF453A;")
-            self.global_status_update(False)
+            self.health.set_mode(HEALTH_DISCONNECTED)
+            self.refresh_health()
             
             # Reset pause button when disconnected
             self.pause_btn.setText("Pause Replay")
             self.pause_btn.setEnabled(False)
             self.pause_btn.setStyleSheet("")
+            self.set_replay_controls_enabled(False)
             self.centralWidget().setGraphicsEffect(None)
 
 
 
 
     # Update the dashboard with new sensor data
+    # Only ingests the packet and marks rows/plots dirty, painting happens in render_frame
     def update_dashboard(self, sensor_list):
-        curr_time = time.time() - self.start_time
-
-        # 1. ARCHIVE DATA: Store incoming data for session export
-        
-        archive_entry = {
-            "timestamp_unix": time.time(),
-            "sensors": sensor_list
-        }
-        self.session_archive.append(archive_entry)
-            
-      
-        # 2. UI UPDATES: Loop through each sensor to update tables/graphs
-        for sensor in sensor_list:
-            name, val, status, ts = sensor['name'], sensor['value'], sensor['status'], sensor['timestamp']
-            row = self.name_to_row.get(name)
-            
-            if row is not None:
-                # Update Table Text
-                self.table.setItem(row, 0, QTableWidgetItem(name))
-                self.table.setItem(row, 1, QTableWidgetItem(f"{val:.2f}"))
-                self.table.setItem(row, 2, QTableWidgetItem(ts))
-                disp = "FAULT" if "ALARM" in status else "OK"
-                self.table.setItem(row, 3, QTableWidgetItem(disp))
-
-                # Logic for Alarms and Row Backgrounds
-                if "ALARM" in status:
-                    bg = QColor(255, 69, 58, 40) # Red tint for alarm rows
-                    self.global_status_update(False)
-                    self.add_to_alarm_history(ts, name, val, status)
-                    
-                    if name not in self.active_alarms:
-                        self.active_alarms.add(name)
-                        # Trigger Desktop Notification if enabled
-                        if self.notif_checkbox.isChecked():
-                            self.trigger_desktop_alert(name, val, status)
-                            
-                else:
-                    bg = QColor(255, 255, 255, 5) # Default subtle tint
-                    self.global_status_update(True)
-                    if name in self.active_alarms:
-                        self.active_alarms.remove(name)
-
-
-                # Apply background color to the row
-                for col in range(4): 
-                    item = self.table.item(row, col)
-                    if item: 
-                        item.setBackground(bg)
-
-
-                # Update Individual Graphs
-                self.plot_data[name].append(val)
-                self.plot_times[name].append(curr_time)
-                
-                
-                # Sliding window logic (20 seconds)
-                while self.plot_times[name] and self.plot_times[name][0] < curr_time - 20:
-                    self.plot_times[name].pop(0)
-                    self.plot_data[name].pop(0)
-                
-                
-                self.curves[name].setData(self.plot_times[name], self.plot_data[name])
-                self.plot_widgets[name].setXRange(curr_time - 20, curr_time, padding=0)
-                
+        # 1. Archive, plot buffers, rollups and alarm state are updated by the ingestion core
+        self.show_update(self.core.process(sensor_list))
 
 
+    # Queue what one processed frame changed for the next render frame
+    def show_update(self, update):
+        # 2. Latest readings shown in the table on the next frame, their plots redrawn
+        for name, val, status, ts in update.readings:
+            self.sensor_model.update(name, val, status, ts)
+            self.dirty_plots.add(self.sensor_plot[name])
+        if update.readings:
+            self.last_sample_time = update.time
 
-    # Add a new entry to the alarm history table
-    def add_to_alarm_history(self, ts, name, val, status):
+        # 3. Alarm log (transitions only), and a desktop notification when a sensor enters alarm (if enabled)
+        for ts, name, val, status in update.alarms:
+            self.add_to_alarm_history(ts, name, val, status)
+        if update.raised and self.notif_checkbox.isChecked():
+            for name, val, status in update.raised:
+                self.trigger_desktop_alert(name, val, status)
+
+        self.render_scheduler.mark_dirty()
+
+
+
+    # Live workers deliver frames in batches to keep the Qt event queue short,
+    # the alarms of a whole batch are evaluated at once
+    def update_dashboard_batch(self, batch):
+        for update in self.core.process_batch(batch):
+            self.show_update(update)
+
+
+
+    # Repaint everything that changed since the last frame (called by the RenderScheduler)
+    def render_frame(self):
         
-        self.alarm_table.insertRow(0)
-        for i, txt in enumerate([ts, name, f"{val:.2f}", status]):
-            item = QTableWidgetItem(txt)
-            item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.alarm_table.setItem(0, i, item)
+        # 1. Live table, only cells whose text or color changed are repainted
+        self.sensor_model.flush()
+        self.refresh_health()
+
+        # 2. Alarm history, everything queued since the last frame is inserted at once
+        self.alarm_model.flush()
+
+        # 3. Maintenance log, all messages of the frame in one document edit
+        self.log_display.flush()
+
+
+        # 4. Graphs: last plot_window seconds, at most 2 points per pixel column
+        for name in self.dirty_plots:
+            self.draw_plot(name)
+        self.dirty_plots.clear()
+
+        # 5. Everything dispatched since the last frame is now on screen
+        self.latency.rendered()
+
+
+    # Redraw one plot from its ring buffers (one per line), min/max decimated to the plot width
+    def draw_plot(self, name):
+        plot = self.plot_widgets[name]
+        view = plot.getViewBox()
+        follow = name not in self.zoomed_plots
+        if follow:
+            start, end = self.last_sample_time - self.plot_window, self.last_sample_time
+        else:
+            start, end = view.viewRange()[0]
+
+        columns = max(PLOT_MIN_COLUMNS, view.width())
+        for sensor in self.plot_sensors[name]:
+            times, values = self.store.window(sensor, start, end)  # raw samples, or rollups for long windows
+            self.curves[sensor].setData(*decimate_minmax(times, values, columns))
+        if follow:
+            plot.setXRange(start, end, padding=0)
+
+
+    # Plot resized or zoomed, its level of detail is recomputed on the next frame
+    def invalidate_plot(self, name):
+        self.dirty_plots.add(name)
+        self.render_scheduler.mark_dirty(0)
+
+
+    # A zoomed / panned plot shows the range the user picked until the window is changed
+    def on_plot_zoomed(self, name):
+        self.zoomed_plots.add(name)
+        self.invalidate_plot(name)
+
+
+    # Redraw the Trend tab from the rollup buckets (only while it is shown)
+    def refresh_trend(self, *_):
+        if self.tabs.currentIndex() != TREND_TAB:
+            return
+        now = time.time()
+        if self.health.mode == MODE_REPLAY:
+            now = self.store.start_time + self.last_sample_time  # rollups are on the recorded times
+        span = self.trend_span.currentData()
+        resolution = None
+        for name, (low, high, mean) in self.trend_curves.items():
+            resolution, buckets = self.rollups.query(name, now - span, now, TREND_MAX_POINTS)
+            times = buckets["start"] + resolution / 2  # bucket centers
+            low.setData(times, buckets["min"])
+            high.setData(times, buckets["max"])
+            mean.setData(times, bucket_means(buckets))
+        for plot in self.trend_plots.values():
+            plot.setXRange(now - span, now, padding=0)
+        if resolution is not None:
+            self.trend_resolution_label.setText(f"Resolution: {resolution:g} s")
+
+
+    # Change the plot window length, all plots follow the newest samples again
+    def set_plot_window(self, index):
+        self.plot_window = self.plot_window_combo.itemData(index)
+        self.zoomed_plots.clear()
+        for name in self.plot_widgets:
+            self.invalidate_plot(name)
+        self.update_log(f"USER ACTION: Plot window set to {self.plot_window_combo.itemText(index)}.")
+
+
+    # Change the render frame cap from the Maintenance preferences
+    def set_max_fps(self, fps):
+        self.render_scheduler.set_max_fps(fps)
+        self.update_log(f"USER ACTION: Max render rate set to {fps} FPS.")
+
+
+    # Refresh the render and connection counters shown in the Maintenance console
+    def update_render_stats(self):
+        stats = self.render_scheduler.stats()
+        archive = self.recorder.stats()
+        self.render_stats_label.setText(
+            f"Frames: {stats['frames_rendered']}  |  Coalesced: {stats['packets_coalesced']}  |  Dropped: {stats['frames_dropped']}\n"
+            f"Archived: {archive['recorded']}  |  Archive dropped: {archive['dropped']}"
+            + ("" if archive['error'] is None else f"\nArchive error: {archive['error']}")
+        )
+        
+        supervisors = getattr(getattr(self, 'worker', None), 'supervisors', None)
+        supervisor = getattr(getattr(self, 'worker', None), 'supervisor', None)
+        if supervisors is not None:
+            rows = []
+            for name, line in supervisors.items():
+                stats = line.stats()
+                state = "up" if stats['connected'] else "down"
+                rows.append(f"{name}: {state}  |  Reconnects: {stats['reconnects']}  |  Downtime: {stats['downtime_s']:.1f}s")
+            self.connection_stats_label.setText("\n".join(rows))
+        elif supervisor is not None:
+            stats = supervisor.stats()
+            last_gap = "-" if stats['last_gap_s'] is None else f"{stats['last_gap_s']:.2f}s"
+            self.connection_stats_label.setText(
+                f"Reconnects: {stats['reconnects']}  |  Downtime: {stats['downtime_s']:.1f}s  |  Last gap: {last_gap}"
+            )
+        
+        stats = self.latency.stats()
+        ms = lambda value: "-" if value is None else f"{value:.1f}"
+        lines = [f"{'ms':<9}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for stage in STAGES:
+            s = stats['stages'][stage]
+            lines.append(f"{stage:<9}{ms(s['p50_ms']):>7}{ms(s['p95_ms']):>7}{ms(s['p99_ms']):>7}")
+        lines.append(f"Frames: {stats['frames']}  |  Lost: {stats['lost']}  |  Out of order: {stats['out_of_order']}")
+        self.latency_label.setText("\n".join(lines))
+
+
+    # Live worker connected to or lost the simulator, it keeps reconnecting until disconnected by the user
+    def on_connection_changed(self, stats):
+        if not self.btn_toggle.isChecked():
+            return  # disconnected by the user, handle_connection already updated the status
+        if 'endpoint' in stats:
+            # One production line of several, live as long as any line is connected
+            self.endpoint_stats[stats['endpoint']] = stats
+            connected = self.show_lines_connected()
+            self.health.set_mode(MODE_LIVE if connected else HEALTH_DISCONNECTED)
+        elif stats['connected']:
+            self.health.set_mode(MODE_LIVE)
+            if isinstance(self.worker, WebSocketWorker):
+                self.status_led.setText("●  WEBSOCKET LIVE STREAM MODE")
+                self.status_led.setStyleSheet("color: #8B8000;")
+            else:
+                self.status_led.setText("●  SYSTEM CONNECTED")
+                self.status_led.setStyleSheet("color: #32D74B;")
+        else:
+            self.health.set_mode(HEALTH_DISCONNECTED)
+            self.status_led.setText("●  RECONNECTING...")
+            self.status_led.setStyleSheet("color: #FF9F0A;")
+        self.refresh_health()
+
+
+
+    # Status LED with several production lines: green when all are connected, amber when some are
+    def show_lines_connected(self):
+        connected = sum(1 for stats in self.endpoint_stats.values() if stats and stats['connected'])
+        total = len(self.endpoint_stats)
+        color = "#32D74B" if connected == total else "#FF9F0A" if connected else "#FF453A"
+        self.status_led.setText(f"●  LINES CONNECTED {connected}/{total}")
+        self.status_led.setStyleSheet(f"color: {color};")
+        return connected
+
+
+    # Add a new entry to the alarm history (shown at the top on the next frame)
+    def add_to_alarm_history(self, ts, name, val, status):
+        self.alarm_model.append(ts, name, val, status)
             
             
             
@@ -673,7 +1029,8 @@ class Dashboard(QMainWindow):
 
     # Update the log display with a new message
     def update_log(self, msg):
-        self.log_display.append(f"<b>{time.strftime('%H:%M:%S')}</b> > {msg}")
+        self.log_display.log(msg)
+        self.render_scheduler.mark_dirty(0)  # written on the next frame, without counting as a packet
 
 
     # OVERRIDE EVENT FILTER TO RESET TIMER ON USER ACTIVITY
@@ -708,24 +1065,49 @@ class Dashboard(QMainWindow):
                 
                 
                 
-    # Update the global status indicator            
-    def global_status_update(self, operational):
-        if operational:
-            self.global_status_text.setText("SYSTEM STATUS")
-            self.global_status_text.setStyleSheet("color: #32D74B;")
-            self.global_status_circle.setStyleSheet("background-color: #32D74B;")
-        else:
-            self.global_status_text.setText("SYSTEM STATUS")
-            self.global_status_text.setStyleSheet("color: #FF453A;")
-            self.global_status_circle.setStyleSheet("background-color: #FF453A;")
+    # Restyle the global status indicator, only when the aggregated health changed
+    def refresh_health(self):
+        if self.endpoints:
+            self.refresh_line_health()
+        change = self.health.commit()
+        if change is None:
+            return
+        state, alarm_count = change
+
+        text, color = HEALTH_STYLES[state]
+        if state == HEALTH_ALARM:
+            text = f"SYSTEM STATUS ({alarm_count} IN ALARM)"
+        self.global_status_text.setText(text)
+
+        # Stylesheets are re-parsed on every set, so only on state transitions
+        if state != self.shown_health:
+            self.shown_health = state
+            self.global_status_text.setStyleSheet(f"color: {color};")
+            self.global_status_circle.setStyleSheet(f"background-color: {color};")
             
 
 
+    # Per production line status next to the status LED, rewritten only when a line changed
+    def refresh_line_health(self):
+        stats = {endpoint['name']: self.endpoint_stats.get(endpoint['name']) for endpoint in self.endpoints}
+        lines = endpoint_health(stats, self.health.alarm_sensors, NAMESPACE_SEP)
+        if lines == self.shown_line_health:
+            return
+        self.shown_line_health = lines
+
+        parts = []
+        for name, (state, alarm_count) in lines.items():
+            color = HEALTH_STYLES[state][1]
+            label = f"{alarm_count} IN ALARM" if state == HEALTH_ALARM else state
+            parts.append(f'<span style="color: {color};">●</span> {name} {label}')
+        self.line_status.setText("&nbsp;&nbsp;&nbsp;".join(parts))
+
+
     # Load offline data from a file and replay it
     def load_offline_data(self):
         
         file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Sensor Log", "", "JSON Files (*.json);;CSV Files (*.csv)"
+            self, "Open Sensor Log", "", "Session Files (*.json *.ndjson *.ndjson.gz *.csv);;JSON Files (*.json);;CSV Files (*.csv)"
         )
         
         if not file_path:
@@ -758,10 +1140,7 @@ class Dashboard(QMainWindow):
         self.clear_system_alarms()
                 
         # 3. clear live sensor table
-        for row in range(self.table.rowCount()):
-            for col in range(self.table.columnCount()):
-                self.table.setItem(row, col, QTableWidgetItem(""))
-                self.table.item(row, col).setBackground(QColor(255, 255, 255, 0)) # Reset background color
+        self.sensor_model.clear()
                 
         
         # change system connectivity button to replay mode
@@ -770,7 +1149,12 @@ class Dashboard(QMainWindow):
         self.status_led.setText("●  SYSTEM REPLAY MODE")
         self.status_led.setStyleSheet("color: #0A84FF;")
         
-        # clear the plots
+        # clear the plots, trends, alarm state and any frame still pending from the live stream
+        # (a sensor still in alarm in the recording is reported again)
+        self.store.clear()
+        self.latency.new_stream()
+        self.dirty_plots.clear()
+        self.zoomed_plots.clear()
         for name in self.curves:
             self.curves[name].setData([], [])
             
@@ -778,16 +1162,58 @@ class Dashboard(QMainWindow):
 
             
         # Switch the "Status LED" to a different color (Blue) for Replay Mode
-        self.global_status_circle.setStyleSheet("background-color: #0A84FF; border: none; border-radius: 12px;")
-        self.global_status_text.setText("REPLAY MODE")
+        self.health.set_mode(MODE_REPLAY)
+        self.refresh_health()
             
         # Initialize the Offline Worker
-        self.worker = OfflineReplayWorker(file_path)   # overwrite the existing live sensor worker
-        self.worker.data_received.connect(self.update_dashboard)
+        self.worker = OfflineReplayWorker(file_path, self.replay_speed.currentData())   # overwrite the existing live sensor worker
+        self.worker.batch_received.connect(self.update_dashboard_batch)
         self.worker.log_message.connect(self.update_log)
+        self.worker.range_known.connect(self.on_replay_range)
+        self.worker.position_changed.connect(self.on_replay_position)
+        self.set_replay_controls_enabled(True)
         self.worker.start() 
 
 
+    # Speed is usable for the whole replay, the slider once the worker reports the time range
+    def set_replay_controls_enabled(self, enabled):
+        self.replay_speed.setEnabled(enabled)
+        self.replay_slider.setEnabled(False)
+        self.replay_slider.setValue(0)
+        self.replay_range = None
+        self.replay_time_label.setText("--:--:--")
+
+
+    def set_replay_speed(self, _index=None):
+        if isinstance(getattr(self, 'worker', None), OfflineReplayWorker):
+            self.worker.set_speed(self.replay_speed.currentData())
+            self.update_log(f"SYSTEM: Replay speed set to {self.replay_speed.currentText()}.")
+
+
+    # The seek slider maps 0..REPLAY_SLIDER_STEPS onto the recorded time range
+    def on_replay_range(self, start, end):
+        self.replay_range = (start, end)
+        self.replay_slider.setEnabled(self.replay_speed.isEnabled())
+
+
+    def on_replay_position(self, timestamp):
+        self.replay_time_label.setText(time.strftime("%H:%M:%S", time.localtime(timestamp)))
+        if self.replay_range and not self.replay_slider.isSliderDown():
+            start, end = self.replay_range
+            span = max(end - start, 1e-9)
+            self.replay_slider.setValue(round((timestamp - start) / span * REPLAY_SLIDER_STEPS))
+
+
+    def seek_offline_replay(self):
+        if not self.replay_range or not isinstance(getattr(self, 'worker', None), OfflineReplayWorker):
+            return
+        start, end = self.replay_range
+        # Plots, trends and alarm state are kept on the recorded times, they restart at the new position
+        self.store.clear()
+        self.dirty_plots.update(self.plot_widgets)
+        self.worker.seek(start + (end - start) * self.replay_slider.value() / REPLAY_SLIDER_STEPS)
+
+
     def pause_offline_replay(self):
         if not hasattr(self, 'worker') or not isinstance(self.worker, OfflineReplayWorker):
             return
@@ -810,31 +1236,58 @@ class Dashboard(QMainWindow):
             self.centralWidget().setGraphicsEffect(None)
                 
 
-    # Export the current session data to a JSON file
+    # Export the current session data (JSON / NDJSON / compressed) on a background thread
     def export_session_to_json(self):
         
-        if isinstance(self.worker, OfflineReplayWorker):
+        if isinstance(getattr(self, 'worker', None), OfflineReplayWorker):
             QMessageBox.warning(self, "Export Failed", "Cannot export data during Offline Replay mode.")
             return
 
-        if not self.session_archive:
+        if not self.recorder.count:
             QMessageBox.warning(self, "Export Failed", "No data has been collected in this session yet.")
             return
         
+        if hasattr(self, 'export_worker') and self.export_worker.isRunning():
+            QMessageBox.information(self, "Export Running", "An export is already in progress.")
+            return
+        
+        formats = session_export.available_formats()
+        filters = ";;".join(session_export.EXPORT_FORMATS[fmt][0] for fmt in formats)
+        
         timestamp = time.strftime("%d-%b-%Y_%H-%M")
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Export Sensor Data", f"Session_{timestamp}.json", "JSON Files (*.json)"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Sensor Data", f"Session_{timestamp}.json", filters
         )  # human readable timestamp format
 
-        if file_path:
-            try:
-                with open(file_path, 'w') as f:
-                    json.dump(self.session_archive, f, indent=4)
-                
-                self.update_log(f"SUCCESS: Exported {len(self.session_archive)} packets to {file_path}")
-                QMessageBox.information(self, "Export Complete", f"Successfully saved to {file_path}")
-            except Exception as e:
-                self.update_log(f"EXPORT ERROR: {str(e)}")       
+        if not file_path:
+            return
+        
+        # The typed extension wins, otherwise use the selected filter
+        selected = next((fmt for fmt in formats if session_export.EXPORT_FORMATS[fmt][0] == selected_filter), session_export.FORMAT_JSON)
+        fmt = session_export.format_for_path(file_path, selected)
+        
+        self.export_worker = SessionExportWorker(self.recorder, file_path, fmt)
+        self.export_worker.progress.connect(self.export_progress.setValue)
+        self.export_worker.log_message.connect(self.update_log)
+        self.export_worker.export_finished.connect(self.on_export_finished)
+        self.export_worker.finished.connect(self.on_export_stopped)
+        
+        self.btn_export_data.setEnabled(False)
+        self.export_progress.setValue(0)
+        self.export_progress.show()
+        self.update_log(f"EXPORT: Writing {self.export_worker.total} packets to {file_path} ({fmt})...")
+        self.export_worker.start()
+
+
+    def on_export_finished(self, written, file_path):
+        self.update_log(f"SUCCESS: Exported {written} packets to {file_path}")
+        QMessageBox.information(self, "Export Complete", f"Successfully saved to {file_path}")
+
+
+    # Restore the export controls whether the export succeeded, failed or was cancelled
+    def on_export_stopped(self):
+        self.btn_export_data.setEnabled(True)
+        self.export_progress.hide()
         
     
     # Override closeEvent to ensure graceful shutdown
@@ -846,8 +1299,18 @@ class Dashboard(QMainWindow):
             self.worker.stop()
             self.worker.wait() # Wait for the thread to fully exit memory
             
-
-        # 3. Accept the close event to actually close the window
+        # 2. Stop the render loop
+        self.render_scheduler.stop()
+        self.stats_timer.stop()
+        
+        # 3. Cancel a running export and finish writing the recorded session to disk
+        if hasattr(self, 'export_worker') and self.export_worker.isRunning():
+            self.export_worker.stop()
+            self.export_worker.wait()
+        self.recorder.close()
+        self.alarm_model.close()
+
+        # 4. Accept the close event to actually close the window
         event.accept()
             
             
@@ -0,0 +1,34 @@
+# Performance benchmarks, run from the repository root, e.g.:
+#   python -m benchmarks.bench_framer
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.run_benchmarks --output results.json
+
+import socket
+import subprocess
+import sys
+
+_qt_app = None
+
+
+def qt_app(app_class):
+    """The process-wide Qt application, created on first use and kept alive until exit."""
+    global _qt_app
+    instance = app_class.instance()
+    if instance is None:
+        instance = _qt_app = app_class([])
+    return instance
+
+
+def start_load_generator(sensors, fps, sensors_per_frame, duration):
+    """Start the load generator on a free port, returns (process, port) once it listens."""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    command = [sys.executable, "-u", "simulator.py", "--mode", "loadgen", "--sensors", str(sensors),
+               "--fps", str(fps), "--port", str(port), "--seed", "0", "--duration", str(duration)]
+    if sensors_per_frame:
+        command += ["--sensors-per-frame", str(sensors_per_frame)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    for line in process.stdout:
+        if "Online at" in line:
+            return process, port
+    raise RuntimeError("load generator did not start")
@@ -0,0 +1,90 @@
+# Ingestion core benchmark, no Qt involved: IngestCore.process cost per frame vs sensor
+# count (state store + recorder sink, frames handed in directly), and the end-to-end rate
+# of the headless collector against a local load generator (separate process).
+#
+#   python -m benchmarks.bench_core --sensors 6 50 200
+
+import argparse
+import json
+import shutil
+import tempfile
+import time
+
+from benchmarks import start_load_generator
+from collector import HeadlessCollector, collector_config
+from ingest_core import IngestCore, RecorderSink, SensorStore
+from scenario import ScenarioEngine
+from session_recorder import SessionRecorder
+from simulator import load_config, make_virtual_sensors, generate_payload
+
+DISTINCT_FRAMES = 50
+WARMUP_S = 0.5
+
+
+def measure_process(sensors, frames, directory):
+    config = load_config()
+    config['sensors'] = make_virtual_sensors(sensors, config['sensors'])
+    engine = ScenarioEngine(config['sensors'], 0, config['connection']['update_interval'])
+    payloads = [generate_payload(config['sensors'], engine) for _ in range(DISTINCT_FRAMES)]
+
+    recorder = SessionRecorder(directory)
+    core = IngestCore(SensorStore.from_config(config), [RecorderSink(recorder)])
+    try:
+        start = time.perf_counter()
+        for i in range(frames):
+            core.process(payloads[i % DISTINCT_FRAMES])
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        recorder.flush()  # the background writer catching up is part of the sustained rate
+        flush_s = time.perf_counter() - start
+    finally:
+        recorder.close()
+
+    return {
+        "sensors": sensors,
+        "process_us_per_frame": round(elapsed / frames * 1e6, 1),
+        "process_us_per_sample": round(elapsed / frames / sensors * 1e6, 2),
+        "sustained_frames_per_s": round(frames / (elapsed + flush_s), 1),
+    }
+
+
+def measure_collector(sensors, fps, seconds, protocol):
+    process, port = start_load_generator(sensors, fps, None, WARMUP_S + seconds + 5)
+    try:
+        collector = HeadlessCollector(collector_config(sensors, protocol, "127.0.0.1", port),
+                                      record=False, stats_interval=0, verbose=False)
+        return collector.run(WARMUP_S + seconds)
+    finally:
+        process.terminate()
+        process.wait(5)
+        process.stdout.close()
+
+
+def run(sensor_counts=(6, 50, 200), frames=2000, collector_sensors=100, collector_fps=3000, seconds=3.0):
+    directory = tempfile.mkdtemp()
+    try:
+        process = [measure_process(sensors, frames, directory) for sensors in sensor_counts]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        "benchmark": "ingest_core",
+        "frames": frames,
+        "process": process,
+        "headless_collector": {
+            "sensors": collector_sensors,
+            "target_fps": collector_fps,
+            **{protocol: measure_collector(collector_sensors, collector_fps, seconds, protocol)
+               for protocol in ("json", "binary")},
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Qt-free ingestion core cost and headless collector rate")
+    parser.add_argument("--sensors", type=int, nargs="+", default=[6, 50, 200])
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--collector-sensors", type=int, default=100)
+    parser.add_argument("--collector-fps", type=int, default=3000)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sensors, args.frames, args.collector_sensors, args.collector_fps, args.seconds), indent=2))
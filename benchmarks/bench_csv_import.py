@@ -0,0 +1,107 @@
+# CSV import benchmark: chunked NumPy parsing of historian logs vs the csv module.
+# Writes a synthetic long (name,value,timestamp) or wide log, then measures the raw
+# parse rate (index pass) and the rate of fully built replay frames.
+#
+#   python -m benchmarks.bench_csv_import --rows 1000000
+#   python -m benchmarks.bench_csv_import --rows 10000000 --layout long   (~310 MB temp file)
+
+import argparse
+import csv
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from csv_import import CsvSessionReader, LAYOUT_LONG, LAYOUT_WIDE
+
+WRITE_BLOCK = 500_000  # rows formatted per write
+
+
+def make_csv(path, rows, sensors, layout, seed=0):
+    """Synthetic historian log with `rows` data rows."""
+    rng = np.random.default_rng(seed)
+    names = [f"Sensor_{i:04d}" for i in range(sensors)]
+    with open(path, 'w') as f:
+        if layout == LAYOUT_LONG:
+            f.write("name,value,timestamp\n")
+            for start in range(0, rows, WRITE_BLOCK):
+                idx = np.arange(start, min(rows, start + WRITE_BLOCK))
+                values = rng.uniform(0, 100, len(idx))
+                stamps = 1.7e9 + (idx // sensors) * 0.5
+                f.writelines(f"{names[i % sensors]},{v:.2f},{t:.1f}\n" for i, v, t in zip(idx.tolist(), values.tolist(), stamps.tolist()))
+        else:
+            f.write("timestamp," + ",".join(names) + "\n")
+            for start in range(0, rows, WRITE_BLOCK):
+                count = min(rows, start + WRITE_BLOCK) - start
+                block = np.column_stack((1.7e9 + np.arange(start, start + count) * 0.5, rng.uniform(0, 100, (count, sensors))))
+                np.savetxt(f, block, fmt=["%.1f"] + ["%.2f"] * sensors, delimiter=",")
+    return names
+
+
+def csv_module_rate(path, layout, max_rows):
+    """Rows per second of a plain csv.reader loop with float conversion (reference)."""
+    start, n = time.perf_counter(), 0
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        next(reader)
+        for row in reader:
+            if layout == LAYOUT_LONG:
+                float(row[1]), float(row[2])
+            else:
+                list(map(float, row))
+            n += 1
+            if n >= max_rows:
+                break
+    return n / (time.perf_counter() - start)
+
+
+def run(rows=1_000_000, sensors=6, layout=LAYOUT_LONG, path=None):
+    owned = path is None
+    if owned:
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+    try:
+        start = time.perf_counter()
+        names = make_csv(path, rows, sensors, layout)
+        write_s = time.perf_counter() - start
+
+        config = {name: {"low": 20.0, "high": 80.0} for name in names}
+        reader = CsvSessionReader(path, config)
+
+        start = time.perf_counter()
+        index = reader.build_index()
+        index_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        frames = sum(1 for _ in reader)
+        frames_s = time.perf_counter() - start
+
+        return {
+            "benchmark": "csv_import",
+            "layout": layout,
+            "rows": rows,
+            "sensors": sensors,
+            "file_mb": round(os.path.getsize(path) / 1e6, 1),
+            "write_s": round(write_s, 2),
+            "frames": index["count"],
+            "parse_s": round(index_s, 2),
+            "parse_rows_per_s": round(rows / index_s),
+            "replay_frames_s": round(frames_s, 2),
+            "replay_rows_per_s": round(rows / frames_s),
+            "csv_module_rows_per_s": round(csv_module_rate(path, layout, min(rows, 1_000_000))),
+        }
+    finally:
+        if owned:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked CSV import throughput")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="data rows (10000000 for the 10M-row run)")
+    parser.add_argument("--sensors", type=int, default=6)
+    parser.add_argument("--layout", choices=[LAYOUT_LONG, LAYOUT_WIDE], default=LAYOUT_LONG)
+    parser.add_argument("--path", help="keep the generated CSV at this path instead of a temp file")
+    args = parser.parse_args()
+    print(json.dumps(run(args.rows, args.sensors, args.layout, args.path), indent=2))
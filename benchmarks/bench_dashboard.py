@@ -0,0 +1,94 @@
+# Dashboard benchmark: GUI-thread cost of update_dashboard_batch and render_frame vs sensor count.
+# An offscreen Dashboard is built for each sensor count (virtual sensors cloned from the
+# config templates, recorder writing to a temp directory) and fed pre-generated frames
+# directly, without a worker, so only the GUI-side work is measured.
+#
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_dashboard --sensors 6 50 200
+
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QEvent
+from PyQt6.QtWidgets import QApplication
+
+from app import Dashboard
+from benchmarks import qt_app
+from scenario import ScenarioEngine
+from simulator import load_config, make_virtual_sensors, generate_payload
+
+DISTINCT_FRAMES = 50  # generated once, cycled through
+FRAMES_PER_RENDER = 4  # ~120 packets/s at the default 30 fps render cap
+
+
+def _measure(sensors, frames, directory):
+    config = load_config()
+    config['sensors'] = make_virtual_sensors(sensors, config['sensors'])
+    config['recorder'] = {**config.get('recorder', {}), "directory": directory}
+
+    engine = ScenarioEngine(config['sensors'], 0, config['connection']['update_interval'])
+    payloads = [generate_payload(config['sensors'], engine) for _ in range(DISTINCT_FRAMES)]
+
+    start = time.perf_counter()
+    dashboard = Dashboard(config)
+    build_s = time.perf_counter() - start
+    dashboard.render_scheduler.stop()  # frames are rendered explicitly below
+    dashboard.stats_timer.stop()
+
+    update_s = render_s = 0.0
+    renders = 0
+    try:
+        for i in range(0, frames, FRAMES_PER_RENDER):
+            # one batch per render frame, the way the live workers deliver them
+            batch = [payloads[(i + k) % DISTINCT_FRAMES] for k in range(FRAMES_PER_RENDER)]
+            start = time.perf_counter()
+            dashboard.update_dashboard_batch(batch)
+            update_s += time.perf_counter() - start
+            start = time.perf_counter()
+            dashboard.render_frame()
+            QApplication.processEvents()  # repaint what the frame changed
+            render_s += time.perf_counter() - start
+            renders += 1
+    finally:
+        with contextlib.redirect_stdout(sys.stderr):  # shutdown message, stdout is for the JSON
+            dashboard.close()
+        dashboard.deleteLater()
+        QApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)  # no event loop runs to delete it
+
+    return {
+        "sensors": sensors,
+        "build_s": round(build_s, 3),
+        "update_us_per_frame": round(update_s / frames * 1e6, 1),
+        "update_us_per_sample": round(update_s / frames / sensors * 1e6, 2),
+        "render_ms_per_frame": round(render_s / max(renders, 1) * 1e3, 2),
+        "max_frames_per_s": round(frames / (update_s + render_s), 1),
+    }
+
+
+def run(sensor_counts=(6, 50, 200), frames=400):
+    qt_app(QApplication)
+    directory = tempfile.mkdtemp()
+    try:
+        return {
+            "benchmark": "dashboard_update",
+            "frames": frames,
+            "frames_per_render": FRAMES_PER_RENDER,
+            "results": [_measure(sensors, frames, directory) for sensors in sensor_counts],
+        }
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="update_dashboard / render_frame cost vs sensor count")
+    parser.add_argument("--sensors", type=int, nargs="+", default=[6, 50, 200])
+    parser.add_argument("--frames", type=int, default=400)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sensors, args.frames), indent=2))
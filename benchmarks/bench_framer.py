@@ -0,0 +1,125 @@
+# Throughput benchmark: StreamFramer vs a correct buffered recv(4096) loop doing the same work
+# (carry the partial line, split on newlines, json.loads every frame). The legacy
+# recv(4096).decode().split('\n') loop is reported for its corrupt frames only: it drops
+# every frame larger than one read, so its MB/s is not comparable ("complete": false).
+# All loops read the same pre-generated stream from a local socket pair.
+#
+#   python -m benchmarks.bench_framer --frames 2000 --sensors 100
+
+import argparse
+import json
+import socket
+import threading
+import time
+
+from simulator import generate_payload
+from stream_framer import StreamFramer
+
+
+def make_stream(frames, sensors):
+    """Newline-delimited JSON frames shaped like the simulator output."""
+    config = {f"Sensor_{i:04d}": {"low": 20.0, "high": 80.0} for i in range(sensors)}
+    lines = [(json.dumps(generate_payload(config)) + "\n").encode('utf-8') for _ in range(min(frames, 50))]
+    return b"".join(lines[i % len(lines)] for i in range(frames))
+
+
+def legacy_loop(sock, decode=True):
+    """The pre-framer SensorWorker loop, counting fragments instead of disconnecting."""
+    frames = errors = 0
+    while True:
+        raw_data = sock.recv(4096).decode('utf-8')
+        if not raw_data:
+            break
+        for line in raw_data.strip().split('\n'):
+            if not line:
+                continue
+            if not decode:
+                frames += 1
+                continue
+            try:
+                json.loads(line)
+                frames += 1
+            except ValueError:
+                errors += 1  # a line that straddled the 4096-byte boundary
+    return frames, errors
+
+
+def buffered_loop(sock, decode=True):
+    """The straightforward correct loop: bytes accumulated, split on newlines, the tail carried over."""
+    pending = b""
+    frames = 0
+    while True:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            if not line:
+                continue
+            if decode:
+                json.loads(str(line, 'utf-8'))
+            frames += 1
+    return frames, 0
+
+
+def framer_loop(sock, decode=True):
+    framer = StreamFramer()
+    frames = 0
+    while framer.recv_into(sock):
+        for line in framer.frames():
+            if decode:
+                json.loads(str(line, 'utf-8'))
+            frames += 1
+    return frames, 0
+
+
+def _measure(loop, data, decode, expected):
+    sender, receiver = socket.socketpair()
+
+    def send():
+        sender.sendall(data)
+        sender.close()
+
+    thread = threading.Thread(target=send)
+    thread.start()
+    start = time.perf_counter()
+    frames, errors = loop(receiver, decode)
+    elapsed = time.perf_counter() - start
+    thread.join()
+    receiver.close()
+
+    return {
+        "seconds": round(elapsed, 4),
+        "mb_per_s": round(len(data) / elapsed / 1e6, 2),
+        "frames_per_s": round(frames / elapsed, 1),
+        "frames": frames,
+        "corrupt_frames": errors,
+        "complete": frames == expected,  # throughput only means something when every frame came out
+    }
+
+
+def run(frames=2000, sensors=100, decode=True):
+    data = make_stream(frames, sensors)
+    buffered = _measure(buffered_loop, data, decode, frames)
+    framer = _measure(framer_loop, data, decode, frames)
+    return {
+        "benchmark": "stream_framer",
+        "frames": frames,
+        "sensors": sensors,
+        "bytes_per_frame": len(data) // frames,
+        "json_decode": decode,
+        "legacy_recv_split": _measure(legacy_loop, data, decode, frames),
+        "buffered_recv_split": buffered,
+        "stream_framer": framer,
+        "speedup_vs_buffered": round(buffered["seconds"] / framer["seconds"], 2),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="StreamFramer vs legacy recv loop throughput")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--sensors", type=int, default=100)
+    parser.add_argument("--no-decode", action="store_true", help="measure framing only, skip json.loads")
+    args = parser.parse_args()
+    print(json.dumps(run(args.frames, args.sensors, not args.no_decode), indent=2))
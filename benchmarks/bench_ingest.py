@@ -0,0 +1,96 @@
+# Live ingestion benchmark: frames/s delivered by SensorWorker to the GUI thread.
+# The load generator (simulator.py --mode loadgen) runs as a separate process on a
+# free local port, the worker connects to it like the dashboard does and the frames
+# reaching the (offscreen) Qt event loop are counted over a fixed window, per protocol.
+# Frames the simulator skipped for a slow client show up as sequence gaps (lost_frames).
+#
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_ingest --sensors 100 --fps 2000
+
+import argparse
+import json
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtTest import QTest
+
+import wire_protocol
+from benchmarks import qt_app, start_load_generator
+from ingest_core import frame_stamp
+from latency import LatencyTracker, STAGE_NETWORK, STAGE_DECODE, STAGE_DISPATCH
+from sensor_worker import SensorWorker
+from simulator import load_config
+
+WARMUP_S = 0.5  # connect + first batches, not measured
+
+
+def _measure(protocol, sensors, fps, sensors_per_frame, seconds):
+    process, port = start_load_generator(sensors, fps, sensors_per_frame, WARMUP_S + seconds + 5)
+
+    latency = LatencyTracker()
+    connection = {**load_config()['connection'], "host": "127.0.0.1", "tcp_port": port, "protocol": protocol}
+    worker = SensorWorker(connection, latency)
+    received = {"frames": 0, "samples": 0}
+
+    def on_batch(batch):
+        # stands in for Dashboard.update_dashboard_batch, only counts
+        for frame in batch:
+            stamp = frame_stamp(frame)
+            if stamp is not None:
+                latency.dispatched(stamp[0])
+            received["samples"] += len(frame)
+        received["frames"] += len(batch)
+
+    worker.batch_received.connect(on_batch)
+    worker.start()
+    try:
+        QTest.qWait(int(WARMUP_S * 1000))
+        frames0, samples0 = received["frames"], received["samples"]
+        cpu0, start = time.process_time(), time.perf_counter()
+        QTest.qWait(int(seconds * 1000))
+        elapsed = time.perf_counter() - start
+        cpu = time.process_time() - cpu0
+        frames, samples = received["frames"] - frames0, received["samples"] - samples0
+    finally:
+        worker.stop()
+        worker.wait(5000)
+        process.terminate()
+        process.wait(5)
+        process.stdout.close()
+
+    stats = latency.stats()
+    stages = (STAGE_NETWORK, STAGE_DECODE, STAGE_DISPATCH)
+    return {
+        "frames_per_s": round(frames / elapsed, 1),
+        "samples_per_s": round(samples / elapsed, 1),
+        "cpu_percent": round(cpu / elapsed * 100, 1),  # worker + GUI thread, the simulator runs apart
+        "lost_frames": stats["lost"],
+        "latency_p50_ms": {stage: stats["stages"][stage]["p50_ms"] for stage in stages},
+        "latency_p99_ms": {stage: stats["stages"][stage]["p99_ms"] for stage in stages},
+    }
+
+
+def run(sensors=100, fps=2000, sensors_per_frame=None, seconds=3.0,
+        protocols=(wire_protocol.PROTOCOL_JSON, wire_protocol.PROTOCOL_BINARY)):
+    qt_app(QCoreApplication)  # event loop delivering the batches
+    results = {protocol: _measure(protocol, sensors, fps, sensors_per_frame, seconds) for protocol in protocols}
+    return {
+        "benchmark": "sensor_worker_ingest",
+        "sensors": sensors,
+        "sensors_per_frame": sensors_per_frame or sensors,
+        "target_fps": fps,
+        "seconds": seconds,
+        **results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SensorWorker frames/s against a local load generator")
+    parser.add_argument("--sensors", type=int, default=100)
+    parser.add_argument("--fps", type=int, default=2000, help="generator target rate, set above what the worker can take")
+    parser.add_argument("--sensors-per-frame", type=int, default=None)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    print(json.dumps(run(args.sensors, args.fps, args.sensors_per_frame, args.seconds), indent=2))
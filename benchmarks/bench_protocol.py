@@ -0,0 +1,73 @@
+# Wire protocol benchmark: bytes per frame and encode/decode cost of JSON vs binary frames.
+#
+#   python -m benchmarks.bench_protocol --frames 2000 --sensors 100
+
+import argparse
+import json
+import time
+
+import wire_protocol
+from simulator import generate_payload
+from stream_framer import StreamFramer
+
+
+def _timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6  # microseconds per frame
+
+
+def run(frames=2000, sensors=100):
+    config = {f"Sensor_{i:04d}": {"low": 20.0, "high": 80.0} for i in range(sensors)}
+    names = list(config)
+    name_to_id = {name: i for i, name in enumerate(names)}
+    payload = generate_payload(config)
+
+    json_frame = wire_protocol.encode_json_frame(payload, seq=0)  # stamped like the simulator's frames
+    records = wire_protocol.payload_to_records(payload, name_to_id)
+    binary_frame = wire_protocol.encode_binary_frame(records)
+    binary_payload = memoryview(binary_frame)[wire_protocol.FRAME_HEADER.size:]
+    json_line = memoryview(json_frame)[:-1]
+
+    # Whole-stream framing + decode, as SensorWorker does it
+    def json_stream():
+        framer = StreamFramer()
+        framer.feed(json_frame * 50)
+        for line in framer.frames():
+            json.loads(str(line, 'utf-8'))
+
+    def binary_stream():
+        framer = StreamFramer()
+        framer.feed(binary_frame * 50)
+        for frame in framer.length_prefixed_frames(wire_protocol.FRAME_HEADER):
+            wire_protocol.decode_binary_frame(frame)
+
+    stream_repeat = max(1, frames // 50)
+    return {
+        "benchmark": "wire_protocol",
+        "sensors": sensors,
+        "json": {
+            "bytes_per_frame": len(json_frame),
+            "encode_us": round(_timed(lambda: wire_protocol.encode_json_frame(payload, seq=0), frames), 2),
+            "decode_us": round(_timed(lambda: json.loads(str(json_line, 'utf-8')), frames), 2),
+            "framed_decode_us": round(_timed(json_stream, stream_repeat) / 50, 2),
+        },
+        "binary": {
+            "bytes_per_frame": len(binary_frame),
+            "encode_us": round(_timed(lambda: wire_protocol.encode_binary_frame(records), frames), 2),
+            "decode_us": round(_timed(lambda: wire_protocol.decode_binary_frame(binary_payload), frames), 2),
+            "framed_decode_us": round(_timed(binary_stream, stream_repeat) / 50, 2),
+            # expanding records back into dicts for the current Dashboard API
+            "to_sensor_list_us": round(_timed(lambda: wire_protocol.records_to_sensor_list(
+                wire_protocol.decode_binary_frame(binary_payload)[2], names), frames), 2),
+        },
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON vs binary wire protocol cost")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--sensors", type=int, default=100)
+    args = parser.parse_args()
+    print(json.dumps(run(args.frames, args.sensors), indent=2))
@@ -0,0 +1,120 @@
+# Session benchmark: export throughput per format and offline replay load time vs file size.
+# Each size records a synthetic session through SessionRecorder (temp directory), exports
+# it in every available format like SessionExportWorker does, then replays the NDJSON
+# exports with OfflineReplayWorker at MAX speed on an offscreen Qt event loop.
+#
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.bench_session --records 1000 10000 50000
+
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtTest import QTest
+
+import session_export
+from benchmarks import qt_app
+from scenario import ScenarioEngine
+from sensor_worker import OfflineReplayWorker
+from session_recorder import SessionRecorder
+from simulator import load_config, make_virtual_sensors, generate_payload
+
+REPLAY_FORMATS = (session_export.FORMAT_NDJSON, session_export.FORMAT_NDJSON_GZ)
+
+
+def record_session(directory, records, sensors):
+    """SessionRecorder filled with `records` entries spaced like the simulator output."""
+    config = load_config()
+    sensor_config = make_virtual_sensors(sensors, config['sensors'])
+    interval = config['connection']['update_interval']
+    engine = ScenarioEngine(sensor_config, 0, interval)
+
+    recorder = SessionRecorder(directory, chunk_records=config.get('recorder', {}).get('chunk_records', 10000))
+    start_ts = 1.7e9
+    for i in range(records):
+        # a fresh frame per record, cycled frames would make the compressed exports unrealistically small
+        recorder.append({"timestamp_unix": start_ts + i * interval, "sensors": generate_payload(sensor_config, engine)})
+    recorder.flush()
+    return recorder
+
+
+def measure_export(recorder, path, fmt):
+    start = time.perf_counter()
+    written = session_export.export_records(recorder.iter_records(), path, fmt, recorder.count)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    return {
+        "file_mb": round(size / 1e6, 2),
+        "seconds": round(elapsed, 3),
+        "records_per_s": round(written / elapsed),
+        "mb_per_s": round(size / elapsed / 1e6, 2),
+    }
+
+
+def measure_replay(path, records, timeout_s=300):
+    """Time to the first replayed frame and to the last one reaching the GUI thread."""
+    worker = OfflineReplayWorker(path, OfflineReplayWorker.SPEED_MAX)
+    received = {"frames": 0, "first": None, "last": None}
+
+    def on_batch(batch):
+        now = time.perf_counter()
+        received["first"] = received["first"] or now
+        received["last"] = now
+        received["frames"] += len(batch)
+
+    worker.batch_received.connect(on_batch)
+    start = time.perf_counter()
+    worker.start()
+    deadline = start + timeout_s
+    while received["frames"] < records and time.perf_counter() < deadline:
+        QTest.qWait(5)
+    worker.stop()
+    worker.wait(5000)
+
+    elapsed = (received["last"] or time.perf_counter()) - start
+    return {
+        "file_mb": round(os.path.getsize(path) / 1e6, 2),
+        "frames": received["frames"],
+        "first_frame_ms": round((received["first"] - start) * 1e3, 1) if received["first"] else None,
+        "replay_s": round(elapsed, 3),
+        "frames_per_s": round(received["frames"] / elapsed),
+        "mb_per_s": round(os.path.getsize(path) / elapsed / 1e6, 2),  # of the file as stored
+    }
+
+
+def run(record_counts=(1_000, 10_000, 50_000), sensors=6):
+    qt_app(QCoreApplication)
+    results = []
+    for records in record_counts:
+        directory = tempfile.mkdtemp()
+        recorder = record_session(os.path.join(directory, "sessions"), records, sensors)
+        try:
+            export, replay = {}, {}
+            for fmt in session_export.available_formats():
+                path = os.path.join(directory, "Session" + session_export.EXPORT_FORMATS[fmt][1])
+                export[fmt] = measure_export(recorder, path, fmt)
+                if fmt in REPLAY_FORMATS:
+                    replay[fmt] = measure_replay(path, records)
+            results.append({"records": records, "export": export, "replay": replay})
+        finally:
+            recorder.close()
+            shutil.rmtree(directory, ignore_errors=True)
+
+    return {
+        "benchmark": "session_export_replay",
+        "sensors": sensors,
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session export throughput and replay load time")
+    parser.add_argument("--records", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--sensors", type=int, default=6)
+    args = parser.parse_args()
+    print(json.dumps(run(args.records, args.sensors), indent=2))
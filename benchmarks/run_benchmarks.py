@@ -0,0 +1,90 @@
+# Headless benchmark suite: runs every benchmark offscreen and writes one JSON document
+# (environment + per-benchmark results) that can be diffed or compared between runs.
+#
+#   QT_QPA_PLATFORM=offscreen python -m benchmarks.run_benchmarks --output results.json
+#   python -m benchmarks.run_benchmarks --quick --only ingest dashboard
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt6.QtCore import PYQT_VERSION_STR, QT_VERSION_STR
+from PyQt6.QtWidgets import QApplication
+
+from benchmarks import (qt_app, bench_core, bench_csv_import, bench_dashboard, bench_framer, bench_ingest, bench_protocol,
+                        bench_session)
+
+# name -> (run function, full options, --quick options)
+BENCHMARKS = {
+    "ingest": (bench_ingest.run, {"sensors": 100, "fps": 2000, "seconds": 5.0},
+               {"sensors": 100, "fps": 2000, "seconds": 1.5}),
+    "core": (bench_core.run, {"sensor_counts": (6, 50, 200), "frames": 2000, "seconds": 5.0},
+             {"sensor_counts": (6, 50), "frames": 500, "seconds": 1.5}),
+    "dashboard": (bench_dashboard.run, {"sensor_counts": (6, 50, 200), "frames": 400},
+                  {"sensor_counts": (6, 50), "frames": 200}),
+    "session": (bench_session.run, {"record_counts": (1_000, 10_000, 50_000)},
+                {"record_counts": (1_000, 5_000)}),
+    "protocol": (bench_protocol.run, {"frames": 2000, "sensors": 100}, {"frames": 500, "sensors": 100}),
+    "framer": (bench_framer.run, {"frames": 2000, "sensors": 100}, {"frames": 500, "sensors": 100}),
+    "csv_import": (bench_csv_import.run, {"rows": 1_000_000}, {"rows": 100_000}),
+}
+
+
+def environment():
+    """What the numbers depend on, stored next to them."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "qpa_platform": os.environ.get("QT_QPA_PLATFORM"),
+    }
+
+
+def run(names=None, quick=False):
+    qt_app(QApplication)  # one application for the whole suite, widgets need the QApplication flavour
+    report = {"suite": "dashboard_benchmarks", "quick": quick, "environment": environment(), "benchmarks": {}}
+    for name in names or BENCHMARKS:
+        fn, options, quick_options = BENCHMARKS[name]
+        print(f"Running {name}...", file=sys.stderr)
+        start = time.perf_counter()
+        # Simulator / dashboard messages go to stderr, stdout only carries the JSON report
+        with contextlib.redirect_stdout(sys.stderr):
+            result = fn(**(quick_options if quick else options))
+        result["elapsed_s"] = round(time.perf_counter() - start, 2)
+        report["benchmarks"][name] = result
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the headless benchmark suite and emit JSON")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run these benchmarks only")
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a smoke run (~20 s)")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    report = run(args.only, args.quick)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + "\n")
+        print(f"Results written to {args.output}", file=sys.stderr)
+    else:
+        print(text)
@@ -0,0 +1,141 @@
+import argparse
+import json
+import sys
+import threading
+import time
+
+import simulator
+from ingest_core import AlarmLogSink, IngestCore, MultiSource, RecorderSink, SensorStore, TcpSource, endpoints_from_config
+from latency import LatencyTracker, STAGE_NETWORK, STAGE_DECODE, STAGE_DISPATCH
+from session_recorder import SessionRecorder
+
+
+# Headless collector: the dashboard's ingestion pipeline without Qt or a display.
+# Frames from the TCP simulator go through the same TcpSource / SensorStore as in
+# the dashboard, are archived by the SessionRecorder (NDJSON chunks, exportable and
+# replayable as usual) and alarm transitions are logged to stdout. The whole pipeline
+# runs in one thread, so its rate is the raw throughput of the ingestion core; with
+# connection endpoints configured every production line is collected by that thread.
+class HeadlessCollector:
+
+    def __init__(self, config, record=True, alarm_stream=None, stats_interval=10.0, verbose=True):
+        self.config = config
+        self.verbose = verbose  # connection messages on stdout
+        self.latency = LatencyTracker()
+        self.store = SensorStore.from_config(config)
+        self.recorder = SessionRecorder.from_config(config) if record else None
+
+        sinks = []
+        if self.recorder is not None:
+            sinks.append(RecorderSink(self.recorder))
+        if alarm_stream is not None:
+            sinks.append(AlarmLogSink(alarm_stream))
+        self.core = IngestCore(self.store, sinks, self.latency)
+        endpoints = endpoints_from_config(config['connection'])
+        if endpoints:
+            self.source = MultiSource(endpoints, self.core.process_batch, on_log=self.log, latency=self.latency)
+        else:
+            self.source = TcpSource(config['connection'], self.core.process_batch, on_log=self.log, latency=self.latency)
+
+        self.stats_interval = stats_interval
+        self._started = None  # (wall, cpu, frames, samples) at start
+        self._window = None  # same, at the last periodic report
+        self._timer = None
+        self._done = threading.Event()
+
+    def log(self, msg):
+        if self.verbose:
+            print(f"{time.strftime('%H:%M:%S')} {msg}", flush=True)
+
+    def run(self, duration=None):
+        """Collect until stop() or `duration` seconds, returns the final report."""
+        self._started = self._window = self._snapshot()
+        if duration is not None:
+            self._timer = threading.Timer(duration, self.stop)
+            self._timer.daemon = True
+            self._timer.start()
+        if self.stats_interval:
+            threading.Thread(target=self._report_stats, name="CollectorStats", daemon=True).start()
+        try:
+            self.source.run()
+        finally:
+            self.stop()
+            if self.recorder is not None:
+                self.recorder.close()
+        return self.report()
+
+    def stop(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._done.set()
+        self.source.stop()
+
+    def report(self, since=None):
+        """Frames / samples per second and CPU usage since `since` (defaults to the start)."""
+        wall0, cpu0, frames0, samples0 = since or self._started or self._snapshot()
+        wall = max(time.perf_counter() - wall0, 1e-9)
+        latency = self.latency.stats()
+        report = {
+            "frames": self.core.frames - frames0,
+            "frames_per_s": round((self.core.frames - frames0) / wall, 1),
+            "samples_per_s": round((self.core.samples - samples0) / wall, 1),
+            "cpu_percent": round((time.process_time() - cpu0) / wall * 100, 1),
+            "lost_frames": latency["lost"],
+            "sensors_in_alarm": self.store.health.alarm_count,
+            "latency_p50_ms": {stage: latency["stages"][stage]["p50_ms"]
+                               for stage in (STAGE_NETWORK, STAGE_DECODE, STAGE_DISPATCH)},
+            "elapsed_s": round(wall, 2),
+        }
+        if isinstance(self.source, MultiSource):
+            report["endpoints"] = {name: {"connected": stats["connected"], "reconnects": stats["reconnects"]}
+                                   for name, stats in self.source.stats().items()}
+        elif self.source.supervisor is not None:
+            report["reconnects"] = self.source.supervisor.reconnects
+        if self.recorder is not None:
+            report["recorded"] = self.recorder.count
+            report["record_dropped"] = self.recorder.dropped
+            report["session_dir"] = self.recorder.session_dir
+        return report
+
+    def _snapshot(self):
+        return time.perf_counter(), time.process_time(), self.core.frames, self.core.samples
+
+    def _report_stats(self):
+        while not self._done.wait(self.stats_interval):
+            print(f"Collector stats: {json.dumps(self.report(self._window))}", flush=True)
+            self._window = self._snapshot()
+
+
+def collector_config(sensors=None, protocol=None, host=None, port=None):
+    """The dashboard config with command line overrides. `sensors` switches to the
+    load generator's virtual sensors (simulator.py --mode loadgen --sensors N)."""
+    config = simulator.load_config()
+    if sensors:
+        config['sensors'] = simulator.make_virtual_sensors(sensors, config['sensors'])
+    overrides = {"protocol": protocol, "host": host, "tcp_port": port}
+    config['connection'] = {**config['connection'], **{k: v for k, v in overrides.items() if v is not None}}
+    return config
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless sensor collector (no Qt, no display)")
+    parser.add_argument("--duration", type=float, default=None, help="stop after N seconds and print the report")
+    parser.add_argument("--protocol", choices=["json", "binary"], default=None, help="wire protocol (default: config)")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None, help="TCP port (default: config tcp_port)")
+    parser.add_argument("--sensors", type=int, default=None, help="collect the load generator's N virtual sensors")
+    parser.add_argument("--no-record", action="store_true", help="do not archive the session to disk")
+    parser.add_argument("--no-alarms", action="store_true", help="do not log alarm transitions")
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="seconds between stats lines (0: off)")
+    args = parser.parse_args()
+
+    collector = HeadlessCollector(collector_config(args.sensors, args.protocol, args.host, args.port),
+                                  record=not args.no_record, alarm_stream=None if args.no_alarms else sys.stdout,
+                                  stats_interval=args.stats_interval)
+    try:
+        final = collector.run(args.duration)
+    except KeyboardInterrupt:
+        collector.stop()
+        final = collector.report()
+        print("\nCollector shut down.")
+    print(json.dumps(final, indent=2))
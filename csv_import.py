@@ -0,0 +1,294 @@
+import csv
+import re
+import time
+import warnings
+
+import numpy as np
+
+import wire_protocol
+
+
+# CSV session import for offline replay (historian exports).
+# Two layouts are understood:
+#   wide: timestamp, <sensor>, <sensor>, ...   one row per frame
+#   long: name, value, timestamp               one row per reading, consecutive rows with
+#                                              the same timestamp form one frame
+# Files are parsed in chunks with np.loadtxt, statuses are computed from the
+# configured limits in one vectorized step and frames come out in the same
+# {"timestamp_unix": ..., "sensors": [...]} structure as session exports.
+# A chunk loadtxt rejects (short row, unreadable cell) is parsed row by row instead:
+# empty cells are dropped, rows without a readable timestamp (long layout: also
+# without a name or value) are skipped and counted in skipped_rows.
+# ISO 8601 timestamps without an offset are local wall-clock time, the time zone the
+# dashboard displays; a trailing Z or +hh:mm offset is honored.
+
+LAYOUT_WIDE = "wide"
+LAYOUT_LONG = "long"
+
+CHUNK_BYTES = 8 * 1024 * 1024  # text parsed per step
+
+TIMESTAMP_COLUMNS = ("timestampunix", "timestamp", "time", "ts", "datetime", "date")
+NAME_COLUMNS = ("name", "sensor", "sensorname", "tag")
+VALUE_COLUMNS = ("value", "reading", "val")
+
+
+def normalize(column):
+    """Column / sensor name key: case, spaces and punctuation are ignored."""
+    return re.sub(r'[^0-9a-z]', '', column.lower())
+
+
+class CsvSessionReader:
+
+    def __init__(self, path, sensor_config, chunk_bytes=CHUNK_BYTES):
+        self.path = path
+        self.chunk_bytes = chunk_bytes
+        self.sensor_names = list(sensor_config)
+        self.low = np.array([s['low'] for s in sensor_config.values()], dtype=np.float64)
+        self.high = np.array([s['high'] for s in sensor_config.values()], dtype=np.float64)
+        self._name_ids = {normalize(name): i for i, name in enumerate(self.sensor_names)}
+        self._raw_ids = {}  # name as written in the file -> sensor id (-1 if not configured)
+        self.index = None
+        self.skipped_rows = 0  # malformed rows dropped by the last pass over the file
+
+        with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+            header = f.readline()
+            first_row = f.readline()
+        self.delimiter = max(",;\t|", key=header.count)
+        self.columns = next(csv.reader([header], delimiter=self.delimiter))
+        self._detect_layout()
+        self._detect_time_format(first_row)
+
+    @property
+    def count(self):
+        return self.index["count"] if self.index else None
+
+    @property
+    def start_time(self):
+        return self.index["start_time"] if self.index else None
+
+    @property
+    def end_time(self):
+        return self.index["end_time"] if self.index else None
+
+    def __iter__(self):
+        return self.records()
+
+    def records(self, start_time=None, collect_index=True):
+        """Yield frames in file order, starting at the first one with timestamp_unix >= start_time.
+
+        A seek always scans forward block by block, only build_index() fills the index
+        (collect_index is accepted for SessionReader compatibility).
+        """
+        status_names = wire_protocol.STATUS_NAMES
+        names = self.sensor_names
+
+        for ts, ids, values, starts in self._blocks():
+            if start_time is not None:
+                if ts[-1] < start_time:
+                    continue  # whole block before the seek target, no frames built
+                starts = starts[ts[starts] >= start_time]
+                if not len(starts):
+                    continue
+
+            ends = np.append(starts[1:], len(ts)).tolist()
+            codes = np.where(values < self.low[ids], 1, np.where(values > self.high[ids], 2, 0)).tolist()
+            ts_list, ids_list, value_list = ts.tolist(), ids.tolist(), values.round(2).tolist()
+
+            for start, end in zip(starts.tolist(), ends):
+                frame_ts = ts_list[start]
+                label = time.strftime("%H:%M:%S", time.localtime(frame_ts))
+                yield {
+                    "timestamp_unix": frame_ts,
+                    "sensors": [
+                        {"name": names[ids_list[i]], "value": value_list[i], "timestamp": label,
+                         "status": status_names[codes[i]]}
+                        for i in range(start, end)
+                    ],
+                }
+
+    def build_index(self, should_stop=None):
+        """Count frames and find the time range in one vectorized pass (kept in memory only)."""
+        count, first_ts, last_ts = 0, None, None
+        for ts, _, _, starts in self._blocks():
+            if should_stop and should_stop():
+                return None
+            first_ts = float(ts[0]) if first_ts is None else first_ts
+            last_ts = float(ts[-1])
+            count += len(starts)
+        self.index = {"count": count, "start_time": first_ts, "end_time": last_ts}
+        return self.index
+
+    # --- layout ---
+
+    def _detect_layout(self):
+        keys = [normalize(c) for c in self.columns]
+
+        def find(candidates):
+            for candidate in candidates:
+                if candidate in keys:
+                    return keys.index(candidate)
+            return None
+
+        self.timestamp_col = find(TIMESTAMP_COLUMNS)
+        if self.timestamp_col is None:
+            raise ValueError(f"CSV has no timestamp column (expected one of {', '.join(TIMESTAMP_COLUMNS)})")
+
+        self.name_col, self.value_col = find(NAME_COLUMNS), find(VALUE_COLUMNS)
+        if self.name_col is not None and self.value_col is not None:
+            self.layout = LAYOUT_LONG
+            return
+
+        # Wide: every column named after a configured sensor, others (units, comments...) are ignored
+        self.layout = LAYOUT_WIDE
+        self.sensor_cols = [i for i, key in enumerate(keys) if key in self._name_ids and i != self.timestamp_col]
+        if not self.sensor_cols:
+            raise ValueError("No CSV columns match the sensors in sensors_config.json")
+        self.sensor_ids = np.array([self._name_ids[keys[i]] for i in self.sensor_cols], dtype=np.intp)
+
+    def _detect_time_format(self, first_row):
+        fields = next(csv.reader([first_row], delimiter=self.delimiter), [])
+        sample = fields[self.timestamp_col].strip() if len(fields) > self.timestamp_col else ""
+        try:
+            value = abs(float(sample))
+        except ValueError:
+            self.numeric_time, self.time_scale = False, 1.0  # ISO 8601: naive times are local, offsets honored
+            return
+        self.numeric_time = True
+        # Unix seconds, or milli / micro / nanoseconds judging by magnitude
+        self.time_scale = 1e-9 if value > 1e17 else 1e-6 if value > 1e14 else 1e-3 if value > 1e11 else 1.0
+
+    # --- parsing ---
+
+    def _blocks(self):
+        # (timestamps, sensor ids, values, frame start rows) per chunk. The last frame of a
+        # chunk is carried over, so rows of one frame never span two blocks.
+        carry = None
+        for chunk in self._chunks():
+            if carry is not None:
+                chunk = tuple(np.concatenate(pair) for pair in zip(carry, chunk))
+            ts = chunk[0]
+            if not len(ts):
+                continue
+            starts = np.flatnonzero(np.concatenate(([True], ts[1:] != ts[:-1])))
+            last = starts[-1]
+            carry = tuple(column[last:] for column in chunk)
+            if last:
+                yield tuple(column[:last] for column in chunk) + (starts[:-1],)
+        if carry is not None and len(carry[0]):
+            yield carry + (np.zeros(1, dtype=np.intp),)
+
+    def _chunks(self):
+        self.skipped_rows = 0
+        with open(self.path, 'r', newline='', encoding='utf-8-sig') as f:
+            f.readline()  # header
+            while True:
+                lines = f.readlines(self.chunk_bytes)  # blank lines are skipped by loadtxt
+                if not lines:
+                    return
+                yield self._parse(lines)
+
+    def _parse(self, lines):
+        try:
+            return self._parse_chunk(lines)
+        except ValueError:
+            return self._parse_rows(lines)
+
+    def _parse_chunk(self, lines):
+        value_cols = [self.value_col] if self.layout == LAYOUT_LONG else self.sensor_cols
+        if self.numeric_time:
+            # Values and timestamps come out of one loadtxt pass
+            floats = self._floats(lines, value_cols + [self.timestamp_col])
+            matrix, ts = floats[:, :-1], floats[:, -1] * self.time_scale
+        else:
+            matrix = self._floats(lines, value_cols)
+            ts = self._timestamps(self._strings(lines, self.timestamp_col))
+        names = self._strings(lines, self.name_col).tolist() if self.layout == LAYOUT_LONG else None
+        return self._select(ts, matrix, names)
+
+    def _parse_rows(self, lines):
+        # Slow path for a chunk loadtxt rejected: every row on its own
+        rows = [row for row in csv.reader(lines, delimiter=self.delimiter) if row]
+        value_cols = [self.value_col] if self.layout == LAYOUT_LONG else self.sensor_cols
+        matrix = np.array([[_cell(row, col) for col in value_cols] for row in rows], dtype=np.float64)
+        matrix = matrix.reshape(len(rows), len(value_cols))
+        stamps = np.array([row[self.timestamp_col].strip() if len(row) > self.timestamp_col else ""
+                           for row in rows], dtype=str)
+        try:
+            ts = self._timestamps(stamps)
+        except ValueError:
+            ts = np.array([self._timestamp(stamp) for stamp in stamps.tolist()], dtype=np.float64)
+
+        bad = np.isnan(ts)
+        names = None
+        if self.layout == LAYOUT_LONG:
+            names = [row[self.name_col].strip() if len(row) > self.name_col else "" for row in rows]
+            bad |= np.isnan(matrix[:, 0]) | ~np.array([bool(name) for name in names], dtype=bool)
+        self.skipped_rows += int(np.count_nonzero(bad))
+        return self._select(ts, matrix, names)
+
+    def _select(self, ts, matrix, names):
+        # Flatten a chunk into (timestamps, sensor ids, values), one entry per reading
+        if self.layout == LAYOUT_LONG:
+            values = matrix[:, 0]
+            for name in set(names).difference(self._raw_ids):
+                self._raw_ids[name] = self._name_ids.get(normalize(name), -1)
+            ids = np.fromiter(map(self._raw_ids.__getitem__, names), dtype=np.intp, count=len(names))
+        else:
+            values = matrix.reshape(-1)
+            ids = np.tile(self.sensor_ids, len(matrix))
+            ts = np.repeat(ts, len(self.sensor_cols))
+
+        keep = (ids >= 0) & ~np.isnan(values) & ~np.isnan(ts)  # unknown sensors and empty cells
+        return ts[keep], ids[keep], values[keep]
+
+    def _floats(self, lines, cols):
+        return np.loadtxt(lines, delimiter=self.delimiter, usecols=cols, ndmin=2,
+                          comments=None, quotechar='"', dtype=np.float64)
+
+    def _strings(self, lines, col):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # "line contained no data" notice for blank lines
+            return np.loadtxt(lines, delimiter=self.delimiter, usecols=col, ndmin=1,
+                              comments=None, quotechar='"', dtype=str)
+
+    def _timestamps(self, raw):
+        # Unix seconds for a column of timestamp strings, ValueError if one is unreadable
+        raw = np.char.strip(raw)
+        if self.numeric_time:
+            return raw.astype(np.float64) * self.time_scale
+        # An offset is a Z, a '+' or a '-' after the date (YYYY-MM-DD uses the first ten characters)
+        aware = np.char.endswith(raw, "Z") | (np.char.rfind(raw, "+") >= 0) | (np.char.rfind(raw, "-") > 9)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # numpy converts explicit offsets to UTC
+            parsed = np.char.rstrip(raw, "Z").astype("datetime64[us]")
+        if np.isnat(parsed).any():
+            raise ValueError("Empty CSV timestamp")
+        seconds = parsed.astype(np.int64) / 1e6
+        if not aware.all():
+            seconds[~aware] = _local_to_unix(seconds[~aware])
+        return seconds
+
+    def _timestamp(self, stamp):
+        try:
+            return float(self._timestamps(np.array([stamp]))[0])
+        except ValueError:
+            return np.nan
+
+
+def _cell(row, col):
+    # Float value of a CSV cell, NaN if it is missing, empty or not a number
+    try:
+        return float(row[col])
+    except (IndexError, ValueError):
+        return np.nan
+
+
+def _local_to_unix(wall):
+    """Unix seconds for local wall-clock times given as seconds since 1970-01-01 00:00 (no zone)."""
+    def offsets(seconds):
+        # UTC offset of the local zone, looked up once per hour of the data (DST aware)
+        hours, inverse = np.unique(np.floor(seconds / 3600.0), return_inverse=True)
+        table = np.array([time.localtime(h * 3600.0).tm_gmtoff for h in hours.tolist()], dtype=np.float64)
+        return table[inverse.reshape(-1)]
+
+    return wall - offsets(wall - offsets(wall))
@@ -0,0 +1,87 @@
+# Global system health aggregated from the per-sensor statuses.
+# Sensor statuses are fed in as packets arrive; the dashboard asks for the
+# aggregated state once per render frame and only restyles the status
+# indicator when commit() reports a change.
+
+HEALTH_OFFLINE = "OFFLINE"  # never connected / simulator restarted
+HEALTH_DISCONNECTED = "DISCONNECTED"
+HEALTH_OK = "OK"  # live, no sensor in alarm
+HEALTH_ALARM = "ALARM"  # at least one sensor in alarm
+HEALTH_REPLAY = "REPLAY"  # offline replay, no sensor in alarm
+
+# Data sources; OFFLINE and DISCONNECTED are also final states
+MODE_LIVE = "LIVE"
+MODE_REPLAY = "REPLAY"
+
+
+class HealthAggregator:
+
+    def __init__(self):
+        self.mode = HEALTH_OFFLINE
+        self._in_alarm = set()  # sensors whose latest status is an alarm
+        self._committed = None  # (state, alarm_count) last handed out by commit()
+
+    @property
+    def alarm_count(self):
+        """Number of sensors currently in alarm."""
+        return len(self._in_alarm)
+
+    @property
+    def alarm_sensors(self):
+        return frozenset(self._in_alarm)
+
+    def update(self, name, status):
+        """Record a sensor's latest status, returns True when the sensor just entered alarm."""
+        if "ALARM" in status:
+            if name in self._in_alarm:
+                return False
+            self._in_alarm.add(name)
+            return True
+        self._in_alarm.discard(name)
+        return False
+
+    def set_mode(self, mode):
+        """HEALTH_OFFLINE, HEALTH_DISCONNECTED, MODE_LIVE or MODE_REPLAY."""
+        self.mode = mode
+
+    def clear(self):
+        self._in_alarm.clear()
+
+    def state(self):
+        if self.mode in (HEALTH_OFFLINE, HEALTH_DISCONNECTED):
+            return self.mode
+        if self._in_alarm:
+            return HEALTH_ALARM
+        return HEALTH_REPLAY if self.mode == MODE_REPLAY else HEALTH_OK
+
+    def commit(self):
+        """(state, alarm_count) if either changed since the last commit, otherwise None."""
+        current = (self.state(), self.alarm_count)
+        if current == self._committed:
+            return None
+        self._committed = current
+        return current
+
+
+def endpoint_health(connection_stats, alarm_sensors, sep="/"):
+    """(state, alarm_count) of every endpoint (production line), by name.
+
+    connection_stats maps endpoint names to their supervisor stats, None while
+    never connected; alarm_sensors are namespaced names ("line1/Temperature").
+    """
+    counts = dict.fromkeys(connection_stats, 0)
+    for name in alarm_sensors:
+        endpoint = name.partition(sep)[0]
+        if endpoint in counts:
+            counts[endpoint] += 1
+
+    health = {}
+    for endpoint, stats in connection_stats.items():
+        if stats is None:
+            state = HEALTH_OFFLINE
+        elif not stats["connected"]:
+            state = HEALTH_DISCONNECTED
+        else:
+            state = HEALTH_ALARM if counts[endpoint] else HEALTH_OK
+        health[endpoint] = (state, counts[endpoint])
+    return health
@@ -0,0 +1,783 @@
+import asyncio
+import json
+import math
+import socket
+import threading
+import time
+
+import websockets
+
+import simulator
+import wire_protocol
+from alarm_engine import AlarmEngine, STATUS_NAMES, STATUS_OK
+from health import HealthAggregator
+from lod import minmax_line
+from ring_buffer import RingBuffer
+from rollup import RollupStore
+from stream_framer import StreamFramer
+from supervisor import ConnectionSupervisor
+
+
+# Qt-independent ingestion pipeline: transport -> decoder -> state store -> sinks.
+# The Qt workers and the Dashboard are thin adapters over these classes (signals in,
+# widgets out); collector.py runs the same pipeline headless. Nothing here imports PyQt.
+
+PLOT_RAW_SECONDS = 120  # raw plot history kept per sensor by default, longer windows come from the rollups
+ROLLUP_MAX_POINTS = 4000  # buckets per sensor for a plot window served from the rollups
+
+ENDPOINT_TCP = "tcp"
+ENDPOINT_WEBSOCKET = "ws"
+NAMESPACE_SEP = "/"  # endpoint name / sensor name, e.g. "line1/Temperature"
+
+
+# --- 0. ENDPOINTS ---
+
+def endpoints_from_config(connection):
+    """Resolved connection['endpoints'] entries, [] for the single-simulator setup.
+
+    Every endpoint inherits the connection settings (protocol, batching, reconnect
+    delays, host) and overrides what it sets itself. A WebSocket endpoint without a
+    url connects to ws://host:ws_port.
+    """
+    defaults = {key: value for key, value in connection.items() if key != 'endpoints'}
+    endpoints = []
+    for i, endpoint in enumerate(connection.get('endpoints') or []):
+        resolved = {**defaults, "name": f"line{i + 1}", "type": ENDPOINT_TCP, **endpoint}
+        if resolved['type'] not in (ENDPOINT_TCP, ENDPOINT_WEBSOCKET):
+            raise ValueError(f"Endpoint {resolved['name']}: unknown type {resolved['type']!r}")
+        if NAMESPACE_SEP in resolved['name']:
+            raise ValueError(f"Endpoint name {resolved['name']!r} must not contain {NAMESPACE_SEP!r}")
+        if resolved['type'] == ENDPOINT_WEBSOCKET and 'url' not in resolved:
+            resolved['url'] = f"ws://{resolved['host']}:{resolved['ws_port']}"
+        endpoints.append(resolved)
+
+    names = [endpoint['name'] for endpoint in endpoints]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Endpoint names must be unique: {names}")
+    return endpoints
+
+
+def sensor_space(config):
+    """Sensor settings keyed by the names readings are stored under: "line/Sensor" for
+    every endpoint (its `sensors` list, all configured sensors by default) when
+    endpoints are configured, the plain sensor names otherwise."""
+    endpoints = endpoints_from_config(config['connection'])
+    if not endpoints:
+        return config['sensors']
+    space = {}
+    for endpoint in endpoints:
+        for name in endpoint.get('sensors') or config['sensors']:
+            if name not in config['sensors']:
+                raise ValueError(f"Endpoint {endpoint['name']}: sensor {name!r} is not configured")
+            space[endpoint['name'] + NAMESPACE_SEP + name] = config['sensors'][name]
+    return space
+
+
+def split_name(name):
+    """(endpoint, sensor) of a namespaced name, (None, name) for a plain one."""
+    endpoint, sep, sensor = name.partition(NAMESPACE_SEP)
+    return (endpoint, sensor) if sep else (None, name)
+
+
+def group_by_sensor(names):
+    """Namespaced names grouped by sensor, in first-seen order: {"Temperature":
+    ["line1/Temperature", "line2/Temperature"], ...}. Plain names form their own group."""
+    groups = {}
+    for name in names:
+        groups.setdefault(split_name(name)[1], []).append(name)
+    return groups
+
+
+# Accumulates decoded frames so workers emit one queued signal per batch
+# instead of one per packet. A batch is due after interval_ms or max_frames,
+# whichever comes first.
+class FrameBatcher:
+
+    def __init__(self, interval_ms=50, max_frames=64):
+        self.interval = interval_ms / 1000.0
+        self.max_frames = max(1, int(max_frames))
+        self._frames = []
+        self._first_at = None  # arrival time of the oldest pending frame
+
+    @classmethod
+    def from_config(cls, connection):
+        return cls(connection.get('batch_interval_ms', 50), connection.get('batch_max_frames', 64))
+
+    def __len__(self):
+        return len(self._frames)
+
+    def add(self, frame):
+        """Queue a frame, returns True when the batch should be flushed."""
+        if not self._frames:
+            self._first_at = time.monotonic()
+        self._frames.append(frame)
+        return len(self._frames) >= self.max_frames
+
+    def time_left(self):
+        """Seconds until the pending batch is due, None when nothing is pending."""
+        if not self._frames:
+            return None
+        return max(0.0, self.interval - (time.monotonic() - self._first_at))
+
+    def due(self):
+        return bool(self._frames) and self.time_left() == 0.0
+
+    def take(self):
+        frames, self._frames = self._frames, []
+        self._first_at = None
+        return frames
+
+
+
+# --- 1. DECODER ---
+
+# A frame is a sensor dict list (JSON protocol; a wire_protocol.SensorFrame when the
+# simulator stamped it or a replay attached the recorded time) or a wire_protocol.RecordFrame
+# (binary protocol), which the pipeline reads as columns without building dicts.
+
+def frame_stamp(frame):
+    """(seq, sent_ns, first sensor name) of a simulator frame, None for frames without them."""
+    seq = getattr(frame, "seq", None)
+    if seq is None or not len(frame):
+        return None
+    first = frame.first_name if isinstance(frame, wire_protocol.RecordFrame) else frame[0]["name"]
+    return seq, frame.sent_ns, first
+
+
+def frame_time(frame, now):
+    """Unix time the readings of a frame were taken: the recorded timestamp_unix of a replayed
+    frame, the simulator's send time of a stamped one, `now` (arrival) for anything else."""
+    recorded = getattr(frame, "timestamp_unix", None)
+    if recorded is not None:
+        return recorded
+    sent_ns = getattr(frame, "sent_ns", None)
+    return now if sent_ns is None else sent_ns / 1e9
+
+
+def sensor_dicts(frame):
+    """The sensor dict list of a frame, for consumers of the JSON layout (data_received)."""
+    return frame.sensor_list() if isinstance(frame, wire_protocol.RecordFrame) else frame
+
+
+# Wire protocol state of one TCP connection: the optional binary hello, then
+# JSON lines turned into sensor dict lists or length-prefixed binary records
+# kept as RecordFrames.
+class FrameDecoder:
+
+    HANDSHAKE = "handshake"  # binary hello sent, waiting for the reply
+
+    def __init__(self, protocol=wire_protocol.PROTOCOL_JSON, on_log=None, namespace=None):
+        self.requested = protocol
+        self.protocol = wire_protocol.PROTOCOL_JSON
+        self.sensor_names = []  # binary protocol: record id -> (namespaced) sensor name
+        self.prefix = "" if namespace is None else namespace + NAMESPACE_SEP
+        self._on_log = on_log or (lambda msg: None)
+
+    def hello(self):
+        """Start a connection, returns the bytes to send first (b"" for plain JSON)."""
+        if self.requested == wire_protocol.PROTOCOL_BINARY:
+            self.protocol = self.HANDSHAKE
+            return wire_protocol.hello_line(wire_protocol.PROTOCOL_BINARY)
+        self.protocol = wire_protocol.PROTOCOL_JSON
+        return b""
+
+    def decode(self, framer):
+        """Yield every complete frame buffered in `framer` (sensor dict list or RecordFrame)."""
+        if self.protocol == self.HANDSHAKE:
+            for line in framer.frames():
+                reply = json.loads(str(line, 'utf-8'))
+                if isinstance(reply, dict) and reply.get('protocol') == wire_protocol.PROTOCOL_BINARY:
+                    self.sensor_names = [self.prefix + name for name in reply['sensors']]
+                    self.protocol = wire_protocol.PROTOCOL_BINARY
+                    self._on_log("Binary wire protocol negotiated.")
+                else:
+                    # Simulator ignored the hello and is already streaming JSON
+                    self.protocol = wire_protocol.PROTOCOL_JSON
+                    self._on_log("Simulator does not support binary frames, using JSON.")
+                    yield self.namespaced(wire_protocol.parse_json_frame(reply))
+                break
+
+        if self.protocol == wire_protocol.PROTOCOL_BINARY:
+            for payload in framer.length_prefixed_frames(wire_protocol.FRAME_HEADER):
+                seq, sent_ns, records = wire_protocol.decode_binary_frame(payload)
+                # copy: the view dies on the next read
+                yield wire_protocol.RecordFrame(records.copy(), self.sensor_names, seq, sent_ns)
+
+        elif self.protocol == wire_protocol.PROTOCOL_JSON:
+            for line in framer.frames():
+                yield self.namespaced(wire_protocol.parse_json_frame(json.loads(str(line, 'utf-8'))))
+
+    def namespaced(self, sensor_list):
+        """Prefix the sensor names of a decoded JSON frame with the endpoint namespace."""
+        if self.prefix:
+            for sensor in sensor_list:
+                sensor['name'] = self.prefix + sensor['name']
+        return sensor_list
+
+
+
+# --- 2. TRANSPORTS ---
+
+# Shared delivery of decoded frames: latency stamps, the optional per-frame
+# callback and batching. Callbacks are plain callables, the Qt workers pass
+# their signals' emit methods.
+class _Source:
+
+    def __init__(self, on_batch, on_frame=None, on_log=None, on_connection=None, latency=None):
+        self.on_batch = on_batch  # list of frames, every batch interval
+        self.on_frame = on_frame  # one frame, as soon as it is decoded
+        self.on_log = on_log or (lambda msg: None)
+        self.on_connection = on_connection or (lambda stats: None)  # supervisor stats on connect / disconnect
+        self.latency = latency  # optional LatencyTracker, fed with the receive / decode times
+        self.supervisor = None
+        self._batcher = FrameBatcher()
+        self._run_flag = True
+
+    def _configure(self, connection):
+        self._batcher = FrameBatcher.from_config(connection)
+        self.supervisor = ConnectionSupervisor.from_config(connection)
+
+    def _queue_frame(self, sensor_list, recv_ns=0, stream=None):
+        # Frames from the simulator carry a sequence number and send time
+        stamp = frame_stamp(sensor_list) if self.latency is not None else None
+        if stamp is not None:
+            self.latency.received(stamp[0], stamp[1], recv_ns, time.time_ns(), stream)
+        if self.on_frame is not None:
+            self.on_frame(sensor_list)
+        if self._batcher.add(sensor_list):
+            self._flush_batch()
+
+    def _flush_batch(self):
+        if len(self._batcher):
+            self.on_batch(self._batcher.take())
+
+
+# Live TCP stream from the simulator. run() blocks in the calling thread for the
+# whole session: a lost or refused connection is retried with exponential backoff
+# until stop() is called.
+class TcpSource(_Source):
+
+    def __init__(self, connection=None, on_batch=None, **callbacks):
+        super().__init__(on_batch or (lambda frames: None), **callbacks)
+        self.connection = connection  # cached connection settings, read from the config on first run if None
+        self.client = None
+        self._stop_event = threading.Event()  # wakes the source from a reconnect delay
+        self._recv_ns = 0  # time the bytes of the frames being decoded arrived
+        self._framer = StreamFramer()  # carries partial JSON lines across reads
+        self._decoder = FrameDecoder()
+
+    def run(self):
+        # _run_flag is armed in __init__, so a stop() issued right after start() is not lost
+        if self.connection is None:
+            self.connection = simulator.load_config()['connection']
+        self._configure(self.connection)
+        self._decoder = FrameDecoder(self.connection.get('protocol', wire_protocol.PROTOCOL_JSON), self.on_log)
+
+        self.on_log("Attempting to connect to simulator...")
+        try:
+            while self._run_flag:
+                self._session()
+                if not self._run_flag:
+                    break
+                if self.supervisor.disconnected():
+                    self.on_connection(self.supervisor.stats())
+                    self.on_log("Connection lost, reconnecting...")
+                self._stop_event.wait(self.supervisor.retry_delay())
+        finally:
+            self._flush_batch()
+            self._run_flag = False
+            if self.supervisor.disconnected():
+                self.on_connection(self.supervisor.stats())
+            self.on_log("Disconnected from simulator successfully.")
+
+    def stop(self):
+        self._run_flag = False
+        self._stop_event.set()
+
+    def _session(self):
+        # One connection to the simulator, returns when it ends
+        self._framer.clear()
+        try:
+            self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM) # Create TCP socket
+            self.client.settimeout(5.0)  # timeout for connection attempts and recv
+            self.client.connect((self.connection['host'], self.connection['tcp_port']))
+
+            gap = self.supervisor.connected()
+            if gap is None:
+                self.on_log("Connected to simulator successfully.")
+            else:
+                self.on_log(f"Reconnected to simulator after {gap:.2f}s (reconnect #{self.supervisor.reconnects}).")
+            self.on_connection(self.supervisor.stats())
+            if self.latency is not None:
+                self.latency.new_stream()
+
+            # Offer the compact binary protocol if configured, JSON stays the default
+            hello = self._decoder.hello()
+            if hello:
+                self.client.sendall(hello)
+
+            while self._run_flag:
+                if self._batcher.due():
+                    self._flush_batch()
+
+                # Wake up in time to flush a pending batch, otherwise wait for the heartbeat timeout
+                pending = self._batcher.time_left()
+                self.client.settimeout(5.0 if pending is None else max(pending, 0.001))
+
+                try:
+                    received = self._framer.recv_into(self.client) # Receive data from simulator into the framer buffer
+                    self._recv_ns = time.time_ns()
+
+                    if not received:
+                        self.on_log("Connection closed by simulator.")
+                        break
+
+                    # Only complete frames come out, a partial frame waits for the next read
+                    for sensor_list in self._decoder.decode(self._framer):
+                        self._queue_frame(sensor_list, self._recv_ns)
+
+                except socket.timeout:
+                    if pending is not None:
+                        continue  # batch deadline reached, flushed at the top of the loop
+                    self.on_log("Stream Heartbeat: No data received, continuing to listen...")
+                    continue
+                except Exception as e:
+                    self.on_log(f"Data Error: {str(e)}")
+                    break
+
+        # Handle connection errors, only the first failure of an outage is logged
+        except ConnectionRefusedError:
+            if self.supervisor.failed_attempts == 0:
+                self.on_log("Error: Simulator not found. Is it running?")
+
+        except Exception as e:
+            if self.supervisor.failed_attempts == 0:
+                self.on_log(f"Connection Error: {str(e)}")
+        finally:
+            self._flush_batch()
+            if self.client:
+                self.client.close()
+
+
+# Live WebSocket stream from the simulator, same contract as TcpSource
+# (run() blocks with its own asyncio loop until stop()).
+class WebSocketSource(_Source):
+
+    def __init__(self, url="ws://localhost:8080", connection=None, on_batch=None, **callbacks):
+        super().__init__(on_batch or (lambda frames: None), **callbacks)
+        self.url = url
+        self._configure(simulator.load_config()['connection'] if connection is None else connection)
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.listen())
+
+    def stop(self):
+        self._run_flag = False
+
+    # listen for incoming WebSocket messages, reconnecting with backoff until stopped
+    async def listen(self):
+        self.on_log(f"Connecting to {self.url}...")
+        while self._run_flag:
+            await self._session()
+            if not self._run_flag:
+                break
+            if self.supervisor.disconnected():
+                self.on_connection(self.supervisor.stats())
+                self.on_log("WebSocket connection lost, reconnecting...")
+
+            # Sleep in short steps so stop() is not delayed by a long backoff
+            resume_at = time.monotonic() + self.supervisor.retry_delay()
+            while self._run_flag and time.monotonic() < resume_at:
+                await asyncio.sleep(min(0.1, resume_at - time.monotonic()))
+
+        self._flush_batch()
+        if self.supervisor.disconnected():
+            self.on_connection(self.supervisor.stats())
+        self.on_log("WebSocket Disconnected.")
+
+    # One WebSocket connection, returns when it ends
+    async def _session(self):
+        try:
+            async with websockets.connect(self.url) as websocket:
+                gap = self.supervisor.connected()
+                if gap is None:
+                    self.on_log("WebSocket Connected.")
+                else:
+                    self.on_log(f"WebSocket reconnected after {gap:.2f}s (reconnect #{self.supervisor.reconnects}).")
+                self.on_connection(self.supervisor.stats())
+                if self.latency is not None:
+                    self.latency.new_stream()
+
+                while self._run_flag:
+                    if self._batcher.due():
+                        self._flush_batch()
+                    pending = self._batcher.time_left()
+
+                    try:
+                        message = await asyncio.wait_for(websocket.recv(), timeout=5.0 if pending is None else pending)   # 5-second timeout
+                        recv_ns = time.time_ns()
+                        self._queue_frame(wire_protocol.parse_json_frame(json.loads(message)), recv_ns)  # one JSON frame per message
+
+                    except asyncio.TimeoutError:
+                        if pending is None:
+                            self.on_log("Stream Heartbeat: Waiting for data...")
+                    except Exception as e:
+                        self.on_log(f"Stream Error: {e}")
+                        break
+
+        except Exception as e:
+            if self.supervisor.failed_attempts == 0:
+                self.on_log(f"Could not connect: {e}")
+        self._flush_batch()
+
+
+
+# Several simulators (production lines) at once, TCP and WebSocket mixed, all served
+# by ONE asyncio event loop in the thread calling run(): one task per endpoint, no
+# thread per connection. Each endpoint has its own decoder, supervisor and reconnect
+# backoff; its readings are namespaced ("line1/Temperature") and merged into one
+# batched stream. on_connection receives the supervisor stats plus the endpoint name.
+class MultiSource(_Source):
+
+    def __init__(self, endpoints, on_batch=None, **callbacks):
+        super().__init__(on_batch or (lambda frames: None), **callbacks)
+        if not endpoints:
+            raise ValueError("MultiSource needs at least one endpoint")
+        self.endpoints = endpoints
+        self._configure(endpoints[0])  # shared batcher, the first endpoint's batch settings
+        self.supervisors = {endpoint['name']: ConnectionSupervisor.from_config(endpoint) for endpoint in endpoints}
+        self._loop = None
+        self._main = None
+
+    def run(self):
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        try:
+            loop.run_until_complete(self._serve())
+        finally:
+            self._loop = None
+            loop.close()
+
+    def stop(self):
+        self._run_flag = False
+        loop, main = self._loop, self._main
+        if loop is not None and main is not None:
+            try:
+                loop.call_soon_threadsafe(main.cancel)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def stats(self):
+        """Supervisor stats of every endpoint, by name."""
+        return {name: supervisor.stats() for name, supervisor in self.supervisors.items()}
+
+    async def _serve(self):
+        self._main = asyncio.current_task()
+        if not self._run_flag:
+            return  # stopped before the loop started
+        self.on_log(f"Connecting to {len(self.endpoints)} endpoints...")
+        tasks = [asyncio.create_task(self._endpoint_loop(endpoint)) for endpoint in self.endpoints]
+        tasks.append(asyncio.create_task(self._flush_loop()))
+        try:
+            await asyncio.gather(*tasks)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._run_flag = False
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._flush_batch()
+            for name, supervisor in self.supervisors.items():
+                if supervisor.disconnected():
+                    self.on_connection({"endpoint": name, **supervisor.stats()})
+            self.on_log("Disconnected from all endpoints.")
+
+    async def _flush_loop(self):
+        # Frames of all endpoints share one batch, flushed when due
+        while self._run_flag:
+            pending = self._batcher.time_left()
+            await asyncio.sleep(self._batcher.interval if pending is None else max(pending, 0.001))
+            if self._batcher.due():
+                self._flush_batch()
+
+    async def _endpoint_loop(self, endpoint):
+        name, supervisor = endpoint['name'], self.supervisors[endpoint['name']]
+        log = lambda msg: self.on_log(f"[{name}] {msg}")
+        session = self._tcp_session if endpoint['type'] == ENDPOINT_TCP else self._websocket_session
+        while self._run_flag:
+            try:
+                await session(endpoint, supervisor, log)
+            except ConnectionRefusedError:
+                if supervisor.failed_attempts == 0:
+                    log("Error: Simulator not found. Is it running?")
+            except Exception as e:
+                # one failing line must not take the other endpoints down
+                if supervisor.failed_attempts == 0:
+                    log(f"Connection Error: {e}")
+            if not self._run_flag:
+                break
+            if supervisor.disconnected():
+                self.on_connection({"endpoint": name, **supervisor.stats()})
+                log("Connection lost, reconnecting...")
+            await asyncio.sleep(supervisor.retry_delay())
+
+    def _connected(self, endpoint, supervisor, log):
+        gap = supervisor.connected()
+        if gap is None:
+            log("Connected.")
+        else:
+            log(f"Reconnected after {gap:.2f}s (reconnect #{supervisor.reconnects}).")
+        self.on_connection({"endpoint": endpoint['name'], **supervisor.stats()})
+        if self.latency is not None:
+            self.latency.new_stream(endpoint['name'])
+
+    async def _tcp_session(self, endpoint, supervisor, log):
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(endpoint['host'], endpoint['tcp_port']), timeout=5.0)
+        try:
+            self._connected(endpoint, supervisor, log)
+            decoder = FrameDecoder(endpoint.get('protocol', wire_protocol.PROTOCOL_JSON), log, endpoint['name'])
+            framer = StreamFramer()
+            hello = decoder.hello()
+            if hello:
+                writer.write(hello)
+                await writer.drain()
+
+            while self._run_flag:
+                try:
+                    data = await asyncio.wait_for(reader.read(65536), timeout=5.0)
+                except asyncio.TimeoutError:
+                    log("Stream Heartbeat: No data received, continuing to listen...")
+                    continue
+                recv_ns = time.time_ns()
+                if not data:
+                    log("Connection closed by simulator.")
+                    break
+                framer.feed(data)
+                try:
+                    for sensor_list in decoder.decode(framer):
+                        self._queue_frame(sensor_list, recv_ns, endpoint['name'])
+                except (ValueError, KeyError, IndexError) as e:
+                    log(f"Data Error: {e}")
+                    break
+        finally:
+            writer.close()
+
+    async def _websocket_session(self, endpoint, supervisor, log):
+        async with websockets.connect(endpoint['url'], open_timeout=5.0) as websocket:
+            self._connected(endpoint, supervisor, log)
+            decoder = FrameDecoder(namespace=endpoint['name'])
+            while self._run_flag:
+                try:
+                    message = await asyncio.wait_for(websocket.recv(), timeout=5.0)
+                except asyncio.TimeoutError:
+                    log("Stream Heartbeat: Waiting for data...")
+                    continue
+                recv_ns = time.time_ns()
+                try:
+                    sensor_list = decoder.namespaced(wire_protocol.parse_json_frame(json.loads(message)))
+                except ValueError as e:
+                    log(f"Data Error: {e}")
+                    break
+                self._queue_frame(sensor_list, recv_ns, endpoint['name'])
+
+
+
+# --- 3. STATE STORE ---
+
+# What one frame changed, handed to the sinks and returned to the caller.
+class FrameUpdate:
+    __slots__ = ("time", "readings", "alarms", "raised", "cleared")
+
+    def __init__(self, t):
+        self.time = t  # time of the frame's readings in seconds since the store started (plot time axis)
+        self.readings = []  # (name, value, status, timestamp) of the configured sensors
+        self.alarms = []  # (timestamp, name, value, status) alarm transitions (entered / changed alarm)
+        self.raised = []  # (name, value, status) sensors that just entered alarm
+        self.cleared = []  # (name, value) sensors that just left alarm
+
+
+def plot_capacity(config):
+    """Raw plot samples kept per sensor: the dashboard plot_capacity if set, otherwise
+    plot_raw_seconds at the connection's update rate, with 2x headroom for faster feeds."""
+    dashboard_config = config.get('dashboard', {})
+    if dashboard_config.get('plot_capacity'):
+        return int(dashboard_config['plot_capacity'])
+    rate = 1.0 / config['connection'].get('update_interval', 0.5)
+    return max(64, math.ceil(2 * rate * dashboard_config.get('plot_raw_seconds', PLOT_RAW_SECONDS)))
+
+
+# Live state of the configured sensors: latest reading, plot history ring
+# buffers, long-horizon rollups and the aggregated alarm state.
+# The ring buffers only hold the recent raw samples; a plot window reaching
+# further back is drawn from the rollup buckets (window()), so memory per
+# sensor does not grow with the longest plot window.
+# Statuses are evaluated client-side by the AlarmEngine, the status sent by the
+# feed is not trusted. Readings of sensors missing from the configuration are ignored.
+class SensorStore:
+
+    def __init__(self, sensor_names, plot_capacity=4096, rollups=None, start_time=None, alarms=None):
+        self.start_time = time.time() if start_time is None else start_time
+        self.buffers = {name: RingBuffer(plot_capacity) for name in sensor_names}
+        self.rollups = RollupStore() if rollups is None else rollups
+        self.alarms = AlarmEngine(dict.fromkeys(self.buffers, {})) if alarms is None else alarms  # no limits by default
+        self.health = HealthAggregator()
+        self.latest = {}  # name -> (value, status, timestamp)
+
+    @classmethod
+    def from_config(cls, config, start_time=None):
+        dashboard_config = config.get('dashboard', {})
+        sensors = sensor_space(config)
+        return cls(sensors.keys(), plot_capacity(config),
+                   RollupStore.from_config(dashboard_config), start_time, AlarmEngine.from_config(config, sensors))
+
+    def apply(self, sensor_list, now):
+        """Fold one frame received at unix time `now` into the state, returns its FrameUpdate."""
+        return self.apply_batch([sensor_list], now)[0]
+
+    def apply_batch(self, frames, now):
+        """Fold frames received together at unix time `now` into the state, one FrameUpdate each.
+
+        Every frame is placed at its frame_time(): replayed frames at their recorded time,
+        stamped frames at their send time. The plots, the rollups and the alarms (the whole
+        batch checked in one AlarmEngine call) therefore do not depend on the batching delay
+        or the replay speed.
+        """
+        updates, readings, ids, values, times = [], [], [], [], []
+        for sensor_list in frames:
+            at = frame_time(sensor_list, now)
+            t = at - self.start_time
+            update = FrameUpdate(t)
+            updates.append(update)
+            if isinstance(sensor_list, wire_protocol.RecordFrame):
+                frame = zip(*sensor_list.columns())  # binary frame, read as columns
+            else:
+                frame = ((sensor['name'], sensor['value'], sensor['timestamp']) for sensor in sensor_list)
+            for name, val, ts in frame:
+                buffer = self.buffers.get(name)
+                if buffer is None:
+                    continue
+                buffer.append(t, val)
+                self.rollups.add(name, at, val)  # long-horizon trend buckets
+                ids.append(self.alarms.index[name])
+                values.append(val)
+                times.append(at)
+                readings.append((update, name, val, ts))
+        if not readings:
+            return updates
+
+        # Only transitions are reported
+        if len(frames) == 1:
+            codes, changed = self.alarms.evaluate(ids, values, times[0])
+        else:
+            codes, changed = self.alarms.evaluate_block(ids, values, times)
+        statuses = [STATUS_NAMES[code] for code in codes.tolist()]
+        for (update, name, val, ts), status in zip(readings, statuses):
+            update.readings.append((name, val, status, ts))
+            self.latest[name] = (val, status, ts)
+
+        for i in changed.tolist():
+            (update, name, val, ts), status = readings[i], statuses[i]
+            if status == STATUS_NAMES[STATUS_OK]:
+                update.cleared.append((name, val))
+            else:
+                update.alarms.append((ts, name, val, status))
+            if self.health.update(name, status):
+                update.raised.append((name, val, status))
+        return updates
+
+    def window(self, name, start, end):
+        """(times, values) of a sensor between plot times `start` and `end` (seconds since
+        start_time): the raw samples while the ring buffer reaches back to `start`, the
+        min / max of the rollup buckets otherwise."""
+        buffer = self.buffers[name]
+        times, _ = buffer.view()
+        if len(buffer) < buffer.capacity or times[0] <= start:
+            return buffer.window(start, end)
+        resolution, buckets = self.rollups.query(name, self.start_time + start, self.start_time + end, ROLLUP_MAX_POINTS)
+        return minmax_line(buckets, resolution, self.start_time)
+
+    def clear(self):
+        for buffer in self.buffers.values():
+            buffer.clear()
+        self.rollups.clear()
+        self.alarms.clear()
+        self.health.clear()
+        self.latest.clear()
+
+
+
+# --- 4. SINKS ---
+
+# Sinks receive every archive entry ({"timestamp_unix", "sensors"}) with its FrameUpdate.
+
+class RecorderSink:
+    """Appends every entry to a SessionRecorder (NDJSON chunks on disk).
+
+    Binary frames are expanded to sensor dicts by the recorder's writer thread.
+    The frame stamps are not archived, the sensor dicts never carry them.
+    """
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def write(self, entry, update):
+        self.recorder.append(entry)
+
+
+class AlarmLogSink:
+    """Writes one line per alarm transition (entered, changed, cleared) to a text stream."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, entry, update):
+        if not (update.alarms or update.cleared):
+            return
+        clock = time.strftime('%H:%M:%S', time.localtime(entry['timestamp_unix']))
+        for _, name, val, status in update.alarms:
+            self.stream.write(f"{clock} {status}: {name} = {val}\n")
+        for name, val in update.cleared:
+            self.stream.write(f"{clock} CLEARED: {name} = {val}\n")
+
+
+
+# --- 5. PIPELINE ---
+
+# Decoded frames -> state store -> sinks. process() is called by whatever thread
+# owns the store: the GUI thread in the dashboard, the transport thread headless.
+class IngestCore:
+
+    def __init__(self, store, sinks=(), latency=None):
+        self.store = store
+        self.sinks = list(sinks)
+        self.latency = latency  # optional LatencyTracker, frames are "dispatched" once processed
+        self.frames = 0
+        self.samples = 0
+
+    def process(self, sensor_list, now=None):
+        """Apply one frame, hand it to every sink and return its FrameUpdate."""
+        return self.process_batch([sensor_list], now)[0]
+
+    def process_batch(self, batch, now=None):
+        """Apply a batch of frames (alarms checked in one call), returns their FrameUpdates."""
+        now = time.time() if now is None else now
+        if self.latency is not None:
+            for sensor_list in batch:
+                stamp = frame_stamp(sensor_list)
+                if stamp is not None:
+                    # frames of an endpoint are numbered per endpoint, its namespace tells which one
+                    self.latency.dispatched(stamp[0], split_name(stamp[2])[0])
+
+        updates = self.store.apply_batch(batch, now)
+        for sensor_list, update in zip(batch, updates):
+            if self.sinks:
+                entry = {"timestamp_unix": now, "sensors": sensor_list}
+                for sink in self.sinks:
+                    sink.write(entry, update)
+            self.samples += len(update.readings)
+        self.frames += len(batch)
+        return updates
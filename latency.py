@@ -0,0 +1,140 @@
+import math
+import threading
+import time
+
+import numpy as np
+
+
+# Pipeline stages of one frame, from simulator send to on-screen render
+STAGE_NETWORK = "network"  # simulator send -> worker recv
+STAGE_DECODE = "decode"  # worker recv -> frame decoded
+STAGE_DISPATCH = "dispatch"  # decoded -> handled by the GUI thread (batching + queued signal)
+STAGE_RENDER = "render"  # handled by the GUI -> drawn by the next render frame
+STAGE_TOTAL = "total"  # simulator send -> drawn
+STAGES = (STAGE_NETWORK, STAGE_DECODE, STAGE_DISPATCH, STAGE_RENDER, STAGE_TOTAL)
+
+MAX_PENDING = 10_000  # frames received but not handled yet, older ones are forgotten
+
+
+# Latency histogram with logarithmic buckets: fixed memory, percentiles accurate
+# to the bucket width (~9% with 8 buckets per doubling) from 1 us up to ~100 s.
+class LogHistogram:
+
+    def __init__(self, min_value=1e-6, max_value=100.0, buckets_per_doubling=8):
+        self.min_value = min_value
+        self._growth = 2.0 ** (1.0 / buckets_per_doubling)
+        self._log_growth = math.log(self._growth)
+        size = int(math.ceil(math.log(max_value / min_value) / self._log_growth)) + 1
+        self.counts = np.zeros(size, dtype=np.int64)
+        self.count = 0
+
+    def add(self, value):
+        """Record one latency in seconds (values below min_value land in the first bucket)."""
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = min(len(self.counts) - 1, int(math.log(value / self.min_value) / self._log_growth) + 1)
+        self.counts[index] += 1
+        self.count += 1
+
+    def percentile(self, p):
+        """Upper edge of the bucket holding the p-th percentile (seconds), None when empty."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(self.count * p / 100.0))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        return self.min_value * self._growth ** index
+
+    def clear(self):
+        self.counts[:] = 0
+        self.count = 0
+
+
+
+# End-to-end latency of the live stream, keyed by the frame sequence number.
+# The worker thread reports received() frames with the simulator's send time,
+# the GUI thread reports dispatched() and rendered(); each stage goes into its
+# own histogram. Sequence gaps count as lost frames, late ones as out of order.
+# With several endpoints every one numbers its frames on its own, `stream` names
+# the endpoint (None for the single-simulator stream).
+class LatencyTracker:
+
+    def __init__(self, clock_ns=time.time_ns):
+        self._clock_ns = clock_ns
+        self._lock = threading.Lock()
+        self.histograms = {stage: LogHistogram() for stage in STAGES}
+        self._pending = {}  # (stream, seq) -> (sent_ns, decoded_ns), received but not handled by the GUI
+        self._unrendered = []  # (sent_ns, dispatched_ns) handled since the last render frame
+        self._next_seq = {}  # stream -> next expected sequence number
+        self.frames = 0
+        self.lost = 0
+        self.out_of_order = 0
+
+    def new_stream(self, stream=None):
+        """A new connection started, sequence numbers of `stream` start over."""
+        with self._lock:
+            self._next_seq.pop(stream, None)
+            for key in [key for key in self._pending if key[0] == stream]:
+                del self._pending[key]
+
+    def received(self, seq, sent_ns, recv_ns, decoded_ns, stream=None):
+        """Worker thread: one frame read at recv_ns and decoded at decoded_ns."""
+        with self._lock:
+            self.frames += 1
+            expected = self._next_seq.get(stream)
+            if expected is None or seq >= expected:
+                if expected is not None:
+                    self.lost += seq - expected
+                self._next_seq[stream] = seq + 1
+            else:
+                # Arrived after a newer frame, it was counted as lost
+                self.out_of_order += 1
+                self.lost = max(0, self.lost - 1)
+
+            self.histograms[STAGE_NETWORK].add((recv_ns - sent_ns) / 1e9)
+            self.histograms[STAGE_DECODE].add((decoded_ns - recv_ns) / 1e9)
+            if len(self._pending) >= MAX_PENDING:
+                del self._pending[next(iter(self._pending))]
+            self._pending[stream, seq] = (sent_ns, decoded_ns)
+
+    def dispatched(self, seq, stream=None):
+        """GUI thread: the frame was applied to the dashboard state."""
+        now = self._clock_ns()
+        with self._lock:
+            stamps = self._pending.pop((stream, seq), None)
+            if stamps is None:
+                return  # not from the live stream (replay) or already forgotten
+            sent_ns, decoded_ns = stamps
+            self.histograms[STAGE_DISPATCH].add((now - decoded_ns) / 1e9)
+            self._unrendered.append((sent_ns, now))
+
+    def rendered(self):
+        """GUI thread: a render frame drew everything dispatched so far."""
+        if not self._unrendered:
+            return
+        now = self._clock_ns()
+        with self._lock:
+            frames, self._unrendered = self._unrendered, []
+            for sent_ns, dispatched_ns in frames:
+                self.histograms[STAGE_RENDER].add((now - dispatched_ns) / 1e9)
+                self.histograms[STAGE_TOTAL].add((now - sent_ns) / 1e9)
+
+    def stats(self):
+        """Per-stage p50 / p95 / p99 in milliseconds plus the sequence counters."""
+        with self._lock:
+            stages = {}
+            for stage, histogram in self.histograms.items():
+                stages[stage] = {"count": histogram.count}
+                for p in (50, 95, 99):
+                    value = histogram.percentile(p)
+                    stages[stage][f"p{p}_ms"] = None if value is None else round(value * 1000, 3)
+            return {"frames": self.frames, "lost": self.lost, "out_of_order": self.out_of_order, "stages": stages}
+
+    def clear(self):
+        with self._lock:
+            for histogram in self.histograms.values():
+                histogram.clear()
+            self._pending.clear()
+            self._unrendered = []
+            self._next_seq.clear()
+            self.frames = self.lost = self.out_of_order = 0
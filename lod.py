@@ -0,0 +1,50 @@
+import numpy as np
+
+
+# Level-of-detail reduction for the sensor plots.
+# A line plot cannot show more than one x position per pixel column, so the
+# samples of a window are split into `columns` consecutive groups and only the
+# minimum and maximum of each group are drawn, in their original order. Spikes
+# survive (they are the min or max of their column) and the number of points
+# handed to pyqtgraph is bounded by the plot width, not the window length.
+
+
+def decimate_minmax(times, values, columns):
+    """Return (times, values) reduced to at most 2 * columns + 2 points, min/max per column.
+
+    Columns are equal sample counts, which matches pixel columns for evenly sampled
+    sensors. Inputs with no more than 2 * columns samples are returned unchanged.
+    """
+    n = len(values)
+    columns = max(1, int(columns))
+    if n <= 2 * columns:
+        return times, values
+
+    step = -(-n // columns)  # samples per column, rounded up
+    full = n // step * step
+    blocks = np.asarray(values[:full]).reshape(-1, step)
+    starts = np.arange(0, full, step)
+    lows = starts + blocks.argmin(axis=1)
+    highs = starts + blocks.argmax(axis=1)
+
+    if full < n:
+        # Shorter last column
+        tail = np.asarray(values[full:])
+        lows = np.append(lows, full + tail.argmin())
+        highs = np.append(highs, full + tail.argmax())
+
+    # Keep each column's min and max in time order so the line shape is preserved,
+    # the first and last samples keep the line ending at the newest reading
+    index = np.concatenate(([0], np.column_stack((np.minimum(lows, highs), np.maximum(lows, highs))).ravel(), [n - 1]))
+    return times[index], values[index]
+
+
+def minmax_line(buckets, resolution, offset=0.0):
+    """Return (times, values) drawing rollup buckets (RollupStore.query) as their min then max.
+
+    Both points sit at the bucket center, shifted by -offset onto the plot time axis, so the
+    line has the same shape as the min/max decimation of the raw samples.
+    """
+    times = np.repeat(buckets["start"] + resolution / 2 - offset, 2)
+    values = np.column_stack((buckets["min"], buckets["max"])).ravel()
+    return times, values
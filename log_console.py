@@ -0,0 +1,114 @@
+import time
+from collections import deque
+
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtGui import QTextCursor
+
+
+# Message prefix -> minimum seconds between two logged lines
+DEFAULT_RATE_LIMITS = {"Stream Heartbeat": 60.0}
+
+
+# Maintenance log console with bounded memory.
+# Messages are queued by log() and written to the document once per render
+# frame by flush(), as plain text in a single edit. A message identical to the
+# previous line is folded into it ("(x120)") instead of adding a line, and
+# rate-limited messages (heartbeats) are dropped while their interval runs.
+# The document keeps at most max_blocks lines, older lines are discarded by Qt.
+class LogConsole(QPlainTextEdit):
+
+    def __init__(self, max_blocks=5000, rate_limits=None, parent=None):
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False)
+        self.setMaximumBlockCount(max_blocks)
+
+        self.max_blocks = max_blocks
+        self.rate_limits = DEFAULT_RATE_LIMITS if rate_limits is None else dict(rate_limits)
+        self.suppressed = 0  # rate-limited messages dropped so far
+
+        # Lines are [message, unix time, repeat count, written to the document]
+        self._new = deque(maxlen=max_blocks)  # not written yet, oldest first
+        self._tail = None  # latest line, repeats of it only bump its count
+        self._rewrite = None  # written tail whose text changed since the last flush
+        self._last_logged = {}  # rate-limited message -> time it was last logged
+
+    @classmethod
+    def from_config(cls, dashboard_config, parent=None):
+        return cls(
+            dashboard_config.get('log_max_lines', 5000),
+            dashboard_config.get('log_rate_limits'),
+            parent,
+        )
+
+    def log(self, msg, now=None):
+        """Queue one message, shown after the next flush()."""
+        now = time.time() if now is None else now
+        tail = self._tail
+        if tail is not None and tail[0] == msg:
+            tail[1] = now
+            tail[2] += 1
+            if tail[3]:
+                self._rewrite = tail
+            return
+
+        interval = self._rate_limit(msg)
+        if interval:
+            last = self._last_logged.get(msg)
+            if last is not None and now - last < interval:
+                self.suppressed += 1
+                return
+            self._last_logged[msg] = now
+
+        self._tail = [msg, now, 1, False]
+        self._new.append(self._tail)
+
+    def flush(self):
+        """Write queued lines in one edit, returns the number of lines added or changed."""
+        if self._rewrite is None and not self._new:
+            return 0
+
+        bar = self.verticalScrollBar()
+        follow = bar.value() == bar.maximum()  # keep scrolling only if already at the bottom
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.beginEditBlock()
+        changed = 0
+        if self._rewrite is not None:
+            # The written tail is still the last block, new lines go after it
+            cursor.movePosition(QTextCursor.MoveOperation.StartOfBlock, QTextCursor.MoveMode.KeepAnchor)
+            cursor.insertText(self._format(self._rewrite))
+            self._rewrite = None
+            changed += 1
+        if self._new:
+            text = "\n".join(self._format(line) for line in self._new)
+            cursor.insertText(text if self.document().isEmpty() else "\n" + text)
+            for line in self._new:
+                line[3] = True
+            changed += len(self._new)
+            self._new.clear()
+        cursor.endEditBlock()
+
+        if follow:
+            bar.setValue(bar.maximum())
+        return changed
+
+    def clear(self):
+        self._new.clear()
+        self._tail = self._rewrite = None
+        super().clear()
+
+    # --- helpers ---
+
+    def _rate_limit(self, msg):
+        for prefix, interval in self.rate_limits.items():
+            if msg.startswith(prefix):
+                return interval
+        return None
+
+    @staticmethod
+    def _format(line):
+        msg, stamp, count, _ = line
+        text = f"{time.strftime('%H:%M:%S', time.localtime(stamp))} > {msg}"
+        return f"{text}  (x{count})" if count > 1 else text
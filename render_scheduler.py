@@ -0,0 +1,87 @@
+import time
+
+from PyQt6.QtCore import QObject, QTimer, Qt
+
+
+# Fixed-rate render loop decoupled from packet arrival.
+# Incoming packets only mark the view as dirty, the QTimer then
+# repaints at most once per frame no matter how many packets arrived.
+class RenderScheduler(QObject):
+
+    def __init__(self, render_callback, max_fps=30, parent=None):
+        super().__init__(parent)
+        self._render_callback = render_callback
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._on_tick)
+
+        self._dirty = False
+        self._pending_packets = 0  # packets received since the last rendered frame
+        self._last_tick = None
+
+        # Counters exposed to the Maintenance console
+        self.frames_rendered = 0
+        self.packets_coalesced = 0  # packets folded into an already pending frame
+        self.frames_dropped = 0  # frame slots missed because the GUI thread was busy
+
+        self.max_fps = 1
+        self.set_max_fps(max_fps)
+
+    def set_max_fps(self, fps):
+        """Change the frame cap, takes effect on the next tick."""
+        self.max_fps = max(1, int(fps))
+        self._timer.setInterval(int(1000 / self.max_fps))
+        self._last_tick = None
+
+    def start(self):
+        self._last_tick = None
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def is_active(self):
+        return self._timer.isActive()
+
+    def mark_dirty(self, packets=1):
+        """Called for every packet, only flags that a repaint is needed."""
+        self._dirty = True
+        self._pending_packets += packets
+
+    def render_now(self):
+        """Render immediately if anything changed (used for flushes outside the timer)."""
+        if not self._dirty:
+            return
+
+        self._dirty = False
+        if self._pending_packets > 1:
+            self.packets_coalesced += self._pending_packets - 1
+        self._pending_packets = 0
+
+        self._render_callback()
+        self.frames_rendered += 1
+
+    def _on_tick(self):
+        now = time.perf_counter()
+        if self._last_tick is not None:
+            # A late tick means whole frame slots were skipped
+            slots = int((now - self._last_tick) * self.max_fps)
+            if slots > 1:
+                self.frames_dropped += slots - 1
+        self._last_tick = now
+
+        self.render_now()
+
+    def stats(self):
+        return {
+            "max_fps": self.max_fps,
+            "frames_rendered": self.frames_rendered,
+            "packets_coalesced": self.packets_coalesced,
+            "frames_dropped": self.frames_dropped,
+        }
+
+    def reset_stats(self):
+        self.frames_rendered = 0
+        self.packets_coalesced = 0
+        self.frames_dropped = 0
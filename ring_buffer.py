@@ -0,0 +1,70 @@
+import numpy as np
+
+
+# Fixed-capacity circular buffer holding (time, value) samples for one sensor
+class RingBuffer:
+    """Preallocated NumPy ring buffer with O(1) append and zero-copy reads."""
+
+    def __init__(self, capacity=4096):
+        if capacity < 1:
+            raise ValueError("RingBuffer capacity must be at least 1")
+
+        self.capacity = int(capacity)
+
+        # Every sample is written twice (at i and i + capacity), so the newest
+        # samples always form ONE contiguous slice of the backing arrays
+        self._times = np.zeros(2 * self.capacity, dtype=np.float64)
+        self._values = np.zeros(2 * self.capacity, dtype=np.float32)
+
+        self._head = 0  # next write position in [0, capacity)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, t, value):
+        """Store one sample, overwriting the oldest one when full."""
+        i = self._head
+        self._times[i] = self._times[i + self.capacity] = t
+        self._values[i] = self._values[i + self.capacity] = value
+
+        self._head = (i + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def extend(self, times, values):
+        """Store a block of samples in order (vectorized append)."""
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float32)
+
+        # Only the newest `capacity` samples can survive anyway
+        if len(times) > self.capacity:
+            times, values = times[-self.capacity:], values[-self.capacity:]
+
+        n = len(times)
+        if n == 0:
+            return
+
+        idx = (self._head + np.arange(n)) % self.capacity
+        self._times[idx] = self._times[idx + self.capacity] = times
+        self._values[idx] = self._values[idx + self.capacity] = values
+
+        self._head = (self._head + n) % self.capacity
+        self._size = min(self._size + n, self.capacity)
+
+    def view(self):
+        """Return (times, values) of all stored samples, oldest first, without copying."""
+        end = self._head + self.capacity
+        start = end - self._size
+        return self._times[start:end], self._values[start:end]
+
+    def window(self, since, until=None):
+        """Return the zero-copy (times, values) views of samples with since <= time (<= until)."""
+        times, values = self.view()
+        start = np.searchsorted(times, since, side='left')  # times are appended in order
+        end = len(times) if until is None else np.searchsorted(times, until, side='right')
+        return times[start:end], values[start:end]
+
+    def clear(self):
+        self._head = 0
+        self._size = 0
@@ -0,0 +1,174 @@
+import numpy as np
+
+
+# One aggregated bucket: start time (unix s), min, max, sum and sample count
+ROLLUP_DTYPE = np.dtype([
+    ("start", "<f8"),
+    ("min", "<f4"),
+    ("max", "<f4"),
+    ("sum", "<f8"),
+    ("count", "<u4"),
+])
+
+# (bucket seconds, buckets kept): 1 h of 1 s, 24 h of 1 min, 7 days of 15 min
+DEFAULT_LEVELS = ((1.0, 3600), (60.0, 1440), (900.0, 672))
+
+
+# Buckets of one sensor at one resolution: a fixed NumPy ring of closed buckets
+# plus the bucket currently being filled.
+class _Level:
+
+    def __init__(self, resolution, capacity):
+        self.resolution = float(resolution)
+        self.capacity = int(capacity)
+        self.ring = np.zeros(self.capacity, dtype=ROLLUP_DTYPE)
+        self.head = 0  # next write position
+        self.size = 0
+        self.open = None  # [start, min, max, sum, count] of the bucket being filled
+
+    def floor(self, t):
+        return t - t % self.resolution
+
+    def push(self, bucket):
+        self.ring[self.head] = tuple(bucket)
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def closed(self):
+        """Closed buckets, oldest first (a copy)."""
+        start = (self.head - self.size) % self.capacity
+        return self.ring[(start + np.arange(self.size)) % self.capacity]
+
+    def oldest(self):
+        if self.size:
+            return self.ring[(self.head - self.size) % self.capacity]["start"]
+        return None if self.open is None else self.open[0]
+
+
+def _merge(bucket, other):
+    # Fold the aggregates of `other` into `bucket` (both [start, min, max, sum, count])
+    bucket[1] = min(bucket[1], other[1])
+    bucket[2] = max(bucket[2], other[2])
+    bucket[3] += other[3]
+    bucket[4] += other[4]
+
+
+# Incremental multi-resolution rollups of the sensor readings for trend views.
+# add() only touches the finest open bucket; a bucket that closes is folded into
+# the next coarser level, so each sample costs a few scalar updates whatever the
+# number of levels. Memory per sensor is fixed by the level capacities.
+class RollupStore:
+
+    def __init__(self, levels=DEFAULT_LEVELS):
+        self.levels = tuple((float(resolution), int(capacity)) for resolution, capacity in levels)
+        if not self.levels:
+            raise ValueError("RollupStore needs at least one level")
+        self._sensors = {}  # name -> [_Level], finest first
+
+    @classmethod
+    def from_config(cls, dashboard_config):
+        return cls(dashboard_config.get('rollup_levels', DEFAULT_LEVELS))
+
+    def names(self):
+        return list(self._sensors)
+
+    def add(self, name, t, value):
+        """Record one reading taken at unix time t."""
+        levels = self._sensors.get(name)
+        if levels is None:
+            levels = self._sensors[name] = [_Level(resolution, capacity) for resolution, capacity in self.levels]
+
+        finest = levels[0]
+        bucket = finest.open
+        start = finest.floor(t)
+        if bucket is not None and start <= bucket[0]:
+            # Same bucket (late samples are folded into the open one as well)
+            if value < bucket[1]:
+                bucket[1] = value
+            if value > bucket[2]:
+                bucket[2] = value
+            bucket[3] += value
+            bucket[4] += 1
+            return
+        if bucket is not None:
+            self._close(levels, 0)
+        finest.open = [start, value, value, value, 1]
+
+    def query(self, name, since, until=None, max_points=2000):
+        """Buckets of a sensor covering [since, until], from the finest level that
+        keeps at most max_points buckets for the span and still reaches back to since.
+
+        Returns (resolution, buckets), buckets being a ROLLUP_DTYPE array oldest first
+        that includes the partially filled newest bucket.
+        """
+        levels = self._sensors.get(name)
+        if levels is None:
+            return self.levels[0][0], np.zeros(0, dtype=ROLLUP_DTYPE)
+        until = np.inf if until is None else until
+
+        chosen = len(levels) - 1
+        for i, level in enumerate(levels):
+            span = (min(until, self._newest(levels)) - since) / level.resolution
+            oldest = level.oldest()
+            complete = level.size < level.capacity or (oldest is not None and oldest <= since)
+            if span <= max_points and complete:
+                chosen = i
+                break
+        level = levels[chosen]
+
+        buckets = level.closed()
+        buckets = buckets[(buckets["start"] >= level.floor(since)) & (buckets["start"] <= until)]
+        partial = self._partial(levels, chosen)
+        if partial:
+            extra = np.array([tuple(bucket) for bucket in partial if level.floor(since) <= bucket[0] <= until],
+                             dtype=ROLLUP_DTYPE)
+            buckets = np.concatenate((buckets, extra))
+        return level.resolution, buckets
+
+    def clear(self):
+        self._sensors.clear()
+
+    # --- helpers ---
+
+    def _close(self, levels, i):
+        # Move the open bucket of level i into its ring and fold it into level i + 1
+        level = levels[i]
+        bucket, level.open = level.open, None
+        level.push(bucket)
+        if i + 1 == len(levels):
+            return
+
+        parent = levels[i + 1]
+        start = parent.floor(bucket[0])
+        if parent.open is not None and start <= parent.open[0]:
+            _merge(parent.open, bucket)
+            return
+        if parent.open is not None:
+            self._close(levels, i + 1)
+        parent.open = [start] + bucket[1:]
+
+    def _partial(self, levels, i):
+        # Open buckets at the resolution of level i, merged with the finer open
+        # buckets that have not been folded into it yet, oldest first
+        level = levels[i]
+        partial = {}
+        for finer in [levels[i]] + levels[:i][::-1]:
+            if finer.open is None:
+                continue
+            start = level.floor(finer.open[0])
+            if start in partial:
+                _merge(partial[start], finer.open)
+            else:
+                partial[start] = [start] + finer.open[1:]
+        return [partial[start] for start in sorted(partial)]
+
+    def _newest(self, levels):
+        finest = levels[0]
+        if finest.open is not None:
+            return finest.open[0] + finest.resolution
+        return finest.ring[(finest.head - 1) % finest.capacity]["start"] + finest.resolution
+
+
+def bucket_means(buckets):
+    """Mean value of each bucket returned by RollupStore.query()."""
+    return buckets["sum"] / np.maximum(buckets["count"], 1)
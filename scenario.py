@@ -0,0 +1,170 @@
+import time
+
+import numpy as np
+
+import wire_protocol
+
+
+# --- 1. SIGNAL MODELS ---
+# Selected per sensor with "model" in sensors_config.json (default: noise)
+
+MODEL_NOISE = "noise"  # uniform white noise over [low - variation, high + variation]
+MODEL_RANDOM_WALK = "random_walk"  # bounded random walk, reflects at the noise range edges
+MODEL_SINE = "sine"  # slow sine drift around the band centre, peaks cross the limits
+MODEL_STEP_FAULT = "step_fault"  # in-band noise plus occasional sustained offset faults
+MODEL_SPIKE = "spike"  # in-band noise plus short bursts of spikes
+
+MODELS = (MODEL_NOISE, MODEL_RANDOM_WALK, MODEL_SINE, MODEL_STEP_FAULT, MODEL_SPIKE)
+
+
+
+# --- 2. SCENARIO ENGINE ---
+# Generates a whole frame (or a block of K frames) for every sensor in one call.
+# All randomness comes from one seeded generator, so a seed replays the same scenario.
+class ScenarioEngine:
+
+    def __init__(self, sensor_settings, seed=None, interval=0.5):
+        self.names = list(sensor_settings)
+        self.interval = interval  # seconds between frames, the time axis of the sine model
+        self.rng = np.random.default_rng(seed)
+        self.frame_index = 0
+
+        settings = [sensor_settings[name] for name in self.names]
+
+        def column(key, default):
+            return np.array([s.get(key, default) for s in settings], dtype=np.float64)
+
+        self.low = column('low', 0.0)
+        self.high = column('high', 0.0)
+        self.variation = column('variation', 5.0)
+        self.mid = (self.low + self.high) / 2
+        self.half_band = (self.high - self.low) / 2
+
+        models = [s.get('model', MODEL_NOISE) for s in settings]
+        for model in models:
+            if model not in MODELS:
+                raise ValueError(f"Unknown signal model '{model}', expected one of {MODELS}")
+        self._columns = {model: np.flatnonzero([m == model for m in models]) for model in MODELS}
+
+        n = len(self.names)
+
+        # Random walk: unbounded position, folded into the range on output
+        self.walk_step = column('walk_step', 0.0)
+        self.walk_step[self.walk_step == 0] = self.variation[self.walk_step == 0] / 4
+        self._walk = self.mid.copy()
+
+        # Sine drift
+        self.period = column('period', 60.0)
+        self.amplitude = column('amplitude', np.nan)
+        unset = np.isnan(self.amplitude)
+        self.amplitude[unset] = self.half_band[unset] + self.variation[unset] / 2
+        self._phase = self.rng.uniform(0, 2 * np.pi, n)
+
+        # Step faults and spike bursts: event start probability per frame and duration in frames
+        self.fault_rate = column('fault_rate', 0.01)
+        self.fault_frames = column('fault_frames', 20).astype(int)
+        self._fault_sign = self.rng.choice([-1.0, 1.0], n)
+        self._fault_left = np.zeros(n, dtype=int)
+
+        self.spike_rate = column('spike_rate', 0.02)
+        self.spike_frames = column('spike_frames', 3).astype(int)
+        self._spike_left = np.zeros(n, dtype=int)
+
+    def __len__(self):
+        return len(self.names)
+
+    def next_frame(self):
+        """Return (values, status codes) for one frame, one entry per sensor."""
+        values, statuses = self.next_block(1)
+        return values[0], statuses[0]
+
+    def next_block(self, k):
+        """Return (values, status codes) arrays of shape (k, sensors)."""
+        n = len(self.names)
+        values = np.empty((k, n), dtype=np.float64)
+        t = (self.frame_index + np.arange(k))[:, None] * self.interval
+
+        cols = self._columns[MODEL_NOISE]
+        if len(cols):
+            values[:, cols] = self._uniform(k, cols, self.variation[cols])
+
+        cols = self._columns[MODEL_RANDOM_WALK]
+        if len(cols):
+            path = self._walk[cols] + np.cumsum(self.rng.normal(0, self.walk_step[cols], (k, len(cols))), axis=0)
+            self._walk[cols] = path[-1]
+            values[:, cols] = self._fold(path, cols)
+
+        cols = self._columns[MODEL_SINE]
+        if len(cols):
+            wave = np.sin(2 * np.pi * t / self.period[cols] + self._phase[cols])
+            noise = self.rng.normal(0, self.variation[cols] / 10, (k, len(cols)))
+            values[:, cols] = self.mid[cols] + self.amplitude[cols] * wave + noise
+
+        cols = self._columns[MODEL_STEP_FAULT]
+        if len(cols):
+            active = self._bursts(k, cols, self.fault_rate, self.fault_frames, self._fault_left)
+            offset = self._fault_sign[cols] * (self.half_band[cols] + self.variation[cols])
+            values[:, cols] = self._uniform(k, cols, 0.0) + active * offset
+
+        cols = self._columns[MODEL_SPIKE]
+        if len(cols):
+            active = self._bursts(k, cols, self.spike_rate, self.spike_frames, self._spike_left)
+            magnitude = self.rng.choice([-1.0, 1.0], (k, len(cols))) * 2 * self.variation[cols]
+            values[:, cols] = self._uniform(k, cols, 0.0) + active * magnitude
+
+        self.frame_index += k
+        values = values.round(2)
+        return values, self.status_codes(values)
+
+    def status_codes(self, values):
+        """Vectorized alarm check against the configured limits (wire_protocol status enum)."""
+        codes = np.zeros(values.shape, dtype=np.uint8)
+        codes[values < self.low] = wire_protocol.STATUS_CODES["LOW ALARM"]
+        codes[values > self.high] = wire_protocol.STATUS_CODES["HIGH ALARM"]
+        return codes
+
+    # --- 3. OUTPUT FORMATS ---
+
+    def to_payload(self, values, statuses, timestamp=None):
+        """One frame as the legacy list of sensor dicts (JSON wire format)."""
+        ts = time.strftime("%H:%M:%S", time.localtime(timestamp))
+        names = wire_protocol.STATUS_NAMES
+        return [
+            {"name": name, "value": value, "timestamp": ts, "status": names[code]}
+            for name, value, code in zip(self.names, values.tolist(), statuses.tolist())
+        ]
+
+    def to_records(self, values, statuses, timestamp_ns=None, ids=None):
+        """One frame as a binary-protocol record array, no per-sensor Python objects."""
+        records = np.empty(len(values), dtype=wire_protocol.RECORD_DTYPE)
+        records["id"] = np.arange(len(values)) if ids is None else ids
+        records["value"] = values
+        records["timestamp_ns"] = time.time_ns() if timestamp_ns is None else timestamp_ns
+        records["status"] = statuses
+        return records
+
+    # --- helpers ---
+
+    def _uniform(self, k, cols, variation):
+        low = self.low[cols] - variation
+        high = self.high[cols] + variation
+        return self.rng.uniform(low, high, (k, len(cols)))
+
+    def _fold(self, path, cols):
+        # Reflect the unbounded walk into [low - variation, high + variation]
+        low = self.low[cols] - self.variation[cols]
+        width = self.high[cols] + self.variation[cols] - low
+        folded = np.mod(path - low, 2 * width)
+        return low + np.where(folded > width, 2 * width - folded, folded)
+
+    def _bursts(self, k, cols, rate, duration, remaining):
+        # 0/1 mask of frames inside an event; `remaining` carries events across blocks
+        starts = self.rng.random((k, len(cols))) < rate[cols]
+        active = np.zeros((k, len(cols)))
+        left = remaining[cols]
+        for row in range(k):
+            left = np.where(starts[row] & (left == 0), duration[cols], left)
+            active[row] = left > 0
+            left = np.maximum(left - 1, 0)
+        remaining[cols] = left
+        return active
@@ -1,171 +1,319 @@
-import socket
-import json
+import os
+import threading
 import time
-import asyncio
-import websockets
 import simulator
+import session_export
+from csv_import import CsvSessionReader
+from session_reader import SessionReader
+from ingest_core import FrameBatcher, MultiSource, TcpSource, WebSocketSource, sensor_dicts
+from wire_protocol import SensorFrame
 
 from PyQt6.QtCore import QThread, pyqtSignal
 
 
-# Worker thread class to handle data reception from the simulator over TCP 
+# Worker thread class to handle data reception from the simulator over TCP
+# Thin Qt adapter: the connection loop, decoding and batching live in ingest_core.TcpSource,
+# its callbacks are this thread's signals
 class SensorWorker(QThread):
     
     # Signals maintaining thread safety with the main GUI thread
-    data_received = pyqtSignal(list)
+    data_received = pyqtSignal(list)   # one frame (kept for backwards compatibility)
+    batch_received = pyqtSignal(list)  # list of frames, emitted every batch interval
     alarm_triggered = pyqtSignal(dict)
     log_message = pyqtSignal(str)  
+    connection_changed = pyqtSignal(dict)  # supervisor stats, emitted on connect / disconnect
     
     
-    def __init__(self):
+    def __init__(self, connection=None, latency=None):
         super().__init__()
-        self._run_flag = True
-        self.client = None
+        self.source = TcpSource(connection, self.batch_received.emit, on_frame=self._emit_frame,
+                                on_log=self.log_message.emit, on_connection=self.connection_changed.emit,
+                                latency=latency)
 
-    def run(self):
-        self._run_flag = True
-        host = simulator.load_config()['connection']['host']
-        port = simulator.load_config()['connection']['tcp_port']
-        
-        self.log_message.emit("Attempting to connect to simulator...")
-        
-        try:
-            self.client = socket.socket(socket.AF_INET, socket.SOCK_STREAM) # Create TCP socket 
-            self.client.settimeout(5.0)  # timeout for connection attempts and recv
-            self.client.connect((host, port))
+    @property
+    def supervisor(self):
+        return self.source.supervisor
 
-            self.log_message.emit("Connected to simulator successfully.") 
-            
-            
-            while self._run_flag:
-                try:
-                    raw_data = self.client.recv(4096).decode('utf-8') # Receive data from simulator
-                    
-                    if not raw_data:
-                        self.log_message.emit("Connection closed by simulator.")
-                        break
-                        
-                    lines = raw_data.strip().split('\n')   # Handle multiple JSON objects if sent together
-                    
-                    for line in lines:
-                        if line:
-                            sensor_list = json.loads(line)
-                            self.data_received.emit(sensor_list)
-                            
-                except socket.timeout:
-                    self.log_message.emit("Stream Heartbeat: No data received, continuing to listen...")
-                    continue
-                except Exception as e:
-                    self.log_message.emit(f"Data Error: {str(e)}")
-                    break
-                
-                
-        # Handle connection errors
-        except ConnectionRefusedError:
-            self.log_message.emit("Error: Simulator not found. Is it running?")
-            
-        except Exception as e:
-            self.log_message.emit(f"Connection Error: {str(e)}")
-        finally:
-            if self.client:
-                self.client.close()
-            self._run_flag = False
-            self.log_message.emit("Disconnected from simulator successfully.")
+    def run(self):
+        self.source.run()
 
     def stop(self):
         """Called by the UI to stop the connection"""
-        self._run_flag = False
+        self.source.stop()
+
+    def _emit_frame(self, sensor_list):
+        # Per-frame signal only costs a queued event if someone still listens to it
+        if self.receivers(self.data_received) > 0:
+            self.data_received.emit(sensor_dicts(sensor_list))  # binary frames built into dicts only here
 
 
 # Worker thread class to handle data reception from the simulator over WebSocket
+# Thin Qt adapter over ingest_core.WebSocketSource
 class WebSocketWorker(QThread):
-    data_received = pyqtSignal(list)
+    data_received = pyqtSignal(list)   # one frame (kept for backwards compatibility)
+    batch_received = pyqtSignal(list)  # list of frames, emitted every batch interval
     log_message = pyqtSignal(str)
     alarm_triggered = pyqtSignal(dict)
+    connection_changed = pyqtSignal(dict)  # supervisor stats, emitted on connect / disconnect
     
-    # Initialize with the WebSocket URL
-    def __init__(self, url="ws://localhost:8080"):
+    # Initialize with the WebSocket URL and the cached connection settings
+    def __init__(self, url="ws://localhost:8080", connection=None, latency=None):
         super().__init__()
-        self.url = url
-        self._run_flag = True
+        self.source = WebSocketSource(url, connection, self.batch_received.emit, on_frame=self._emit_frame,
+                                      on_log=self.log_message.emit, on_connection=self.connection_changed.emit,
+                                      latency=latency)
+
+    @property
+    def supervisor(self):
+        return self.source.supervisor
+
+    def run(self):
+        self.source.run()
 
     def stop(self):
-        self._run_flag = False
-        
-        
-    # Run the event loop for WebSocket connection
+        self.source.stop()
+
+    def _emit_frame(self, sensor_list):
+        if self.receivers(self.data_received) > 0:
+            self.data_received.emit(sensor_list)
+
+
+# Worker thread class for several simulators (production lines) at once
+# Thin Qt adapter over ingest_core.MultiSource: every endpoint is served by this one
+# thread's event loop, connection_changed carries the endpoint name with its stats
+class MultiEndpointWorker(QThread):
+    data_received = pyqtSignal(list)   # one frame, sensor names namespaced by endpoint
+    batch_received = pyqtSignal(list)  # list of frames of all endpoints, emitted every batch interval
+    log_message = pyqtSignal(str)
+    alarm_triggered = pyqtSignal(dict)
+    connection_changed = pyqtSignal(dict)  # {"endpoint": name, **supervisor stats}
+
+    def __init__(self, endpoints, latency=None):
+        super().__init__()
+        self.source = MultiSource(endpoints, self.batch_received.emit, on_frame=self._emit_frame,
+                                  on_log=self.log_message.emit, on_connection=self.connection_changed.emit,
+                                  latency=latency)
+
+    @property
+    def supervisors(self):
+        return self.source.supervisors
+
     def run(self):
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        loop.run_until_complete(self.listen())
-        
-    # listen for incoming WebSocket messages
-    async def listen(self):
-        self.log_message.emit(f"Connecting to {self.url}...")
-        try:
-            async with websockets.connect(self.url) as websocket:
-                self.log_message.emit("WebSocket Connected.")
-                
-                while self._run_flag:
-                    try:
-                        message = await asyncio.wait_for(websocket.recv(), timeout=5.0)   # 5-second timeout
-                        data = json.loads(message) # message is a JSON array of sensor data
-                        self.data_received.emit(data) # Emit received data to main thread 
-                        
-                    except asyncio.TimeoutError:
-                        self.log_message.emit("Stream Heartbeat: Waiting for data...")
-                    except Exception as e:
-                        self.log_message.emit(f"Stream Error: {e}")
-                        break
+        self.source.run()
 
-        except Exception as e:
-            self.log_message.emit(f"Could not connect: {e}")
-        self.log_message.emit("WebSocket Disconnected.")
+    def stop(self):
+        self.source.stop()
+
+    def _emit_frame(self, sensor_list):
+        if self.receivers(self.data_received) > 0:
+            self.data_received.emit(sensor_dicts(sensor_list))
 
 
 
 # Worker thread class to replay saved sensor data from a file 
 class OfflineReplayWorker(QThread):
-    data_received = pyqtSignal(list)
+    data_received = pyqtSignal(list)   # one frame (kept for backwards compatibility)
+    batch_received = pyqtSignal(list)  # list of frames (one per frame when paced, batched at max speed)
     alarm_triggered = pyqtSignal(dict)
     log_message = pyqtSignal(str)
+    range_known = pyqtSignal(float, float)  # first / last recorded timestamp, once the file is indexed
+    position_changed = pyqtSignal(float)  # recorded timestamp of the latest replayed entry
+    
+    SPEED_MAX = None  # no pacing, for bulk re-analysis
+    FALLBACK_INTERVAL = 0.5  # spacing assumed for entries without timestamp_unix
+    POSITION_INTERVAL = 0.1  # wall seconds between position updates
     
-    def __init__(self, file_path):
+    def __init__(self, file_path, speed=1.0):
         super().__init__()
         self.file_path = file_path
         self._run_flag = True
         self._is_paused = False
+        self._speed = speed
+        self._seek_to = None
+        self._anchor = None  # (monotonic time, recorded timestamp) the replay clock runs from
+        self._last_ts = None
+        self._cond = threading.Condition()  # wakes the pacing wait on pause / speed / seek / stop
+        self._reader = None
+        self._index = None  # built by the ReplayIndexer thread, handed over under _cond
+        self._batcher = FrameBatcher()
         
     # pause or resume the replay
     def toggle_pause(self):
-        self._is_paused = not self._is_paused
-        return self._is_paused
+        with self._cond:
+            self._is_paused = not self._is_paused
+            self._reanchor()
+            self._cond.notify_all()
+            return self._is_paused
+    
+    def set_speed(self, speed):
+        """Replay speed multiplier (e.g. 0.25 - 100), or SPEED_MAX to replay without pacing."""
+        with self._cond:
+            self._speed = speed
+            self._reanchor()
+            self._cond.notify_all()
+    
+    def seek(self, timestamp):
+        """Continue the replay from the first entry recorded at or after `timestamp`."""
+        with self._cond:
+            self._seek_to = timestamp
+            self._cond.notify_all()
     
     
     def run(self):
         try:
-            with open(self.file_path, 'r') as f:
-                saved_data = json.load(f)
-            
-            self.log_message.emit(f"OFFLINE: Loaded {len(saved_data)} data points.")
+            # Stream the file instead of loading it whole; the first full pass writes the index
+            self._reader = self._open_reader()
+            if self._reader.count is not None:
+                self.log_message.emit(f"OFFLINE: Loaded {self._reader.count} data points (indexed).")
+                self.range_known.emit(self._reader.start_time or 0.0, self._reader.end_time or 0.0)
+            else:
+                self.log_message.emit(f"OFFLINE: Streaming {os.path.basename(self.file_path)}...")
+                threading.Thread(target=self._build_index, name="ReplayIndexer", daemon=True).start()
             
-            for entry in saved_data:
-                if not self._run_flag: 
-                    break
-                
-                while self._is_paused and self._run_flag:
-                    time.sleep(0.1)  # wait while paused
+            # The indexer is the only pass that writes the index, the replay never builds one
+            entries = self._reader.records(collect_index=False)
+            last_position = 0.0
+            while self._run_flag:
+                with self._cond:
+                    seek_to, self._seek_to = self._seek_to, None
+                if seek_to is not None:
+                    self._flush_batch()
+                    # Jump through the index if the indexer delivered it, otherwise scan forward
+                    with self._cond:
+                        if self._index is not None:
+                            self._reader.index, self._index = self._index, None
+                    entries = self._reader.records(start_time=seek_to, collect_index=False)
+                    with self._cond:
+                        self._last_ts = None
+                        self._anchor = None
+                    self.log_message.emit(f"OFFLINE: Seek to {time.strftime('%H:%M:%S', time.localtime(seek_to))}")
                 
-                if not self._run_flag:
+                entry = next(entries, None)
+                if entry is None:
                     break
                 
-                # Emit the sensor data list
-                self.data_received.emit(entry['sensors'])
-                time.sleep(0.5)  # Simulate real-time delay (2Hz)
+                ts = entry.get('timestamp_unix')
+                if ts is None:
+                    ts = (self._last_ts or 0.0) + self.FALLBACK_INTERVAL
+                if not self._wait_until_due(ts):
+                    continue  # stopped, or a seek arrived while waiting
                 
-            self.log_message.emit("OFFLINE: Replay finished.")
+                self._last_ts = ts
+                # alarms are evaluated at the recorded time, whatever the replay speed
+                self._queue_frame(SensorFrame(entry['sensors'], timestamp_unix=entry.get('timestamp_unix')))
+                if time.monotonic() - last_position >= self.POSITION_INTERVAL:
+                    last_position = time.monotonic()
+                    self.position_changed.emit(ts)
+            
+            self._flush_batch()
+            if self._run_flag:
+                if self._last_ts is not None:
+                    self.position_changed.emit(self._last_ts)
+                self.log_message.emit("OFFLINE: Replay finished.")
         except Exception as e:
             self.log_message.emit(f"OFFLINE ERROR: {str(e)}")
 
+    def stop(self):
+        with self._cond:
+            self._run_flag = False
+            self._cond.notify_all()
+    
+    
+    def _open_reader(self):
+        # Historian CSV logs are mapped onto the configured sensors, everything else is a session export
+        if self.file_path.lower().endswith(".csv"):
+            return CsvSessionReader(self.file_path, simulator.load_config()['sensors'])
+        return SessionReader(self.file_path)
+    
+    def _wait_until_due(self, ts):
+        # Sleep until `ts` is due on the replay clock. Returns False on stop or pending seek.
+        with self._cond:
+            while self._run_flag and self._seek_to is None:
+                if self._is_paused:
+                    self._flush_batch()
+                    self._cond.wait()
+                    continue
+                if self._speed is self.SPEED_MAX:
+                    return True
+                if self._anchor is None:
+                    self._anchor = (time.monotonic(), ts)
+                    return True
+                wall, start_ts = self._anchor
+                delay = wall + (ts - start_ts) / self._speed - time.monotonic()
+                if delay <= 0:
+                    return True
+                self._flush_batch()  # nothing else arrives before the next entry is due
+                self._cond.wait(delay)
+            return False
+    
+    def _reanchor(self):
+        # Restart the replay clock from the last emitted entry (caller holds the condition)
+        self._anchor = (time.monotonic(), self._last_ts) if self._last_ts is not None else None
+    
+    def _build_index(self):
+        # Index the file in the background so the seek slider gets a range while replay already runs
+        # (its own reader: the replay thread adopts the result on its next seek)
+        reader = self._open_reader()
+        index = reader.build_index(should_stop=lambda: not self._run_flag)
+        if index and self._run_flag:
+            with self._cond:
+                self._index = index
+            self.range_known.emit(index['start_time'] or 0.0, index['end_time'] or 0.0)
+            if getattr(reader, 'skipped_rows', 0):
+                self.log_message.emit(f"OFFLINE: Skipped {reader.skipped_rows} malformed CSV rows.")
+    
+    def _queue_frame(self, sensor_list):
+        if self.receivers(self.data_received) > 0:
+            self.data_received.emit(sensor_list)
+        if self._batcher.add(sensor_list) or self._batcher.due():
+            self._flush_batch()
+
+    def _flush_batch(self):
+        if len(self._batcher):
+            self.batch_received.emit(self._batcher.take())
+
+
+
+# Worker thread class to export a recorded session in the background,
+# so live monitoring keeps rendering while large sessions are written
+class SessionExportWorker(QThread):
+    progress = pyqtSignal(int)  # percent done
+    export_finished = pyqtSignal(int, str)  # records written, file path
+    log_message = pyqtSignal(str)
+    
+    def __init__(self, recorder, file_path, fmt=session_export.FORMAT_JSON):
+        super().__init__()
+        self.recorder = recorder
+        self.file_path = file_path
+        self.fmt = fmt
+        self._run_flag = True
+        self._percent = -1
+        
+        # Freeze what gets exported now, records arriving during the export are not included.
+        # Nothing waits for the disk here (GUI thread), run() waits for those records to be written
+        self.session_dir, self.total = recorder.snapshot()
+        recorder.hold(self.session_dir)  # not pruned by a reset / another dashboard while exporting
+    
+    def run(self):
+        try:
+            records = self.recorder.iter_records(self.total, self.session_dir)
+            written = session_export.export_records(
+                records, self.file_path, self.fmt, self.total,
+                progress=self._report_progress, should_stop=lambda: not self._run_flag,
+            )
+            self.export_finished.emit(written, self.file_path)
+        except session_export.ExportCancelled:
+            self.log_message.emit("EXPORT: Cancelled, partial file removed.")
+        except Exception as e:
+            self.log_message.emit(f"EXPORT ERROR: {str(e)}")
+        finally:
+            self.recorder.release(self.session_dir)
+    
+    def _report_progress(self, done, total):
+        percent = int(done * 100 / total) if total else 100
+        if percent != self._percent:  # one signal per percent step
+            self._percent = percent
+            self.progress.emit(percent)
+    
     def stop(self):
         self._run_flag = False
@@ -0,0 +1,109 @@
+import gzip
+import io
+import json
+import os
+
+try:
+    import zstandard  # optional, enables .ndjson.zst exports
+except ImportError:
+    zstandard = None
+
+
+# Streaming session export: records are written one by one as they are read
+# from the recorder chunks, the whole session is never held in memory.
+
+FORMAT_JSON = "json"  # legacy pretty-printed JSON array (json.dump(..., indent=4) layout)
+FORMAT_NDJSON = "ndjson"  # one compact JSON record per line
+FORMAT_NDJSON_GZ = "ndjson.gz"
+FORMAT_NDJSON_ZST = "ndjson.zst"
+
+# format -> (file dialog filter, file extension)
+EXPORT_FORMATS = {
+    FORMAT_JSON: ("JSON Files (*.json)", ".json"),
+    FORMAT_NDJSON: ("NDJSON Files (*.ndjson)", ".ndjson"),
+    FORMAT_NDJSON_GZ: ("Compressed NDJSON (*.ndjson.gz)", ".ndjson.gz"),
+    FORMAT_NDJSON_ZST: ("Zstandard NDJSON (*.ndjson.zst)", ".ndjson.zst"),
+}
+
+PROGRESS_EVERY = 500  # records between progress callbacks
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def available_formats():
+    """Formats usable in this environment (zstd needs the optional zstandard package)."""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != FORMAT_NDJSON_ZST or zstandard is not None]
+
+
+def format_for_path(path, default=FORMAT_JSON):
+    """Pick the export format from the file extension, longest match first."""
+    for fmt, (_, ext) in sorted(EXPORT_FORMATS.items(), key=lambda item: -len(item[1][1])):
+        if path.lower().endswith(ext):
+            return fmt
+    return default
+
+
+def open_output(path, fmt):
+    """Open a text stream for the format, compressing on the fly when needed."""
+    if fmt == FORMAT_NDJSON_GZ:
+        return gzip.open(path, 'wt', encoding='utf-8', compresslevel=6)
+    if fmt == FORMAT_NDJSON_ZST:
+        if zstandard is None:
+            raise RuntimeError("Zstandard export needs the 'zstandard' package (pip install zstandard)")
+        raw = open(path, 'wb')
+        return io.TextIOWrapper(zstandard.ZstdCompressor(level=3).stream_writer(raw, closefd=True), encoding='utf-8')
+    return open(path, 'w', encoding='utf-8')
+
+
+def open_input(path, fmt):
+    """Open a text stream for reading an export written by open_output."""
+    if fmt == FORMAT_NDJSON_GZ:
+        return gzip.open(path, 'rt', encoding='utf-8')
+    if fmt == FORMAT_NDJSON_ZST:
+        if zstandard is None:
+            raise RuntimeError("Zstandard sessions need the 'zstandard' package (pip install zstandard)")
+        raw = open(path, 'rb')
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True), encoding='utf-8')
+    return open(path, 'r', encoding='utf-8')
+
+
+def export_records(records, path, fmt=FORMAT_JSON, total=None, progress=None, should_stop=None):
+    """Write `records` to `path` in `fmt`, returns the number of records written.
+
+    progress(done, total) is called every PROGRESS_EVERY records. If should_stop()
+    returns True the partial file is removed and ExportCancelled is raised.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format '{fmt}'")
+
+    written = 0
+    try:
+        with open_output(path, fmt) as f:
+            if fmt == FORMAT_JSON:
+                f.write("[")
+            for record in records:
+                if fmt == FORMAT_JSON:
+                    f.write(",\n    " if written else "\n    ")
+                    f.write(json.dumps(record, indent=4).replace("\n", "\n    "))
+                else:
+                    f.write(json.dumps(record, separators=(',', ':')))
+                    f.write("\n")
+                written += 1
+
+                if written % PROGRESS_EVERY == 0:
+                    if should_stop and should_stop():
+                        raise ExportCancelled()
+                    if progress:
+                        progress(written, total)
+            if fmt == FORMAT_JSON:
+                f.write("\n]" if written else "]")
+    except BaseException:
+        if os.path.exists(path):
+            os.remove(path)  # never leave a truncated export behind
+        raise
+
+    if progress:
+        progress(written, total)
+    return written
@@ -0,0 +1,200 @@
+import bisect
+import codecs
+import json
+import os
+import threading
+
+import session_export
+
+
+# Streaming reader for exported sessions (legacy JSON array or NDJSON, optionally gzip).
+# Records are parsed incrementally so replay starts immediately with bounded memory.
+# The first complete pass writes a sidecar offset index (<file>.idx) which makes later
+# opens instant and allows jumping to any timestamp.
+
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+READ_CHUNK = 1024 * 1024
+
+
+class SessionReader:
+
+    def __init__(self, path, index_every=1000, index_seconds=60.0):
+        self.path = path
+        self.format = session_export.format_for_path(path)
+        self.index_every = index_every  # index point every N records ...
+        self.index_seconds = index_seconds  # ... or every T seconds of recorded time
+        self.index = self._load_index()
+
+    @property
+    def compressed(self):
+        return self.format in (session_export.FORMAT_NDJSON_GZ, session_export.FORMAT_NDJSON_ZST)
+
+    @property
+    def count(self):
+        return self.index["count"] if self.index else None
+
+    @property
+    def start_time(self):
+        return self.index["start_time"] if self.index else None
+
+    @property
+    def end_time(self):
+        return self.index["end_time"] if self.index else None
+
+    def __iter__(self):
+        return self.records()
+
+    def records(self, start_time=None, collect_index=True):
+        """Yield records in file order, starting at the first one with timestamp_unix >= start_time.
+
+        Without an index a start_time is reached by scanning forward from the beginning.
+        collect_index=False keeps a full pass from writing the index (someone else builds it).
+        """
+        offset = self._offset_before(start_time) if start_time is not None else 0
+
+        # Index points are collected on full passes from the start of the file
+        points = [] if collect_index and self.index is None and offset == 0 else None
+        count, first_ts, last_ts, last_point_ts = 0, None, None, None
+
+        for byte_offset, record in self._parse(offset):
+            ts = record.get("timestamp_unix")
+            if points is not None:
+                if ts is not None:
+                    first_ts = ts if first_ts is None else first_ts
+                    last_ts = ts
+                if count % self.index_every == 0 or (
+                        ts is not None and last_point_ts is not None and ts - last_point_ts >= self.index_seconds):
+                    points.append([count, byte_offset, ts])
+                    last_point_ts = ts
+                count += 1
+
+            if start_time is not None and ts is not None and ts < start_time:
+                continue
+            yield record
+
+        if points is not None:
+            self._save_index(count, first_ts, last_ts, points)
+
+    def build_index(self, should_stop=None):
+        """Scan the whole file once to create the sidecar index (None if should_stop() cut it short)."""
+        self.index = None
+        for n, _ in enumerate(self.records()):
+            if should_stop and n % 1000 == 0 and should_stop():
+                return None
+        return self.index
+
+    # --- index ---
+
+    def _offset_before(self, t):
+        # Byte offset of the last index point at or before t (compressed files always scan from the start)
+        points = self.index["points"] if self.index and not self.compressed else []
+        times = [p[2] if p[2] is not None else float("-inf") for p in points]
+        i = bisect.bisect_right(times, t) - 1
+        return points[i][1] if i >= 0 else 0
+
+    def _signature(self):
+        stat = os.stat(self.path)
+        return {"size": stat.st_size, "mtime": stat.st_mtime}
+
+    def _load_index(self):
+        try:
+            with open(self.path + INDEX_SUFFIX, 'r') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if index.get("version") != INDEX_VERSION or index.get("file") != self._signature():
+            return None  # stale: the session file changed since the index was written
+        return index
+
+    def _save_index(self, count, first_ts, last_ts, points):
+        self.index = {
+            "version": INDEX_VERSION,
+            "file": self._signature(),
+            "format": self.format,
+            "count": count,
+            "start_time": first_ts,
+            "end_time": last_ts,
+            "points": points,
+        }
+        try:
+            # Write then rename, readers never see a half-written index
+            tmp_path = f"{self.path}{INDEX_SUFFIX}.{os.getpid()}.{threading.get_ident()}"
+            with open(tmp_path, 'w') as f:
+                json.dump(self.index, f)
+            os.replace(tmp_path, self.path + INDEX_SUFFIX)
+        except OSError:
+            pass  # read-only location: keep the index in memory only
+
+    # --- parsing ---
+
+    def _parse(self, offset):
+        if self.format == session_export.FORMAT_JSON:
+            return self._parse_json_array(offset)
+        return self._parse_ndjson(offset)
+
+    def _parse_ndjson(self, offset):
+        if self.compressed:
+            f = session_export.open_input(self.path, self.format)
+            try:
+                for line in f:
+                    if line.strip():
+                        yield None, json.loads(line)
+            finally:
+                f.close()
+            return
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            position = offset
+            for line in f:
+                start, position = position, position + len(line)
+                if line.strip():
+                    yield start, json.loads(line)
+
+    def _parse_json_array(self, offset):
+        # Incremental raw_decode over a sliding text window. `base` is the file byte offset of buf[mark],
+        # advanced segment by segment so offsets cost O(record) rather than O(window).
+        decoder = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder('utf-8')()
+
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            buf, base, mark, pos, eof = "", offset, 0, 0, False
+            in_array = offset > 0  # an index offset points at a record inside the array
+
+            while True:
+                # Skip whitespace / separators until the next value
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+
+                if pos < len(buf):
+                    if not in_array:
+                        if buf[pos] != "[":
+                            raise ValueError("Session file is not a JSON array")
+                        in_array = True
+                        pos += 1
+                        continue
+                    if buf[pos] == "]":
+                        return
+                    try:
+                        record, end = decoder.raw_decode(buf, pos)
+                    except ValueError:
+                        if eof:
+                            raise
+                        record = None  # incomplete, needs more data
+                    if record is not None:
+                        base += len(buf[mark:pos].encode('utf-8'))
+                        mark = pos
+                        yield base, record
+                        pos = end
+                        continue
+                elif eof:
+                    return
+
+                # Drop the consumed text and read the next chunk
+                base += len(buf[mark:pos].encode('utf-8'))
+                buf, mark, pos = buf[pos:], 0, 0
+                chunk = f.read(READ_CHUNK)
+                eof = not chunk
+                buf += utf8.decode(chunk, final=eof)
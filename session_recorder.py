@@ -0,0 +1,301 @@
+import collections
+import glob
+import json
+import math
+import os
+import queue
+import shutil
+import sys
+import threading
+import time
+
+CLOSED_MARKER = ".closed"  # written into a session folder once its writer is done with it
+HOLD_PREFIX = ".hold_"  # .hold_<pid> while a reader (export) of that process uses the folder
+PUBLISH_EVERY = 500  # records between flushes under sustained load, readers never wait for an idle queue
+
+
+def _to_json(obj):
+    # Objects that know their JSON form (binary frames kept as record arrays) are expanded here,
+    # on the writer thread, instead of on the ingest path
+    to_json = getattr(obj, "to_json", None)
+    if to_json is None:
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return to_json()
+
+
+# Session recorder replacing the unbounded in-memory archive.
+# Keeps only the newest `tail_size` records in RAM; every record is appended
+# to rotating NDJSON chunk files by a background writer thread, so memory
+# stays flat however long the session runs. Exports read the chunks back.
+# At most `max_pending` records wait for the writer: if the disk stalls, newer
+# records are dropped and counted instead of piling up in RAM. A write error
+# puts the recorder in a failed state (records dropped) until the next session.
+# Readers never join the queue: they wait on a condition until the records they
+# need have been flushed (wait_durable), so the GUI thread never blocks on the disk.
+class SessionRecorder:
+
+    def __init__(self, directory="sessions", tail_size=1000, chunk_records=10000, keep_sessions=3, max_pending=10000):
+        self.directory = directory
+        self.chunk_records = max(1, int(chunk_records))
+        self.keep_sessions = max(1, int(keep_sessions))  # closed session folders kept on disk, oldest removed first
+
+        self.tail = collections.deque(maxlen=tail_size)  # newest records, for quick access
+        self.count = 0  # records queued for the current session
+        self._rejected = 0  # records not queued: writer backlog full or failed state (caller's thread)
+        self._lost = 0  # queued records the writer could not write (writer thread)
+        self.error = None  # last write error, None while the recorder is healthy
+        self._error_session = None  # session folder the error happened in
+        self.session_dir = None
+        self._held = collections.Counter()  # session folders in use by readers of this process
+        self._durable = threading.Condition()
+        self._progress = {}  # session folder -> records flushed (or dropped) by the writer, inf once closed
+
+        self._queue = queue.Queue(maxsize=max(1, int(max_pending)))
+        self._thread = threading.Thread(target=self._writer_loop, name="SessionRecorder", daemon=True)
+        self._thread.start()
+        self._closed = False
+
+        self.start_session()
+
+    @classmethod
+    def from_config(cls, config):
+        options = config.get('recorder', {})
+        return cls(
+            options.get('directory', "sessions"),
+            options.get('tail_size', 1000),
+            options.get('chunk_records', 10000),
+            options.get('keep_sessions', 3),
+            options.get('max_pending_records', 10000),
+        )
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def dropped(self):
+        """Records appended but not archived: backlog full, failed state or not serializable."""
+        return self._rejected + self._lost
+
+    @property
+    def failed(self):
+        """True while the current session cannot be written."""
+        return self.error is not None and self._error_session == self.session_dir
+
+    def stats(self):
+        return {
+            "recorded": self.count,
+            "dropped": self.dropped,
+            "pending": self._queue.qsize(),
+            "error": str(self.error) if self.failed else None,
+        }
+
+    def start_session(self):
+        """Start a new session folder; records before this call are no longer part of the session."""
+        now = time.time_ns() // 1000  # microseconds, names sort in creation order for pruning
+        session_id = time.strftime("%Y%m%d_%H%M%S", time.localtime(now // 1_000_000)) + f"_{now % 1_000_000:06d}_{os.getpid()}"
+        self.session_dir = os.path.join(self.directory, f"Session_{session_id}")
+        with self._durable:
+            self._progress[self.session_dir] = 0
+        self.tail.clear()
+        self.count = 0
+        self._queue.put(("open", self.session_dir))  # the writer closes the previous session and prunes
+
+    def append(self, entry):
+        """Record one archive entry (non-blocking, written to disk by the background thread)."""
+        self.tail.append(entry)
+        if self.failed:
+            self._rejected += 1
+            return
+        try:
+            self._queue.put_nowait(("record", entry))
+        except queue.Full:
+            self._rejected += 1  # disk stalled, memory stays bounded
+            return
+        self.count += 1
+
+    def reset(self):
+        self.start_session()
+
+    def flush(self):
+        """Block until everything appended so far is written to the chunk files (or failed)."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def hold(self, session_dir):
+        """Keep `session_dir` from being pruned (by any recorder) until release()."""
+        self._held[session_dir] += 1
+        if self._held[session_dir] == 1:
+            try:
+                os.makedirs(session_dir, exist_ok=True)  # the writer may not have opened it yet
+                open(os.path.join(session_dir, f"{HOLD_PREFIX}{os.getpid()}"), 'w').close()
+            except OSError:
+                pass  # the in-process hold still applies
+
+    def release(self, session_dir):
+        self._held[session_dir] -= 1
+        if self._held[session_dir] <= 0:
+            del self._held[session_dir]
+            try:
+                os.remove(os.path.join(session_dir, f"{HOLD_PREFIX}{os.getpid()}"))
+            except OSError:
+                pass
+
+    def snapshot(self):
+        """(session_dir, count) of everything recorded so far, for readers on other threads.
+
+        Does not wait for the writer; iter_records() waits for those records to be on disk.
+        """
+        return self.session_dir, self.count
+
+    def wait_durable(self, session_dir, count, timeout=None):
+        """Block until the first `count` records of `session_dir` are on disk (or dropped).
+
+        Returns False on timeout. Sessions this recorder did not write are complete already.
+        """
+        with self._durable:
+            return self._durable.wait_for(lambda: self._progress.get(session_dir, math.inf) >= count, timeout)
+
+    def chunk_files(self, session_dir=None):
+        session_dir = session_dir or self.session_dir
+        if not os.path.isdir(session_dir):
+            return []
+        names = sorted(n for n in os.listdir(session_dir) if n.startswith("chunk_") and n.endswith(".ndjson"))
+        return [os.path.join(session_dir, n) for n in names]
+
+    def iter_records(self, limit=None, session_dir=None):
+        """Stream the session records from disk, oldest first (at most `limit` records).
+
+        Pass the values from snapshot() when reading from another thread.
+        """
+        if session_dir is None:
+            session_dir, count = self.snapshot()
+            limit = count if limit is None else min(limit, count)  # ignore records added meanwhile
+        elif limit is None:
+            limit = self.count if session_dir == self.session_dir else math.inf
+        self.wait_durable(session_dir, limit)
+        emitted = 0
+        for path in self.chunk_files(session_dir):
+            with open(path, 'r') as f:
+                for line in f:
+                    if emitted >= limit:
+                        return
+                    yield json.loads(line)
+                    emitted += 1
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+
+    # --- background writer ---
+
+    def _writer_loop(self):
+        # Every message is acknowledged whatever happens, flush() / close() never hang
+        self._file, self._writing = None, None
+        chunk, written, done = 0, 0, 0
+        while True:
+            message = self._queue.get()
+            kind = None
+            try:
+                if message is None:
+                    self._close_session()
+                    break
+
+                kind, payload = message
+                if kind == "open":
+                    self._close_session()
+                    chunk, written, done = 0, 0, 0
+                    self.error = None  # a new session gets a new chance (disk freed, permissions fixed)
+                    self._writing = payload
+                    os.makedirs(payload, exist_ok=True)
+                    self._prune_sessions()
+                    continue
+
+                if self.error is not None:
+                    self._lost += 1
+                    continue
+
+                line = json.dumps(payload, separators=(',', ':'), default=_to_json) + "\n"
+
+                # Rotate to the next append-only chunk file
+                if self._file is None or written >= self.chunk_records:
+                    if self._file:
+                        self._file.close()
+                        chunk += 1
+                    self._file = open(os.path.join(self._writing, f"chunk_{chunk:06d}.ndjson"), 'a')
+                    written = 0
+
+                self._file.write(line)
+                written += 1
+            except (TypeError, ValueError) as e:
+                self._lost += 1  # entry not serializable, the session goes on
+                self._report(f"record dropped: {e}")
+            except OSError as e:
+                self._lost += 1
+                self.error, self._error_session = e, self._writing
+                self._report(f"recording stopped: {e}")
+                self._discard_file()
+            finally:
+                if kind == "record":
+                    done += 1
+                    if self._queue.empty() or done % PUBLISH_EVERY == 0:
+                        self._publish(done)
+                self._queue.task_done()
+
+    def _publish(self, done):
+        # Flush what was written so far and wake the readers waiting for it
+        if self._file:
+            try:
+                self._file.flush()
+            except OSError as e:
+                self.error, self._error_session = e, self._writing
+                self._report(f"recording stopped: {e}")
+                self._discard_file()
+        with self._durable:
+            self._progress[self._writing] = done
+            self._durable.notify_all()
+
+    def _close_session(self):
+        if self._writing is None:
+            return
+        try:
+            if self._file:
+                self._file.close()
+            open(os.path.join(self._writing, CLOSED_MARKER), 'w').close()
+        except OSError as e:
+            self._report(f"closing session failed: {e}")
+        with self._durable:
+            self._progress[self._writing] = math.inf  # complete, readers stop waiting
+            self._durable.notify_all()
+        self._file, self._writing = None, None
+
+    def _discard_file(self):
+        try:
+            if self._file:
+                self._file.close()
+        except OSError:
+            pass
+        self._file = None
+
+    def _report(self, msg):
+        print(f"SessionRecorder: {msg}", file=sys.stderr, flush=True)
+
+    def _prune_sessions(self):
+        # Only closed sessions nobody reads from are removed, whichever recorder wrote them:
+        # a dashboard never deletes another one's live session or a session being exported
+        if not os.path.isdir(self.directory):
+            return
+        sessions = []
+        for name in sorted(os.listdir(self.directory)):
+            path = os.path.join(self.directory, name)
+            if (not name.startswith("Session_") or path == self._writing or path in self._held
+                    or not os.path.exists(os.path.join(path, CLOSED_MARKER))
+                    or glob.glob(os.path.join(glob.escape(path), HOLD_PREFIX + "*"))):
+                continue
+            sessions.append(path)
+        for old in sessions[:max(0, len(sessions) - (self.keep_sessions - 1))]:
+            shutil.rmtree(old, ignore_errors=True)
+            with self._durable:
+                self._progress.pop(old, None)
@@ -1,10 +1,15 @@
-import socket
 import json
 import time
-import random
+import functools
 import asyncio    
 import websockets
 import sys
+import argparse
+
+import numpy as np
+
+import wire_protocol
+from scenario import ScenarioEngine
 
 
 
@@ -19,94 +24,237 @@ def load_config():
         sys.exit(1)
 
 # --- 2. PAYLOAD GENERATOR ---
-def generate_payload(sensor_settings):
+# Values come from the vectorized ScenarioEngine (scenario.py), see the "model" sensor option.
+# Without an explicit engine, one engine per distinct settings is kept here so successive
+# frames continue the same walks, sine phases and faults.
+@functools.lru_cache(maxsize=16)
+def _shared_engine(settings_key):
+    return ScenarioEngine(json.loads(settings_key))
+
+
+def payload_engine(sensor_settings):
+    """The ScenarioEngine generate_payload() uses for `sensor_settings` when none is passed."""
+    return _shared_engine(json.dumps(sensor_settings))
+
+
+def generate_payload(sensor_settings, engine=None):
     
-    """Helper to generate sensor data based on config ranges."""
-    payload = []
-    for name, limits in sensor_settings.items():
-        # Generate value with potential for out-of-bounds (Alarms)
-        var = limits.get('variation', 5.0)
-        val = round(random.uniform(limits['low'] - var, limits['high'] + var), 2)
-        
-        if val < limits['low']:
-            status = "LOW ALARM"
-        elif val > limits['high']:
-            status = "HIGH ALARM"
-        else:
-            status = "OK"
-        
-        payload.append({
-            "name": name,
-            "value": val,
-            "timestamp": time.strftime("%H:%M:%S"),
-            "status": status
-        })
-    return payload
+    """Helper to generate one frame of sensor data based on config ranges.
+    
+    Model state (walks, faults) carries over between calls: `engine`, or the engine shared
+    by every call with the same settings."""
+    engine = engine or payload_engine(sensor_settings)
+    return engine.to_payload(*engine.next_frame())
 
 
 # --- 3. SIMULATOR SERVERS ---
 # Server code for simulating sensor data streams
 
 # TCP Simulator
-def run_tcp_simulator():
-    
-    config = load_config() # Load config
-    host = config['connection']['host']
-    port = config['connection']['tcp_port']
-    interval = config['connection']['update_interval'] 
-    SENSOR_CONFIG = config['sensors']
-    
-    # Create TCP server socket
-    server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-    server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-    # Bind and listen
-    server_socket.bind((host, port))
-    server_socket.listen(1)
+# One asyncio server for any number of dashboards: every frame is generated once,
+# encoded once per wire protocol, and the same bytes are written to every client.
+
+SLOW_CLIENT_SKIP = "skip"  # skip frames for a client whose write buffer is full
+SLOW_CLIENT_DROP = "drop"  # disconnect a client whose write buffer is full
+
+
+# A connected dashboard with its own bounded write buffer and lag metrics
+class ClientSession:
     
-    print(f"Industrial TCP Simulator Online at {host}:{port}...")
+    def __init__(self, writer, protocol):
+        self.writer = writer
+        self.protocol = protocol
+        self.address = writer.get_extra_info('peername')
+        self.connected_at = time.time()
+        
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.max_buffered = 0  # high-water mark of the write buffer (bytes)
+
+    def buffered(self):
+        """Bytes written to this client that the kernel has not accepted yet."""
+        return self.writer.transport.get_write_buffer_size()
+
+    def metrics(self, frame_size):
+        buffered = self.buffered()
+        return {
+            "client": f"{self.address[0]}:{self.address[1]}" if self.address else "?",
+            "protocol": self.protocol,
+            "frames_sent": self.frames_sent,
+            "frames_skipped": self.frames_skipped,
+            "buffered_bytes": buffered,
+            "max_buffered_bytes": self.max_buffered,
+            "lag_frames": round(buffered / frame_size, 1) if frame_size else 0.0,
+        }
+
+
+def server_options(config):
+    """Fan-out settings from the optional 'simulator' config section."""
+    options = config.get('simulator', {})
+    return {
+        "max_client_buffer": options.get('max_client_buffer_bytes', 1024 * 1024),
+        "slow_client_policy": options.get('slow_client_policy', SLOW_CLIENT_SKIP),
+        "stats_interval": options.get('stats_interval', 10.0),
+        "seed": options.get('seed'),
+    }
+
+
+class TcpSimulatorServer:
     
-    while True:
-        try:
-            conn, addr = server_socket.accept()    # Wait for a client to connect
-            # accept method blocks until a connection is established
-            # conn is a new socket object usable to send and receive data on the connection
-            # addr is the address bound to the socket on the other end of the connection USED FOR LOGGING
-            
-            print(f"Dashboard Connected: {addr}")
-            
-            while True:
-                payload = generate_payload(SENSOR_CONFIG)
-                json_data = json.dumps(payload) + "\n"
-                conn.sendall(json_data.encode('utf-8'))
-                
-                time.sleep(interval) # required frequency
+    def __init__(self, host, port, sensor_config, interval,
+                 max_client_buffer=1024 * 1024, slow_client_policy=SLOW_CLIENT_SKIP, stats_interval=10.0, seed=None):
+        self.host = host
+        self.port = port
+        self.sensor_config = sensor_config
+        self.interval = interval
+        self.max_client_buffer = max_client_buffer
+        self.slow_client_policy = slow_client_policy
+        self.stats_interval = stats_interval
         
-        # Handle disconnections
+        self.engine = ScenarioEngine(sensor_config, seed, interval)  # seeded -> reproducible scenario
+        self.clients = set()
+        self.frames_generated = 0
+        self._last_frame_size = {}  # protocol -> bytes of the last encoded frame
+        self._server = None
+
+    @classmethod
+    def from_config(cls, config, **overrides):
+        connection = config['connection']
+        options = {**server_options(config), **overrides}
+        return cls(connection['host'], connection['tcp_port'], config['sensors'], connection['update_interval'], **options)
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # resolves port 0 to the real port
+        print(f"Industrial TCP Simulator Online at {self.host}:{self.port}...")
+
+    async def serve_forever(self):
+        await self.start()
+        async with self._server:
+            await asyncio.gather(self._generate_frames(), self._report_stats())
+
+    async def stop(self):
+        for session in list(self.clients):
+            session.writer.close()
+        self.clients.clear()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    # Register a new dashboard after the optional protocol hello
+    async def _handle_client(self, reader, writer):
+        protocol = await wire_protocol.read_hello_async(reader)
+        if protocol == wire_protocol.PROTOCOL_BINARY:
+            writer.write(wire_protocol.hello_reply(self.sensor_config.keys()))
+        
+        session = ClientSession(writer, protocol)
+        self.clients.add(session)
+        print(f"Dashboard Connected: {session.address} ({protocol})")
+        
+        try:
+            # Clients never send data after the hello, EOF means they disconnected
+            while await reader.read(1024):
+                pass
         except (ConnectionResetError, BrokenPipeError):
-            print("Dashboard disconnected. Waiting...")
-        except Exception as e:
-            print(f"Simulator Error: {e}")
+            pass
         finally:
-            if 'conn' in locals():
-                conn.close()
+            self._disconnect(session, "disconnected")
+
+    def _disconnect(self, session, reason):
+        if session not in self.clients:
+            return
+        self.clients.discard(session)
+        session.writer.close()
+        metrics = session.metrics(self._last_frame_size.get(session.protocol, 0))
+        print(f"Dashboard {reason}: {session.address} "
+              f"(sent {metrics['frames_sent']}, skipped {metrics['frames_skipped']})")
+
+    def broadcast(self, values, statuses, engine=None, ids=None):
+        """Encode the frame once per protocol in use and write the same bytes to every client.
+        
+        `ids` are the binary sensor ids of the frame's sensors (default: 0..n-1). Every frame carries
+        its sequence number and a nanosecond send timestamp for the dashboard's latency tracking, once
+        in the frame envelope / stamp, not in every sensor."""
+        engine = engine or self.engine
+        seq, sent_ns = self.frames_generated, time.time_ns()
+        encoded = {}
+        for session in list(self.clients):
+            if session.writer.is_closing():
+                self._disconnect(session, "disconnected")
+                continue
+            
+            data = encoded.get(session.protocol)
+            if data is None:
+                if session.protocol == wire_protocol.PROTOCOL_BINARY:
+                    data = wire_protocol.encode_binary_frame(engine.to_records(values, statuses, sent_ns, ids), seq, sent_ns)
+                else:
+                    data = wire_protocol.encode_json_frame(engine.to_payload(values, statuses, sent_ns / 1e9), seq, sent_ns)
+                encoded[session.protocol] = data
+                self._last_frame_size[session.protocol] = len(data)
+            
+            buffered = session.buffered()
+            if buffered + len(data) > self.max_client_buffer:
+                # Slow consumer: never let one client grow memory or stall the generator
+                if self.slow_client_policy == SLOW_CLIENT_DROP:
+                    self._disconnect(session, "dropped (slow consumer)")
+                else:
+                    session.frames_skipped += 1
+                continue
+            
+            session.writer.write(data)
+            session.frames_sent += 1
+            session.max_buffered = max(session.max_buffered, buffered + len(data))
+
+    async def _generate_frames(self):
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while True:
+            if self.clients:
+                self.broadcast(*self.engine.next_frame())
+                self.frames_generated += 1
+            
+            # Fixed-rate schedule, a slow frame does not shift the following ones
+            next_tick += self.interval
+            delay = next_tick - loop.time()
+            if delay < 0:
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+
+    async def _report_stats(self):
+        while self.stats_interval:
+            await asyncio.sleep(self.stats_interval)
+            for session in list(self.clients):
+                print(f"Client stats: {session.metrics(self._last_frame_size.get(session.protocol, 0))}")
+
+
+def run_tcp_simulator(seed=None):
+    
+    config = load_config() # Load config
+    server = TcpSimulatorServer.from_config(config, **({} if seed is None else {"seed": seed}))
+    asyncio.run(server.serve_forever())
 
 
 
 # WebSocket Simulator
-def run_websocket_simulator():
+def run_websocket_simulator(seed=None):
     
     config = load_config()
     SENSOR_CONFIG = config['sensors']
     interval = config['connection']['update_interval']
+    engine = ScenarioEngine(SENSOR_CONFIG, server_options(config)['seed'] if seed is None else seed, interval)
 
     
     # The 'Handler' function called for every new connection
     async def sensor_data(websocket):
         print(f"Dashboard Connected: {websocket.remote_address}")
+        seq = 0
         try:
             while True:
-                payload = generate_payload(SENSOR_CONFIG)
-                json_data = json.dumps(payload)  # no manual delimiter needed for WebSocket
+                sent_ns = time.time_ns()
+                payload = engine.to_payload(*engine.next_frame(), sent_ns / 1e9)
+                json_data = json.dumps(wire_protocol.json_envelope(payload, seq, sent_ns))  # no manual delimiter needed for WebSocket
+                seq += 1
                 await websocket.send(json_data)
                 await asyncio.sleep(interval) # 2Hz Update Frequency
                 
@@ -127,22 +275,146 @@ def run_websocket_simulator():
         print("\nSimulator shut down by user.")
 
 
+# --- 4. LOAD GENERATOR ---
+# Stress-test driver: thousands of virtual sensors at a target frame rate,
+# served through the same fan-out TCP server the dashboards connect to.
+
+def make_virtual_sensors(count, templates):
+    """Synthesize `count` sensors by cycling through the configured sensor templates."""
+    names = list(templates)
+    sensors = {}
+    for i in range(count):
+        template = names[i % len(names)]
+        sensors[f"{template}_{i // len(names):04d}"] = dict(templates[template])
+    return sensors
+
+
+class LoadGeneratorServer(TcpSimulatorServer):
+    
+    def __init__(self, host, port, sensor_config, fps, sensors_per_frame=None, duration=None, seed=None, **options):
+        super().__init__(host, port, sensor_config, 1.0 / fps, seed=seed, **options)
+        self.fps = fps
+        self.duration = duration
+        self.sensors_per_frame = min(sensors_per_frame or len(sensor_config), len(sensor_config))
+        self.samples_generated = 0
+        
+        # Each frame carries the next slice of sensors, cycling through all of them.
+        # Every slice has its own engine (independent seeded stream) and binary ids.
+        items = list(sensor_config.items())
+        offsets = range(0, len(items), self.sensors_per_frame)
+        seeds = np.random.SeedSequence(seed).spawn(len(offsets))
+        self._slices = [
+            (ScenarioEngine(dict(items[i:i + self.sensors_per_frame]), slice_seed, self.interval * len(offsets)),
+             np.arange(i, min(i + self.sensors_per_frame, len(items))))
+            for i, slice_seed in zip(offsets, seeds)
+        ]
+        
+        self._started = None  # (wall, cpu) at start
+        self._window = None  # (wall, cpu, frames) at the last periodic report
+
+
+    async def serve_forever(self):
+        """Generate until `duration` elapses (forever if None), returns the final report."""
+        await self.start()
+        stats_task = asyncio.create_task(self._report_stats())
+        try:
+            async with self._server:
+                await self._generate_frames()
+        finally:
+            stats_task.cancel()
+        return self.report()
+
+    async def _generate_frames(self):
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        self._started = self._window = (time.perf_counter(), time.process_time(), 0)
+        burst = max(1, int(self.fps / 10))  # yield to the event loop at least every ~100 ms of frames
+        
+        while self.duration is None or loop.time() - start < self.duration:
+            # Catch up on every frame that is due, so coarse sleeps do not lower the rate
+            due = int((loop.time() - start) * self.fps) - self.frames_generated
+            for _ in range(min(due, burst)):
+                engine, ids = self._slices[self.frames_generated % len(self._slices)]
+                values, statuses = engine.next_frame()
+                self.broadcast(values, statuses, engine, ids)
+                self.frames_generated += 1
+                self.samples_generated += len(values)
+            
+            await asyncio.sleep(max(0.0, start + (self.frames_generated + 1) / self.fps - loop.time()))
+
+    def report(self, since=None):
+        """Achieved vs target rate and CPU usage since `since` (defaults to the start)."""
+        wall0, cpu0, frames0 = since or self._started or (time.perf_counter(), time.process_time(), 0)
+        wall = max(time.perf_counter() - wall0, 1e-9)
+        frames = self.frames_generated - frames0
+        achieved = frames / wall
+        return {
+            "target_fps": self.fps,
+            "achieved_fps": round(achieved, 1),
+            "achieved_ratio": round(achieved / self.fps, 3),
+            "sensors": len(self.sensor_config),
+            "sensors_per_frame": self.sensors_per_frame,
+            "samples_per_s": round(achieved * self.sensors_per_frame, 1),
+            "cpu_percent": round((time.process_time() - cpu0) / wall * 100, 1),
+            "frames_generated": self.frames_generated,
+            "clients": len(self.clients),
+            "elapsed_s": round(wall, 2),
+        }
+
+    async def _report_stats(self):
+        while self.stats_interval:
+            await asyncio.sleep(self.stats_interval)
+            print(f"Load stats: {self.report(self._window)}")
+            self._window = (time.perf_counter(), time.process_time(), self.frames_generated)
+            for session in list(self.clients):
+                print(f"Client stats: {session.metrics(self._last_frame_size.get(session.protocol, 0))}")
+
+
+def run_load_generator(sensors, fps, sensors_per_frame=None, duration=None, port=None, seed=None):
+    
+    config = load_config()
+    virtual_sensors = make_virtual_sensors(sensors, config['sensors'])
+    options = server_options(config)
+    if seed is not None:
+        options['seed'] = seed
+    server = LoadGeneratorServer(config['connection']['host'], port or config['connection']['tcp_port'],
+                                 virtual_sensors, fps, sensors_per_frame, duration, **options)
+    
+    print(f"Load generator: {sensors} sensors, {server.sensors_per_frame} per frame, target {fps} frames/s")
+    report = asyncio.run(server.serve_forever())
+    print(json.dumps(report, indent=2))
+    return report
+
+
+
 # entry point for simulator 
-# allows choosing between TCP and WebSocket modes
+# allows choosing between TCP, WebSocket and load generator modes
 
 if __name__ == "__main__":
-    # You can choose which one to run by uncommenting:
+    parser = argparse.ArgumentParser(description="Industrial sensor data simulator")
+    parser.add_argument("--mode", choices=["tcp", "ws", "loadgen"], default="tcp",
+                        help="tcp (default for the current dashboard), ws (WebSocketWorker) or loadgen (stress test)")
+    parser.add_argument("--sensors", type=int, default=1000, help="loadgen: number of virtual sensors")
+    parser.add_argument("--fps", type=float, default=100.0, help="loadgen: target frames per second")
+    parser.add_argument("--sensors-per-frame", type=int, default=None, help="loadgen: sensors in each frame (default: all)")
+    parser.add_argument("--duration", type=float, default=None, help="loadgen: stop after N seconds and print the report")
+    parser.add_argument("--port", type=int, default=None, help="loadgen: TCP port (default: config tcp_port)")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for a reproducible scenario (default: config seed)")
+    args = parser.parse_args()
     
-    # OPTION A: Run TCP (Default for the current dashboard)
-    try:
-        run_tcp_simulator()
-    except KeyboardInterrupt:
-        print("\nTCP Simulator shut down.")
-
-    # OPTION B: Run WebSocket (NOTE ---> update your dashboard 'app.py' worker to instantiate WebSocketWorker accordingly to test this)
-    # details in README.md and documentation
+    if args.mode == "ws":
+        # NOTE ---> update your dashboard 'app.py' worker to instantiate WebSocketWorker accordingly to test this
+        # details in README.md and documentation
+        run_websocket_simulator(args.seed)
+    
+    elif args.mode == "loadgen":
+        try:
+            run_load_generator(args.sensors, args.fps, args.sensors_per_frame, args.duration, args.port, args.seed)
+        except KeyboardInterrupt:
+            print("\nLoad generator shut down.")
     
-    # try:
-    #     asyncio.run(run_websocket_simulator())
-    # except KeyboardInterrupt:
-    #     print("\nWS Simulator shut down.")
+    else:
+        try:
+            run_tcp_simulator(args.seed)
+        except KeyboardInterrupt:
+            print("\nTCP Simulator shut down.")
@@ -0,0 +1,109 @@
+import struct
+
+
+# Incremental framer for byte streams (TCP), newline-delimited or length-prefixed.
+# Reads into one preallocated bytearray with recv_into and carries partial
+# frames across reads, so a JSON line straddling a recv boundary is only
+# handed to the decoder once it is complete.
+class StreamFramer:
+
+    def __init__(self, buffer_size=65536, max_frame_size=16 * 1024 * 1024, delimiter=b'\n'):
+        self._buf = bytearray(buffer_size)
+        self._start = 0  # first byte not yet handed out as a frame
+        self._end = 0  # end of the received data
+        self.max_frame_size = max_frame_size
+        self.delimiter = delimiter
+
+        # Throughput counters
+        self.bytes_received = 0
+        self.frames_decoded = 0
+
+    def __len__(self):
+        """Number of buffered bytes that do not form a complete frame yet."""
+        return self._end - self._start
+
+    def recv_into(self, sock):
+        """Read from the socket straight into the buffer, returns the byte count (0 = closed)."""
+        self._make_room()
+        with memoryview(self._buf) as mv, mv[self._end:] as free:
+            n = sock.recv_into(free)
+        self._end += n
+        self.bytes_received += n
+        return n
+
+    def feed(self, data):
+        """Append bytes that were read elsewhere (e.g. by an asyncio stream)."""
+        view = memoryview(data)
+        while len(view):
+            self._make_room()
+            n = min(len(view), len(self._buf) - self._end)
+            self._buf[self._end:self._end + n] = view[:n]
+            self._end += n
+            self.bytes_received += n
+            view = view[n:]
+
+    def frames(self):
+        """Yield every complete frame as a memoryview into the buffer (no copies).
+
+        The views are only valid until the next recv_into()/feed() call.
+        """
+        buf, delimiter = self._buf, self.delimiter
+        mv = memoryview(buf)
+        while True:
+            pos = buf.find(delimiter, self._start, self._end)
+            if pos < 0:
+                break
+
+            start = self._start
+            self._start = pos + len(delimiter)
+            if pos == start:
+                continue  # skip empty lines
+
+            self.frames_decoded += 1
+            yield mv[start:pos]
+
+        if self._start == self._end:
+            self._start = self._end = 0  # everything consumed, reuse the buffer from the front
+
+    def length_prefixed_frames(self, header=struct.Struct("<I")):
+        """Yield every complete length-prefixed frame payload as a memoryview (no copies).
+
+        Same validity rules as frames(): views die on the next recv_into()/feed() call.
+        """
+        buf = self._buf
+        mv = memoryview(buf)
+        while self._end - self._start >= header.size:
+            (size,) = header.unpack_from(buf, self._start)
+            if size > self.max_frame_size:
+                raise ValueError(f"Frame exceeds maximum size of {self.max_frame_size} bytes")
+            if self._end - self._start < header.size + size:
+                break  # payload not complete yet
+
+            start = self._start + header.size
+            self._start = start + size
+            self.frames_decoded += 1
+            yield mv[start:start + size]
+
+        if self._start == self._end:
+            self._start = self._end = 0
+
+    def clear(self):
+        self._start = self._end = 0
+
+    def _make_room(self):
+        if self._end < len(self._buf):
+            return
+
+        pending = self._end - self._start
+        if self._start > 0:
+            # Move the partial frame to the front (same-size slice assignment, never resizes)
+            self._buf[:pending] = self._buf[self._start:self._end]
+            self._start, self._end = 0, pending
+            return
+
+        # A single frame is larger than the whole buffer -> grow
+        if len(self._buf) >= self.max_frame_size:
+            raise ValueError(f"Frame exceeds maximum size of {self.max_frame_size} bytes")
+        bigger = bytearray(min(len(self._buf) * 2, self.max_frame_size))
+        bigger[:pending] = self._buf[:pending]
+        self._buf = bigger
@@ -0,0 +1,97 @@
+import random
+import time
+
+
+# Exponential reconnect delays with jitter.
+# The first retry comes after `initial` seconds so a restarted simulator is back
+# within a fraction of a second, each further failed attempt doubles the delay up
+# to `maximum`. Jitter shortens every delay by up to `jitter` (fraction) so several
+# dashboards do not reconnect to a restarted PLC in lockstep.
+class Backoff:
+
+    def __init__(self, initial=0.1, maximum=10.0, factor=2.0, jitter=0.2, rng=None):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.attempt = 0
+        self._rng = rng or random.Random()
+
+    def next_delay(self):
+        """Seconds to wait before the next attempt."""
+        base = min(self.maximum, self.initial * self.factor ** self.attempt)
+        self.attempt += 1
+        return base * (1.0 - self.jitter * self._rng.random())
+
+    def reset(self):
+        self.attempt = 0
+
+
+
+# Tracks the connection of one long-lived live worker across disconnects.
+# The worker reports connected() / disconnected() and asks retry_delay() between
+# attempts; reconnect counts and downtime are kept for the Maintenance console.
+class ConnectionSupervisor:
+
+    def __init__(self, backoff=None, clock=time.monotonic):
+        self.backoff = backoff or Backoff()
+        self._clock = clock
+        self.is_connected = False
+        self.sessions = 0  # successful connections
+        self.failed_attempts = 0  # retries in the current outage
+        self.last_gap = None  # seconds between the last disconnect and the reconnect
+        self._downtime = 0.0  # closed outages
+        self._down_since = None
+
+    @classmethod
+    def from_config(cls, connection):
+        return cls(Backoff(
+            connection.get('reconnect_initial_s', 0.1),
+            connection.get('reconnect_max_s', 10.0),
+        ))
+
+    @property
+    def reconnects(self):
+        return max(0, self.sessions - 1)
+
+    def connected(self):
+        """Record a successful connection, returns the outage length if this was a reconnect."""
+        gap = None
+        if self._down_since is not None:
+            gap = self._clock() - self._down_since
+            self._downtime += gap
+            self._down_since = None
+            self.last_gap = gap
+        self.is_connected = True
+        self.sessions += 1
+        self.failed_attempts = 0
+        self.backoff.reset()
+        return gap
+
+    def disconnected(self):
+        """Record a lost connection, returns True if the worker was connected until now."""
+        was_connected = self.is_connected
+        self.is_connected = False
+        if was_connected:
+            self._down_since = self._clock()
+        return was_connected
+
+    def retry_delay(self):
+        """Seconds to wait before the next connection attempt, the backoff grows per call until connected()."""
+        self.failed_attempts += 1
+        return self.backoff.next_delay()
+
+    def downtime(self):
+        """Total seconds spent disconnected after the first connection, the current outage included."""
+        if self._down_since is None:
+            return self._downtime
+        return self._downtime + self._clock() - self._down_since
+
+    def stats(self):
+        return {
+            "connected": self.is_connected,
+            "reconnects": self.reconnects,
+            "failed_attempts": self.failed_attempts,
+            "downtime_s": round(self.downtime(), 3),
+            "last_gap_s": None if self.last_gap is None else round(self.last_gap, 3),
+        }
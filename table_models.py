@@ -0,0 +1,269 @@
+import numpy as np
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+import wire_protocol
+
+
+# One alarm sample: display time label, sensor id, value, status id (27 bytes)
+ALARM_DTYPE = np.dtype([
+    ("time", "S12"),
+    ("sensor", "<u4"),
+    ("value", "<f4"),
+    ("status", "u1"),
+])
+
+
+# Alarm history for a QTableView, newest alarm in row 0.
+# Samples are kept in a fixed-capacity NumPy ring instead of one QTableWidgetItem
+# per cell; appends are buffered and handed to the view once per render frame
+# with a single beginInsertRows. Rows pushed out of the ring can be appended to
+# an on-disk CSV overflow file.
+class AlarmHistoryModel(QAbstractTableModel):
+
+    HEADERS = ["Time", "Sensor", "Val", "Type"]
+
+    def __init__(self, capacity=1_000_000, overflow_path=None, parent=None):
+        super().__init__(parent)
+        if capacity < 1:
+            raise ValueError("AlarmHistoryModel capacity must be at least 1")
+
+        self.capacity = int(capacity)
+        self._ring = np.zeros(self.capacity, dtype=ALARM_DTYPE)
+        self._head = 0  # next write position
+        self._size = 0
+        self._pending = []  # appended since the last flush
+
+        # Sensor / status strings are stored once, rows keep small ids
+        self._sensor_names, self._sensor_ids = [], {}
+        self._status_names = list(wire_protocol.STATUS_NAMES)
+        self._status_ids = {name: i for i, name in enumerate(self._status_names)}
+
+        self.overflow_path = overflow_path
+        self.overflow_count = 0
+        self._overflow = None
+
+    @classmethod
+    def from_config(cls, dashboard_config, parent=None):
+        return cls(
+            dashboard_config.get('alarm_history_capacity', 1_000_000),
+            dashboard_config.get('alarm_overflow_file'),
+            parent,
+        )
+
+    def __len__(self):
+        return self._size + len(self._pending)
+
+    def append(self, ts, name, val, status):
+        """Queue one alarm sample, shown after the next flush()."""
+        sensor = self._sensor_ids.get(name)
+        if sensor is None:
+            sensor = self._sensor_ids[name] = len(self._sensor_names)
+            self._sensor_names.append(name)
+        code = self._status_ids.get(status)
+        if code is None:
+            code = self._status_ids[status] = len(self._status_names)
+            self._status_names.append(status)
+        self._pending.append((ts.encode('ascii', 'replace')[:12], sensor, val, code))
+
+    def flush(self):
+        """Move queued samples into the ring and notify the view in one batch. Returns the number added."""
+        if not self._pending:
+            return 0
+        rows = np.array(self._pending, dtype=ALARM_DTYPE)
+        self._pending = []
+        n = len(rows)
+
+        if n >= self.capacity:
+            # The whole view is replaced, a reset is cheaper than remove + insert
+            self.beginResetModel()
+            self._spill(self._ordered())
+            self._spill(rows[:n - self.capacity])
+            self._ring[:] = rows[n - self.capacity:]
+            self._head, self._size = 0, self.capacity
+            self.endResetModel()
+            return n
+
+        evicted = max(0, self._size + n - self.capacity)
+        if evicted:
+            # Oldest rows sit at the bottom of the view
+            self.beginRemoveRows(QModelIndex(), self._size - evicted, self._size - 1)
+            self._spill(self._ordered(evicted))
+            self._size -= evicted
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), 0, n - 1)
+        positions = (self._head + np.arange(n)) % self.capacity
+        self._ring[positions] = rows
+        self._head = (self._head + n) % self.capacity
+        self._size += n
+        self.endInsertRows()
+        return n
+
+    def clear(self):
+        self.beginResetModel()
+        self._pending = []
+        self._head = self._size = 0
+        self.endResetModel()
+
+    def close(self):
+        if self._overflow:
+            self._overflow.close()
+            self._overflow = None
+
+    def row(self, row):
+        """(time, sensor, value, status) of a view row, 0 = newest."""
+        record = self._ring[(self._head - 1 - row) % self.capacity]
+        return (record["time"].decode('ascii'), self._sensor_names[record["sensor"]],
+                float(record["value"]), self._status_names[record["status"]])
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._size
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            ts, name, val, status = self.row(index.row())
+            return (ts, name, f"{val:.2f}", status)[index.column()]
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    # --- helpers ---
+
+    def _ordered(self, count=None):
+        # The oldest `count` rows of the ring (all by default), oldest first
+        count = self._size if count is None else count
+        start = (self._head - self._size) % self.capacity
+        return self._ring[(start + np.arange(count)) % self.capacity]
+
+    def _spill(self, rows):
+        # Append evicted rows to the overflow CSV (oldest first), when configured
+        if not self.overflow_path or not len(rows):
+            return
+        if self._overflow is None:
+            self._overflow = open(self.overflow_path, 'a', encoding='utf-8')
+        names, statuses = self._sensor_names, self._status_names
+        self._overflow.writelines(
+            f"{ts.decode('ascii')},{names[sensor]},{value:.2f},{statuses[status]}\n"
+            for ts, sensor, value, status in zip(rows["time"].tolist(), rows["sensor"].tolist(),
+                                                 rows["value"].tolist(), rows["status"].tolist())
+        )
+        self._overflow.flush()
+        self.overflow_count += len(rows)
+
+
+
+# Live sensor table, one row per sensor.
+# Readings are queued with update() (the latest one per sensor wins) and applied
+# by flush() once per render frame. Cell texts and row colors are kept in place
+# and dataChanged is only emitted for the cells whose text or color changed.
+class LiveSensorModel(QAbstractTableModel):
+
+    HEADERS = ["Sensor", "Reading", "Time", "Status"]
+    ALARM_BACKGROUND = QColor(255, 69, 58, 40)  # red tint for alarm rows
+    NORMAL_BACKGROUND = QColor(255, 255, 255, 5)  # default subtle tint
+
+    def __init__(self, sensor_names=(), parent=None):
+        super().__init__(parent)
+        self._names = []
+        self._rows = {}  # sensor name -> row
+        self._cells = []  # displayed text per row
+        self._alarm = []  # per row: True / False, None before the first reading
+        self._pending = {}
+        for name in sensor_names:
+            self._add_row(name)
+
+    def row_of(self, name):
+        return self._rows.get(name)
+
+    def update(self, name, val, status, ts):
+        """Queue the latest reading of a sensor, applied on the next flush()."""
+        self._pending[name] = (val, status, ts)
+
+    def flush(self):
+        """Apply queued readings, returns the number of sensors updated."""
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+
+        new_names = [name for name in pending if name not in self._rows]
+        if new_names:
+            # Sensors seen for the first time get rows at the bottom
+            self.beginInsertRows(QModelIndex(), len(self._names), len(self._names) + len(new_names) - 1)
+            for name in new_names:
+                self._add_row(name)
+            self.endInsertRows()
+
+        for name, (val, status, ts) in pending.items():
+            row = self._rows[name]
+            alarm = "ALARM" in status
+            self._set_row(row, [name, f"{val:.2f}", ts, "FAULT" if alarm else "OK"], alarm)
+        return len(pending)
+
+    def clear(self):
+        """Blank every row (rows stay, the next readings refill them)."""
+        self._pending = {}
+        for row in range(len(self._names)):
+            self._set_row(row, ["", "", "", ""], None)
+
+    # --- QAbstractTableModel ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._names)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._cells[index.row()][index.column()]
+        if role == Qt.ItemDataRole.BackgroundRole:
+            alarm = self._alarm[index.row()]
+            if alarm is None:
+                return None
+            return self.ALARM_BACKGROUND if alarm else self.NORMAL_BACKGROUND
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    # --- helpers ---
+
+    def _add_row(self, name):
+        self._rows[name] = len(self._names)
+        self._names.append(name)
+        self._cells.append([name, "", "", ""])
+        self._alarm.append(None)
+
+    def _set_row(self, row, texts, alarm):
+        # Emit one dataChanged spanning only the changed columns of this row
+        old = self._cells[row]
+        if alarm != self._alarm[row]:
+            self._alarm[row] = alarm
+            first, last = 0, len(texts) - 1  # background of the whole row
+            roles = [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.BackgroundRole]
+        else:
+            changed = [col for col in range(len(texts)) if texts[col] != old[col]]
+            if not changed:
+                return
+            first, last = changed[0], changed[-1]
+            roles = [Qt.ItemDataRole.DisplayRole]
+        self._cells[row] = texts
+        self.dataChanged.emit(self.index(row, first), self.index(row, last), roles)
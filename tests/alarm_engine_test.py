@@ -0,0 +1,122 @@
+# Unit Tests for the client-side alarm engine
+
+# This file contains automated test cases to verify that
+# AlarmEngine in alarm_engine.py evaluates the configured limits
+# for a whole frame at once, holds alarms within the hysteresis
+# band, debounces short excursions, raises rate-of-change alarms,
+# only reports transitions and gives the same result for a batch
+# of frames checked in one call.
+
+
+import unittest
+import numpy as np
+from alarm_engine import AlarmEngine, STATUS_OK, STATUS_LOW, STATUS_HIGH, STATUS_RATE
+
+
+
+class TestAlarmEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = AlarmEngine({
+            "Temp": {"low": 50.0, "high": 70.0},
+            "Press": {"low": 65.0, "high": 85.0, "hysteresis": 2.0},
+            "Speed": {"low": 40.0, "high": 60.0, "debounce_s": 1.0},
+            "Flow": {},
+        })
+
+
+    def check(self, name, value, now):
+        codes, changed = self.engine.evaluate([self.engine.index[name]], [value], now)
+        return int(codes[0]), len(changed) == 1
+
+
+    # --- 1. LIMIT TESTS ---
+    def test_frame_evaluated_at_once(self):
+        """Verify a whole frame is checked against its limits and unlimited sensors never alarm"""
+        codes, changed = self.engine.evaluate([0, 1, 3], [45.0, 90.0, 1e9], now=0.0)
+
+        self.assertEqual(codes.tolist(), [STATUS_LOW, STATUS_HIGH, STATUS_OK])
+        self.assertEqual(changed.tolist(), [0, 1])
+
+        codes, changed = self.engine.evaluate([0, 1, 3], [44.0, 91.0, 0.0], now=0.5)
+        self.assertEqual(codes.tolist(), [STATUS_LOW, STATUS_HIGH, STATUS_OK])
+        self.assertEqual(changed.tolist(), [])  # still in alarm, no transition
+
+
+    def test_hysteresis(self):
+        """Verify an alarm only clears once the value is back inside the band by the hysteresis"""
+        self.assertEqual(self.check("Press", 86.0, 0.0), (STATUS_HIGH, True))
+        self.assertEqual(self.check("Press", 84.0, 0.5), (STATUS_HIGH, False))  # within 2.0 of the limit
+        self.assertEqual(self.check("Press", 82.5, 1.0), (STATUS_OK, True))
+
+        self.assertEqual(self.check("Temp", 71.0, 0.0), (STATUS_HIGH, True))
+        self.assertEqual(self.check("Temp", 69.9, 0.5), (STATUS_OK, True))  # no band configured
+
+
+    # --- 2. DEBOUNCE TESTS ---
+    def test_debounce(self):
+        """Verify a state is only reported after holding for debounce_s, short excursions are dropped"""
+        self.assertEqual(self.check("Speed", 65.0, 0.0), (STATUS_OK, False))
+        self.assertEqual(self.check("Speed", 50.0, 0.5), (STATUS_OK, False))  # back in band, excursion dropped
+        self.assertEqual(self.check("Speed", 65.0, 1.0), (STATUS_OK, False))
+        self.assertEqual(self.check("Speed", 66.0, 1.5), (STATUS_OK, False))
+        self.assertEqual(self.check("Speed", 67.0, 2.0), (STATUS_HIGH, True))
+
+        # Clearing is debounced too
+        self.assertEqual(self.check("Speed", 50.0, 2.5), (STATUS_HIGH, False))
+        self.assertEqual(self.check("Speed", 50.0, 3.5), (STATUS_OK, True))
+
+
+    # --- 3. RATE OF CHANGE TESTS ---
+    def test_rate_of_change(self):
+        engine = AlarmEngine({"Temp": {"low": 0.0, "high": 100.0, "rate_limit": 10.0}})
+        codes = [engine.evaluate([0], [value], now)[0][0] for value, now in
+                 ((50.0, 0.0), (54.0, 0.5), (62.0, 1.0), (63.0, 1.5))]
+        self.assertEqual(codes, [STATUS_OK, STATUS_OK, STATUS_RATE, STATUS_OK])
+
+
+    def test_defaults_and_block(self):
+        """Verify engine defaults apply to every sensor and a block reports its transitions per sample"""
+        engine = AlarmEngine({"Temp": {"low": 50.0, "high": 70.0}, "Press": {"low": 65.0, "high": 85.0}},
+                             defaults={"hysteresis": 1.0})
+        ids = [0, 1, 0, 1, 0, 1]  # three frames of both sensors, flattened
+        values = [60.0, 90.0, 71.0, 84.5, 68.5, 83.0]
+
+        codes, changed = engine.evaluate_block(ids, values, [0.0, 0.0, 0.5, 0.5, 1.0, 1.0])
+        self.assertEqual(codes.tolist(), [STATUS_OK, STATUS_HIGH, STATUS_HIGH, STATUS_HIGH, STATUS_OK, STATUS_OK])
+        self.assertEqual(changed.tolist(), [1, 2, 4, 5])
+
+        engine.clear()
+        self.assertEqual(engine.state.tolist(), [STATUS_OK, STATUS_OK])
+
+
+    # --- 4. BLOCK TESTS ---
+    def test_block_matches_frame_by_frame(self):
+        """Verify a flattened batch gives the same codes and transitions as one evaluate() per frame"""
+        settings = {
+            "Temp": {"low": 50.0, "high": 70.0, "hysteresis": 3.0},
+            "Press": {"low": 65.0, "high": 85.0, "rate_limit": 20.0},
+            "Flow": {"low": 10.0, "high": 20.0, "hysteresis": 2.0, "rate_limit": 10.0},
+        }
+        rng = np.random.default_rng(4)
+        for debounce in (0.0, 0.5):
+            frames, block = AlarmEngine(settings, {"debounce_s": debounce}), AlarmEngine(settings, {"debounce_s": debounce})
+            for batch in range(20):
+                expected_codes, expected_changed, samples = [], [], []
+                for k in range(8):
+                    now = batch + k * 0.125
+                    ids = np.sort(rng.choice(3, rng.integers(1, 4), replace=False))
+                    values = rng.uniform(0.0, 100.0, len(ids)).round(1)
+                    codes, changed = frames.evaluate(ids, values, now)
+                    expected_changed.extend((changed + len(samples)).tolist())
+                    expected_codes.extend(codes.tolist())
+                    samples.extend((i, v, now) for i, v in zip(ids.tolist(), values.tolist()))
+
+                codes, changed = block.evaluate_block(*zip(*samples))
+                self.assertEqual(codes.tolist(), expected_codes)
+                self.assertEqual(changed.tolist(), expected_changed)
+            self.assertEqual(block.state.tolist(), frames.state.tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
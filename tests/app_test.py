@@ -0,0 +1,69 @@
+# Unit Tests for the Dashboard window
+
+# This file contains automated test cases to verify that
+# Dashboard in app.py resets its sensor and alarm state when
+# switching from the live stream to an offline replay, so alarms
+# still active in the recording are reported again.
+
+
+import unittest
+import os
+import tempfile
+import shutil
+import contextlib
+import io
+import gc
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+from app import Dashboard
+from simulator import load_config
+
+
+
+class TestDashboard(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.directory = tempfile.mkdtemp()
+        config = load_config()
+        config['recorder'] = {**config.get('recorder', {}), "directory": self.directory}
+        self.dashboard = Dashboard(config)
+        self.dashboard.render_scheduler.stop()
+        self.dashboard.stats_timer.stop()
+        self.name, limits = next(iter(config['sensors'].items()))
+        self.high = limits['high'] + 1.0
+
+    def tearDown(self):
+        with contextlib.redirect_stdout(io.StringIO()):  # shutdown message
+            self.dashboard.close()
+        self.dashboard = None
+        gc.collect()  # the mocked replay worker holds the window in a cycle, free it here and not mid-test
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+    def frame(self, value):
+        return [{"name": self.name, "value": value, "timestamp": "12:00:00", "status": "OK"}]
+
+
+    # --- 1. LIVE -> REPLAY TESTS ---
+    def test_replay_reports_alarm_active_live(self):
+        """Verify a sensor in alarm live and in the replay shows up in health and the alarm log again"""
+        self.dashboard.update_dashboard_batch([self.frame(self.high)])
+        self.assertEqual(self.dashboard.health.alarm_count, 1)
+
+        with mock.patch("app.QFileDialog.getOpenFileName", return_value=("session.ndjson", "")), \
+                mock.patch("app.OfflineReplayWorker"):
+            self.dashboard.load_offline_data()
+        self.assertEqual(self.dashboard.health.alarm_count, 0)
+        self.assertEqual(len(self.dashboard.alarm_model), 0)
+
+        self.dashboard.update_dashboard_batch([self.frame(self.high)])
+        self.assertEqual(self.dashboard.health.alarm_count, 1)
+        self.assertEqual(len(self.dashboard.alarm_model), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
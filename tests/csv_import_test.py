@@ -0,0 +1,141 @@
+# Unit Tests for the CSV session import
+
+# This file contains automated test cases to verify that
+# csv_import.py reads wide and long historian CSV layouts in
+# chunks, maps columns onto the configured sensors, skips and
+# counts malformed rows, reads ISO timestamps without an offset as
+# local time and yields the same frame structure as session exports.
+
+
+import unittest
+import os
+import tempfile
+import shutil
+import time
+from csv_import import CsvSessionReader, LAYOUT_WIDE, LAYOUT_LONG
+
+
+
+class TestCsvSessionReader(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.config = {
+            "Temperature": {"low": 50.0, "high": 70.0},
+            "Pressure": {"low": 65.0, "high": 85.0},
+        }
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if hasattr(self, "_tz"):
+            self._set_tz(self._tz)
+
+
+    def _set_tz(self, zone):
+        if not hasattr(self, "_tz"):
+            self._tz = os.environ.get("TZ")
+        if zone is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = zone
+        time.tzset()
+
+
+    def _write(self, text, name="log.csv"):
+        path = os.path.join(self.directory, name)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+
+    # --- 1. LAYOUT TESTS ---
+    def test_wide_layout(self):
+        """Verify one row per frame, columns mapped case-insensitively to config names"""
+        path = self._write("Timestamp,temperature,PRESSURE,Comment\n"
+                           "1000.0,45.5,70,a\n"
+                           "1000.5,60,90.25,b\n")
+        reader = CsvSessionReader(path, self.config)
+        frames = list(reader)
+
+        self.assertEqual(reader.layout, LAYOUT_WIDE)
+        self.assertEqual([f["timestamp_unix"] for f in frames], [1000.0, 1000.5])
+        self.assertEqual(frames[0]["sensors"][0]["name"], "Temperature")
+        self.assertEqual([s["status"] for s in frames[0]["sensors"]], ["LOW ALARM", "OK"])
+        self.assertEqual([s["value"] for s in frames[1]["sensors"]], [60.0, 90.25])
+        self.assertEqual(frames[1]["sensors"][1]["status"], "HIGH ALARM")
+
+
+    def test_long_layout_groups_rows_by_timestamp(self):
+        """Verify consecutive rows with the same timestamp form one frame"""
+        rows = ["name,value,timestamp"]
+        for i in range(50):
+            rows += [f"Temperature,{60 + i % 3},{1000 + i}", f"Pressure,{75},{1000 + i}", f"Unknown,1,{1000 + i}"]
+        path = self._write("\n".join(rows) + "\n")
+
+        reader = CsvSessionReader(path, self.config, chunk_bytes=200)  # frames span chunk boundaries
+        frames = list(reader)
+
+        self.assertEqual(reader.layout, LAYOUT_LONG)
+        self.assertEqual(len(frames), 50)
+        self.assertTrue(all([s["name"] for s in f["sensors"]] == ["Temperature", "Pressure"] for f in frames))
+        self.assertEqual(frames[-1]["timestamp_unix"], 1049.0)
+
+
+    def test_missing_cells_and_units(self):
+        """Verify empty cells are skipped and millisecond / ISO timestamps are converted"""
+        path = self._write("time;Temperature;Pressure\n1700000000000;55;\n1700000000500;;80\n")
+        frames = list(CsvSessionReader(path, self.config))
+        self.assertEqual([f["timestamp_unix"] for f in frames], [1700000000.0, 1700000000.5])
+        self.assertEqual([[s["name"] for s in f["sensors"]] for f in frames], [["Temperature"], ["Pressure"]])
+
+        path = self._write("datetime,Temperature\n1970-01-01T00:16:40Z,55\n1970-01-01T00:16:41+00:00,56\n", "iso.csv")
+        self.assertEqual([f["timestamp_unix"] for f in CsvSessionReader(path, self.config)], [1000.0, 1001.0])
+
+
+    def test_iso_without_offset_is_local_time(self):
+        """Verify naive ISO timestamps are local wall-clock time (DST aware) and shown unchanged"""
+        self._set_tz("CET-1CEST,M3.5.0,M10.5.0/3")
+        path = self._write("datetime,Temperature\n"
+                           "2024-01-15 12:00:00,55\n"       # CET, UTC+1
+                           "2024-07-15T12:00:00,56\n"       # CEST, UTC+2
+                           "2024-07-15T12:00:01Z,57\n")
+        frames = list(CsvSessionReader(path, self.config))
+
+        self.assertEqual([f["timestamp_unix"] for f in frames], [1705316400.0, 1721037600.0, 1721044801.0])
+        self.assertEqual([f["sensors"][0]["timestamp"] for f in frames], ["12:00:00", "12:00:00", "14:00:01"])
+
+
+    def test_malformed_rows_skipped(self):
+        """Verify short rows and unreadable cells in the long layout are skipped and counted, not fatal"""
+        path = self._write("name,value,timestamp\n"
+                           "Temperature,60,1000\n"
+                           "Pressure\n"                     # missing columns
+                           "Pressure,abc,1000\n"            # unreadable value
+                           ",5,1001\n"                      # no name
+                           "Pressure,80,\n"                 # no timestamp
+                           "Temperature,61,1001\n")
+        reader = CsvSessionReader(path, self.config)
+        frames = list(reader)
+
+        self.assertEqual([(f["timestamp_unix"], [s["value"] for s in f["sensors"]]) for f in frames],
+                         [(1000.0, [60.0]), (1001.0, [61.0])])
+        self.assertEqual(reader.skipped_rows, 4)
+        self.assertEqual(reader.build_index()["count"], 2)
+
+
+    def test_unmatched_columns_rejected(self):
+        with self.assertRaises(ValueError):
+            CsvSessionReader(self._write("timestamp,Flow\n1,2\n"), self.config)
+
+
+    # --- 2. INDEX / SEEK TESTS ---
+    def test_index_and_seek(self):
+        path = self._write("timestamp,Temperature\n" + "".join(f"{1000 + i},{60}\n" for i in range(100)))
+        reader = CsvSessionReader(path, self.config, chunk_bytes=128)
+
+        self.assertEqual(reader.build_index(), {"count": 100, "start_time": 1000.0, "end_time": 1099.0})
+        self.assertEqual([f["timestamp_unix"] for f in reader.records(start_time=1095.5)], [1096.0, 1097.0, 1098.0, 1099.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+# Unit Tests for the health aggregator
+
+# This file contains automated test cases to verify that
+# HealthAggregator in health.py tracks which sensors are in alarm,
+# reports new alarms only once, derives the global state from the
+# connection mode and only hands out changes from commit(), and
+# that endpoint_health() splits the state per production line.
+
+
+import unittest
+from health import (HealthAggregator, HEALTH_OFFLINE, HEALTH_DISCONNECTED, HEALTH_OK, HEALTH_ALARM,
+                    HEALTH_REPLAY, MODE_LIVE, MODE_REPLAY, endpoint_health)
+
+
+
+class TestHealthAggregator(unittest.TestCase):
+
+    def setUp(self):
+        self.health = HealthAggregator()
+        self.health.set_mode(MODE_LIVE)
+
+
+    # --- 1. ALARM TRACKING TESTS ---
+    def test_new_alarm_reported_once(self):
+        """Verify update() is True only when a sensor enters alarm"""
+        self.assertTrue(self.health.update("Temp", "HIGH ALARM"))
+        self.assertFalse(self.health.update("Temp", "HIGH ALARM"))
+        self.assertFalse(self.health.update("Temp", "OK"))
+        self.assertTrue(self.health.update("Temp", "LOW ALARM"))
+
+
+    def test_alarm_count(self):
+        self.health.update("Temp", "HIGH ALARM")
+        self.health.update("Press", "LOW ALARM")
+        self.health.update("Flow", "OK")
+        self.health.update("Press", "OK")
+        self.assertEqual(self.health.alarm_count, 1)
+        self.assertEqual(self.health.alarm_sensors, {"Temp"})
+
+
+    # --- 2. STATE TESTS ---
+    def test_state_per_mode(self):
+        """Verify offline / disconnected override alarms, replay and live fall back to their own state"""
+        self.assertEqual(self.health.state(), HEALTH_OK)
+        self.health.update("Temp", "HIGH ALARM")
+        self.assertEqual(self.health.state(), HEALTH_ALARM)
+
+        self.health.set_mode(HEALTH_DISCONNECTED)
+        self.assertEqual(self.health.state(), HEALTH_DISCONNECTED)
+        self.health.set_mode(HEALTH_OFFLINE)
+        self.assertEqual(self.health.state(), HEALTH_OFFLINE)
+
+        self.health.set_mode(MODE_REPLAY)
+        self.assertEqual(self.health.state(), HEALTH_ALARM)
+        self.health.clear()
+        self.assertEqual(self.health.state(), HEALTH_REPLAY)
+
+
+    def test_commit_only_on_change(self):
+        """Verify commit() returns None while neither the state nor the alarm count changed"""
+        self.assertEqual(self.health.commit(), (HEALTH_OK, 0))
+        self.health.update("Temp", "OK")
+        self.assertIsNone(self.health.commit())
+
+        self.health.update("Temp", "HIGH ALARM")
+        self.assertEqual(self.health.commit(), (HEALTH_ALARM, 1))
+        self.health.update("Press", "HIGH ALARM")
+        self.assertEqual(self.health.commit(), (HEALTH_ALARM, 2))
+        self.health.update("Press", "HIGH ALARM")
+        self.assertIsNone(self.health.commit())
+
+
+    # --- 3. PER ENDPOINT TESTS ---
+    def test_endpoint_health(self):
+        """Verify each line gets its own state and alarm count from its namespaced sensors"""
+        self.health.update("line1/Temp", "HIGH ALARM")
+        self.health.update("line1/Press", "LOW ALARM")
+        self.health.update("line3/Temp", "HIGH ALARM")
+        up, down = {"connected": True}, {"connected": False}
+
+        lines = endpoint_health({"line1": up, "line2": up, "line3": down, "line4": None}, self.health.alarm_sensors)
+        self.assertEqual(lines, {"line1": (HEALTH_ALARM, 2), "line2": (HEALTH_OK, 0),
+                                 "line3": (HEALTH_DISCONNECTED, 1), "line4": (HEALTH_OFFLINE, 0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
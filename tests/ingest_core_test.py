@@ -0,0 +1,394 @@
+# Unit Tests for the Qt-independent ingestion core
+
+# This file contains automated test cases to verify that
+# ingest_core.py imports no PyQt, that FrameDecoder handles the
+# JSON and binary protocols, that SensorStore / IngestCore update
+# the sensor state (binary frames read as columns) and feed the
+# sinks, that TcpSource streams frames headless from a local
+# socket, and that MultiSource merges many TCP / WebSocket
+# endpoints into one namespaced stream from a single thread.
+
+
+import unittest
+import asyncio
+import io
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import wire_protocol
+import websockets
+from alarm_engine import AlarmEngine
+from ingest_core import (FrameDecoder, SensorStore, IngestCore, AlarmLogSink, RecorderSink, TcpSource, MultiSource,
+                         endpoints_from_config, sensor_space, group_by_sensor, plot_capacity)
+from latency import LatencyTracker, STAGE_DISPATCH
+from session_recorder import SessionRecorder
+from stream_framer import StreamFramer
+
+
+
+def sensor(name, value, status="OK", **extra):
+    return {"name": name, "value": value, "timestamp": "12:00:00", "status": status, **extra}
+
+
+class ListSink:
+
+    def __init__(self):
+        self.entries = []
+
+    def write(self, entry, update):
+        self.entries.append((entry, update))
+
+
+
+class TestFrameDecoder(unittest.TestCase):
+
+    # --- 1. PROTOCOL TESTS ---
+    def test_json_lines(self):
+        decoder, framer = FrameDecoder(), StreamFramer()
+        self.assertEqual(decoder.hello(), b"")
+
+        framer.feed(b'[{"name": "Temp", "value": 1.0}]\n[{"name": "Temp", "val')
+        self.assertEqual([frame[0]["value"] for frame in decoder.decode(framer)], [1.0])
+        framer.feed(b'ue": 2.0}]\n')
+        self.assertEqual([frame[0]["value"] for frame in decoder.decode(framer)], [2.0])
+
+
+    def test_binary_handshake(self):
+        """Verify the hello reply switches to binary records mapped to the announced names"""
+        logs = []
+        decoder, framer = FrameDecoder(wire_protocol.PROTOCOL_BINARY, logs.append), StreamFramer()
+        self.assertEqual(decoder.hello(), wire_protocol.hello_line(wire_protocol.PROTOCOL_BINARY))
+
+        records = wire_protocol.payload_to_records([sensor("Press", 3.5)], {"Temp": 0, "Press": 1})
+        framer.feed(wire_protocol.hello_reply(["Temp", "Press"]) + wire_protocol.encode_binary_frame(records, seq=4))
+        frames = list(decoder.decode(framer))
+
+        self.assertEqual(decoder.protocol, wire_protocol.PROTOCOL_BINARY)
+        self.assertEqual((frames[0][0]["name"], frames[0][0]["value"], frames[0].seq), ("Press", 3.5, 4))
+        self.assertEqual(logs, ["Binary wire protocol negotiated."])
+
+
+    def test_binary_falls_back_to_json(self):
+        decoder, framer = FrameDecoder(wire_protocol.PROTOCOL_BINARY), StreamFramer()
+        decoder.hello()
+        framer.feed(b'[{"name": "Temp", "value": 1.0}]\n[{"name": "Temp", "value": 2.0}]\n')
+
+        self.assertEqual(len(list(decoder.decode(framer))), 2)
+        self.assertEqual(decoder.protocol, wire_protocol.PROTOCOL_JSON)
+
+
+
+class TestEndpoints(unittest.TestCase):
+
+    CONNECTION = {"host": "127.0.0.1", "tcp_port": 5555, "ws_port": 8080, "protocol": "json"}
+
+    # --- 1. CONFIG TESTS ---
+    def test_endpoints_inherit_connection(self):
+        """Verify endpoints get default names and types and override the shared settings"""
+        endpoints = endpoints_from_config({**self.CONNECTION, "endpoints": [
+            {"tcp_port": 6001}, {"name": "press", "type": "ws"}, {"tcp_port": 6003, "protocol": "binary"}]})
+
+        self.assertEqual([e["name"] for e in endpoints], ["line1", "press", "line3"])
+        self.assertEqual((endpoints[0]["type"], endpoints[0]["tcp_port"], endpoints[0]["protocol"]), ("tcp", 6001, "json"))
+        self.assertEqual(endpoints[1]["url"], "ws://127.0.0.1:8080")
+        self.assertEqual(endpoints[2]["protocol"], "binary")
+        self.assertNotIn("endpoints", endpoints[0])
+        self.assertEqual(endpoints_from_config(self.CONNECTION), [])
+
+
+    def test_invalid_endpoints(self):
+        for endpoints in ([{"name": "a"}, {"name": "a"}], [{"name": "a/b"}], [{"type": "udp"}]):
+            with self.assertRaises(ValueError):
+                endpoints_from_config({**self.CONNECTION, "endpoints": endpoints})
+
+
+    def test_sensor_space_is_namespaced(self):
+        """Verify every line gets its sensors (all by default) and plots group them by sensor"""
+        config = {"sensors": {"Temp": {"low": 0}, "Press": {"low": 1}},
+                  "connection": {**self.CONNECTION, "endpoints": [{"name": "a"}, {"name": "b", "sensors": ["Press"]}]}}
+        space = sensor_space(config)
+
+        self.assertEqual(list(space), ["a/Temp", "a/Press", "b/Press"])
+        self.assertEqual(space["b/Press"], {"low": 1})
+        self.assertEqual(group_by_sensor(space), {"Temp": ["a/Temp"], "Press": ["a/Press", "b/Press"]})
+        self.assertEqual(sensor_space({**config, "connection": self.CONNECTION}), config["sensors"])
+
+
+    # --- 2. NAMESPACE TESTS ---
+    def test_namespaced_decoding(self):
+        """Verify JSON and binary frames come out with the endpoint prefix"""
+        decoder, framer = FrameDecoder(namespace="line2"), StreamFramer()
+        decoder.hello()
+        framer.feed(b'[{"name": "Temp", "value": 1.0}]\n')
+        self.assertEqual(next(decoder.decode(framer))[0]["name"], "line2/Temp")
+
+        decoder, framer = FrameDecoder(wire_protocol.PROTOCOL_BINARY, namespace="line2"), StreamFramer()
+        decoder.hello()
+        records = wire_protocol.payload_to_records([sensor("Press", 3.5)], {"Temp": 0, "Press": 1})
+        framer.feed(wire_protocol.hello_reply(["Temp", "Press"]) + wire_protocol.encode_binary_frame(records))
+        self.assertEqual(next(decoder.decode(framer))[0]["name"], "line2/Press")
+
+
+    def test_store_and_latency_per_line(self):
+        """Verify namespaced readings fill their own buffers and are dispatched on their own stream"""
+        latency = LatencyTracker()
+        core = IngestCore(SensorStore(["a/Temp", "b/Temp"], plot_capacity=16, start_time=0.0), latency=latency)
+        latency.received(0, 0, 0, 0, "b")
+        core.process(wire_protocol.SensorFrame([sensor("b/Temp", 20.0)], seq=0, sent_ns=0), now=1.0)
+
+        self.assertEqual(list(core.store.latest), ["b/Temp"])
+        self.assertEqual(latency.stats()["stages"][STAGE_DISPATCH]["count"], 1)
+
+
+
+class TestIngestCore(unittest.TestCase):
+
+    def setUp(self):
+        limits = {"Temp": {"low": 0.0, "high": 50.0}, "Press": {"low": 0.0, "high": 100.0}}
+        self.store = SensorStore(limits, plot_capacity=16, start_time=1000.0, alarms=AlarmEngine(limits))
+        self.sink = ListSink()
+        self.latency = LatencyTracker()
+        self.core = IngestCore(self.store, [self.sink], self.latency)
+
+
+    # --- 1. STATE TESTS ---
+    def test_state_updates(self):
+        """Verify buffers, rollups and the latest reading follow the configured sensors only"""
+        update = self.core.process([sensor("Temp", 20.0), sensor("Flow", 5.0)], now=1002.5)
+
+        self.assertEqual(update.time, 2.5)
+        self.assertEqual(update.readings, [("Temp", 20.0, "OK", "12:00:00")])
+        self.assertEqual(len(self.store.buffers["Temp"]), 1)
+        self.assertEqual(self.store.latest, {"Temp": (20.0, "OK", "12:00:00")})
+        self.assertEqual(self.store.rollups.names(), ["Temp"])
+        self.assertEqual((self.core.frames, self.core.samples), (1, 1))
+
+
+    def test_alarm_transitions_only(self):
+        """Verify statuses come from the configured limits and only transitions are reported"""
+        first = self.core.process([sensor("Temp", 99.0, "OK")], now=1001.0)
+        second = self.core.process([sensor("Temp", 98.0, "HIGH ALARM")], now=1002.0)
+        back = self.core.process([sensor("Temp", 20.0, "HIGH ALARM")], now=1003.0)
+        third = self.core.process([sensor("Temp", 99.0)], now=1004.0)
+
+        self.assertEqual(first.raised, [("Temp", 99.0, "HIGH ALARM")])
+        self.assertEqual(first.alarms, [("12:00:00", "Temp", 99.0, "HIGH ALARM")])
+        self.assertEqual((second.alarms, second.raised), ([], []))
+        self.assertEqual((back.readings[0][2], back.cleared), ("OK", [("Temp", 20.0)]))
+        self.assertEqual(len(third.raised), 1)
+
+        self.store.clear()
+        self.assertEqual(self.store.health.alarm_count, 0)
+        self.assertEqual(self.store.alarms.state.tolist(), [0, 0])
+        self.assertEqual(len(self.store.buffers["Temp"]), 0)
+
+
+    def test_binary_frame_read_as_columns(self):
+        """Verify a binary frame updates the store like its JSON form without building sensor dicts"""
+        records = wire_protocol.payload_to_records([sensor("Temp", 20.0), sensor("Press", 120.0)],
+                                                   {"Temp": 0, "Press": 1}, timestamp_ns=1001 * 10**9)
+        frame = wire_protocol.RecordFrame(records, ["Temp", "Press"], seq=7, sent_ns=0)
+        self.latency.received(7, 0, 0, 0)
+        update = self.core.process(frame, now=1001.0)
+
+        clock = time.strftime("%H:%M:%S", time.localtime(1001))
+        self.assertEqual(update.readings, [("Temp", 20.0, "OK", clock), ("Press", 120.0, "HIGH ALARM", clock)])
+        self.assertEqual(self.latency.stats()["stages"][STAGE_DISPATCH]["count"], 1)
+        self.assertIsNone(frame._sensors)  # no dicts on the ingest path
+
+        # The archive gets the JSON layout, expanded on the recorder's writer thread
+        directory = tempfile.mkdtemp()
+        recorder = SessionRecorder(directory)
+        try:
+            RecorderSink(recorder).write({"timestamp_unix": 1001.0, "sensors": frame}, update)
+            entry = next(recorder.iter_records())
+            self.assertEqual([(s["name"], s["value"], s["status"]) for s in entry["sensors"]],
+                             [("Temp", 20.0, "OK"), ("Press", 120.0, "OK")])  # as sent, no frame stamps
+        finally:
+            recorder.close()
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+    def test_long_window_from_rollups(self):
+        """Verify a window older than the raw ring is drawn from the rollup min / max"""
+        for i in range(40):
+            self.core.process([sensor("Temp", float(i % 4))], now=1000.0 + i)
+
+        times, values = self.store.window("Temp", 30.0, 39.0)  # still in the 16-sample ring
+        self.assertEqual(times.tolist(), [float(t) for t in range(30, 40)])
+
+        times, values = self.store.window("Temp", 0.0, 39.0)  # 1 s buckets, min then max at their centers
+        self.assertEqual(len(times), 80)
+        self.assertEqual((times[0], times[1], values[0], values[1]), (0.5, 0.5, 0.0, 0.0))
+
+        config = {"connection": {"update_interval": 0.05}, "dashboard": {"plot_raw_seconds": 60}}
+        self.assertEqual(plot_capacity(config), 2400)  # 60 s at 20 Hz, 2x headroom
+        self.assertEqual(plot_capacity({**config, "dashboard": {"plot_capacity": 500}}), 500)
+
+
+    def test_batch_alarms_on_send_times(self):
+        """Verify a batch is evaluated at once, rates on the frames' send times rather than arrival"""
+        limits = {"Temp": {"low": 0.0, "high": 50.0, "rate_limit": 10.0}}
+        core = IngestCore(SensorStore(limits, plot_capacity=16, start_time=0.0, alarms=AlarmEngine(limits)))
+        batch = [wire_protocol.SensorFrame([sensor("Temp", 20.0 + 5 * i)], seq=i, sent_ns=i * 10**9) for i in range(4)]
+        batch.append(wire_protocol.SensorFrame([sensor("Temp", 60.0)], seq=4, sent_ns=4 * 10**9))
+
+        updates = core.process_batch(batch, now=10.0)  # all arrive together
+        self.assertEqual([u.readings[0][2] for u in updates], ["OK", "OK", "OK", "OK", "HIGH ALARM"])
+        self.assertEqual([len(u.alarms) for u in updates], [0, 0, 0, 0, 1])
+        self.assertEqual((core.frames, core.samples), (5, 5))
+
+
+    def test_batch_placed_at_frame_times(self):
+        """Verify each frame of a batch is plotted and rolled up at its own recorded / send time"""
+        batch = [wire_protocol.SensorFrame([sensor("Temp", 20.0 + i)], timestamp_unix=1010.0 + i) for i in range(3)]
+        batch.append(wire_protocol.SensorFrame([sensor("Temp", 30.0)], seq=0, sent_ns=1020 * 10**9))
+        batch.append([sensor("Temp", 40.0)])  # no time of its own: arrival
+
+        updates = self.core.process_batch(batch, now=1030.0)
+        self.assertEqual([u.time for u in updates], [10.0, 11.0, 12.0, 20.0, 30.0])
+        self.assertEqual(self.store.buffers["Temp"].view()[0].tolist(), [10.0, 11.0, 12.0, 20.0, 30.0])
+
+        _, buckets = self.store.rollups.query("Temp", 1000.0, 1040.0)
+        self.assertEqual(buckets["start"].tolist(), [1010.0, 1011.0, 1012.0, 1020.0, 1030.0])
+
+
+    # --- 2. SINK TESTS ---
+    def test_sinks_get_archive_entries(self):
+        frame = wire_protocol.SensorFrame([sensor("Temp", 20.0)], seq=0, sent_ns=0)
+        self.latency.received(0, 0, 0, 0)
+        self.core.process(frame, now=1001.0)
+
+        entry, update = self.sink.entries[0]
+        self.assertEqual(entry, {"timestamp_unix": 1001.0, "sensors": frame})
+        self.assertEqual(update.readings[0][0], "Temp")
+        self.assertEqual(self.latency.stats()["stages"][STAGE_DISPATCH]["count"], 1)
+
+
+    def test_alarm_log_sink(self):
+        stream = io.StringIO()
+        self.core.sinks.append(AlarmLogSink(stream))
+        self.core.process([sensor("Press", 120.0)])
+        self.core.process([sensor("Press", 50.0)])
+        self.assertIn("HIGH ALARM: Press = 120.0", stream.getvalue())
+        self.assertIn("CLEARED: Press = 50.0", stream.getvalue())
+
+
+
+class TestHeadless(unittest.TestCase):
+
+    # --- 1. NO QT TESTS ---
+    def test_core_imports_no_qt(self):
+        """Verify the core and the headless collector run without PyQt"""
+        code = "import sys, ingest_core, collector; sys.exit(any(m.startswith('PyQt') for m in sys.modules))"
+        self.assertEqual(subprocess.run([sys.executable, "-c", code], timeout=60).returncode, 0)
+
+
+    # --- 2. TRANSPORT TESTS ---
+    def test_tcp_source_streams_frames(self):
+        """Verify TcpSource delivers batches in a plain thread, no event loop involved"""
+        listener = socket.create_server(("127.0.0.1", 0))
+        connection = {"host": "127.0.0.1", "tcp_port": listener.getsockname()[1], "protocol": "json",
+                      "batch_interval_ms": 10, "reconnect_initial_s": 0.05}
+        delivered = threading.Event()
+
+        def simulator():
+            client, _ = listener.accept()
+            client.sendall(b''.join(b'[{"name": "Temp", "value": %d, "timestamp": "", "status": "OK"}]\n' % i
+                                    for i in range(5)))
+            delivered.wait(5)
+            client.close()
+
+        threading.Thread(target=simulator, daemon=True).start()
+        frames = []
+
+        def on_batch(batch):
+            frames.extend(batch)
+            if len(frames) >= 5:
+                delivered.set()
+                source.stop()
+
+        source = TcpSource(connection, on_batch)
+        thread = threading.Thread(target=source.run)
+        thread.start()
+        thread.join(5)
+        listener.close()
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual([frame[0]["value"] for frame in frames], list(range(5)))
+
+
+    def test_multi_source_one_thread(self):
+        """Verify 20 TCP lines and a WebSocket line stream through one thread, namespaced per line"""
+        lines, frames_per_line = 20, 3
+        frame = lambda i: b'[{"name": "Temp", "value": %d, "timestamp": "", "status": "OK"}]' % i
+        listeners = [socket.create_server(("127.0.0.1", 0)) for _ in range(lines)]
+        done = threading.Event()
+
+        def simulator(listener):
+            client, _ = listener.accept()
+            client.sendall(b''.join(frame(i) + b'\n' for i in range(frames_per_line)))
+            done.wait(10)
+            client.close()
+
+        async def websocket_simulator(websocket):
+            for i in range(frames_per_line):
+                await websocket.send(frame(i).decode())
+            await websocket.wait_closed()
+
+        async def serve_websocket():
+            async with websockets.serve(websocket_simulator, "127.0.0.1", 0) as server:
+                ws_port.append(server.sockets[0].getsockname()[1])
+                stopped = asyncio.get_running_loop().run_in_executor(None, done.wait, 10)
+                started.set()
+                await stopped
+
+        ws_port, started = [], threading.Event()
+        ws_thread = threading.Thread(target=asyncio.run, args=(serve_websocket(),), daemon=True)
+        ws_thread.start()
+        started.wait(5)
+        for listener in listeners:
+            threading.Thread(target=simulator, args=(listener,), daemon=True).start()
+        threads_before = threading.active_count()
+
+        endpoints = endpoints_from_config({
+            "host": "127.0.0.1", "protocol": "json", "batch_interval_ms": 10, "reconnect_initial_s": 0.05,
+            "endpoints": [{"tcp_port": listener.getsockname()[1]} for listener in listeners]
+                         + [{"name": "ws", "type": "ws", "url": f"ws://127.0.0.1:{ws_port[0]}"}]})
+        frames, connected, peak_threads = [], set(), []
+
+        def on_batch(batch):
+            frames.extend(batch)
+            peak_threads.append(threading.active_count())
+            if len(frames) >= (lines + 1) * frames_per_line:
+                source.stop()
+
+        def on_connection(stats):
+            if stats["connected"]:
+                connected.add(stats["endpoint"])
+
+        source = MultiSource(endpoints, on_batch, on_connection=on_connection)
+        thread = threading.Thread(target=source.run)
+        thread.start()
+        thread.join(10)
+        done.set()
+        ws_thread.join(5)
+        for listener in listeners:
+            listener.close()
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(connected, {f"line{i + 1}" for i in range(lines)} | {"ws"})
+        names = {sensor_list[0]["name"] for sensor_list in frames}
+        self.assertEqual(names, {f"line{i + 1}/Temp" for i in range(lines)} | {"ws/Temp"})
+        self.assertEqual(sorted(s[0]["value"] for s in frames if s[0]["name"] == "line7/Temp"), [0, 1, 2])
+        # only the source thread itself, not one thread per line
+        self.assertEqual(max(peak_threads), threads_before + 1)
+        self.assertTrue(all(not stats["connected"] for stats in source.stats().values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
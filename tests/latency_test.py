@@ -0,0 +1,129 @@
+# Unit Tests for the latency instrumentation
+
+# This file contains automated test cases to verify that
+# LogHistogram in latency.py reports percentiles within a bucket
+# width and that LatencyTracker splits each frame into pipeline
+# stages and counts lost and out-of-order sequence numbers.
+
+
+import unittest
+from latency import LogHistogram, LatencyTracker, STAGE_NETWORK, STAGE_DECODE, STAGE_DISPATCH, STAGE_RENDER, STAGE_TOTAL
+
+
+
+class FakeClock:
+
+    def __init__(self, ns=0):
+        self.ns = ns
+
+    def __call__(self):
+        return self.ns
+
+
+
+class TestLogHistogram(unittest.TestCase):
+
+    # --- 1. PERCENTILE TESTS ---
+    def test_percentiles_within_bucket_width(self):
+        """Verify p50 / p99 of 1..1000 ms land within one bucket (~9%) of the exact value"""
+        histogram = LogHistogram()
+        for ms in range(1, 1001):
+            histogram.add(ms / 1000.0)
+
+        for p, exact in ((50, 0.5), (99, 0.99)):
+            value = histogram.percentile(p)
+            self.assertGreaterEqual(value, exact)
+            self.assertLess(value, exact * 1.1)
+
+
+    def test_empty_and_out_of_range(self):
+        histogram = LogHistogram(max_value=1.0)
+        self.assertIsNone(histogram.percentile(50))
+
+        histogram.add(0.0)
+        histogram.add(1e6)  # clamped into the last bucket
+        self.assertEqual(histogram.count, 2)
+        self.assertGreater(histogram.percentile(100), 1.0)
+
+        histogram.clear()
+        self.assertIsNone(histogram.percentile(50))
+
+
+
+class TestLatencyTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.tracker = LatencyTracker(clock_ns=self.clock)
+
+
+    def _p50(self, stage):
+        return self.tracker.stats()["stages"][stage]["p50_ms"]
+
+
+    # --- 1. STAGE TESTS ---
+    def test_stages(self):
+        """Verify one frame is split into network, decode, dispatch, render and total"""
+        ms = 1_000_000
+        self.tracker.received(0, sent_ns=0, recv_ns=2 * ms, decoded_ns=3 * ms)
+        self.clock.ns = 13 * ms
+        self.tracker.dispatched(0)
+        self.clock.ns = 29 * ms
+        self.tracker.rendered()
+
+        for stage, expected in ((STAGE_NETWORK, 2), (STAGE_DECODE, 1), (STAGE_DISPATCH, 10),
+                                (STAGE_RENDER, 16), (STAGE_TOTAL, 29)):
+            self.assertGreaterEqual(self._p50(stage), expected)
+            self.assertLess(self._p50(stage), expected * 1.1)
+
+
+    def test_unknown_frames_ignored(self):
+        """Verify replayed frames (no pending seq) and idle render frames record nothing"""
+        self.tracker.dispatched(42)
+        self.tracker.rendered()
+        stats = self.tracker.stats()
+        self.assertEqual(stats["stages"][STAGE_DISPATCH]["count"], 0)
+        self.assertEqual(stats["stages"][STAGE_TOTAL]["count"], 0)
+
+
+    # --- 2. SEQUENCE TESTS ---
+    def test_lost_and_out_of_order(self):
+        for seq in (0, 1, 4, 2, 5):
+            self.tracker.received(seq, 0, 0, 0)
+        stats = self.tracker.stats()
+        self.assertEqual(stats["frames"], 5)
+        self.assertEqual(stats["lost"], 1)  # 3 never arrived, 2 came late
+        self.assertEqual(stats["out_of_order"], 1)
+
+
+    def test_new_stream_restarts_sequence(self):
+        """Verify a reconnect starting again at seq 0 is not counted as out of order"""
+        for seq in (0, 1, 2):
+            self.tracker.received(seq, 0, 0, 0)
+        self.tracker.new_stream()
+        self.tracker.received(0, 0, 0, 0)
+
+        stats = self.tracker.stats()
+        self.assertEqual((stats["lost"], stats["out_of_order"]), (0, 0))
+
+        self.tracker.clear()
+        self.assertEqual(self.tracker.stats()["frames"], 0)
+
+
+    def test_streams_numbered_independently(self):
+        """Verify interleaved frames of two endpoints, each counting from 0, are not lost or out of order"""
+        for seq in (0, 1, 2):
+            self.tracker.received(seq, 0, 0, 0, "line1")
+            self.tracker.received(seq, 0, 0, 0, "line2")
+            self.tracker.dispatched(seq, "line2")
+        self.tracker.received(5, 0, 0, 0, "line1")
+        self.tracker.new_stream("line2")
+        self.tracker.received(0, 0, 0, 0, "line2")
+
+        stats = self.tracker.stats()
+        self.assertEqual((stats["lost"], stats["out_of_order"]), (2, 0))
+        self.assertEqual(stats["stages"][STAGE_DISPATCH]["count"], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+# Unit Tests for the plot level-of-detail reduction
+
+# This file contains automated test cases to verify that
+# decimate_minmax in lod.py bounds the number of plotted points
+# by the column count, keeps spikes and preserves time order.
+
+
+import unittest
+import numpy as np
+from lod import decimate_minmax
+
+
+
+class TestDecimateMinMax(unittest.TestCase):
+
+    # --- 1. BOUNDS TESTS ---
+    def test_short_input_unchanged(self):
+        times, values = np.arange(10.0), np.arange(10.0)
+        out_times, out_values = decimate_minmax(times, values, 5)
+        self.assertIs(out_times, times)
+        self.assertIs(out_values, values)
+
+
+    def test_points_bounded_by_columns(self):
+        """Verify the output size depends on the column count, not the input length"""
+        for n in (1_001, 100_000, 1_000_003):
+            times = np.arange(n, dtype=np.float64)
+            values = np.random.default_rng(n).normal(size=n).astype(np.float32)
+            out_times, _ = decimate_minmax(times, values, 250)
+            self.assertLessEqual(len(out_times), 502)
+
+
+    # --- 2. SHAPE TESTS ---
+    def test_spikes_survive(self):
+        """Verify single-sample spikes in either direction are kept"""
+        values = np.zeros(100_000, dtype=np.float32)
+        values[12_345], values[67_890] = 500.0, -200.0
+        times = np.arange(len(values), dtype=np.float64)
+
+        out_times, out_values = decimate_minmax(times, values, 300)
+        self.assertEqual(out_values.max(), 500.0)
+        self.assertEqual(out_values.min(), -200.0)
+        self.assertIn(12_345.0, out_times)
+
+
+    def test_time_order_preserved(self):
+        """Verify each column's min and max come out in sample order"""
+        times = np.arange(1_000, dtype=np.float64)
+        values = np.sin(times / 30.0)
+        out_times, out_values = decimate_minmax(times, values, 40)
+
+        self.assertTrue(np.all(np.diff(out_times) >= 0))
+        np.testing.assert_array_equal(out_values, values[out_times.astype(int)])
+        self.assertEqual((out_times[0], out_times[-1]), (0.0, 999.0))  # line ends at the newest sample
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+# Unit Tests for the maintenance log console
+
+# This file contains automated test cases to verify that
+# LogConsole in log_console.py writes queued messages on flush,
+# collapses repeated messages into one line, rate limits
+# heartbeat messages and keeps a bounded number of lines.
+
+
+import unittest
+from PyQt6.QtWidgets import QApplication
+from log_console import LogConsole
+
+
+
+class TestLogConsole(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QApplication.instance() or QApplication([])
+        self.console = LogConsole(max_blocks=50, rate_limits={"Stream Heartbeat": 60.0})
+
+
+    def _lines(self):
+        return [line.split(" > ", 1)[1] for line in self.console.toPlainText().splitlines()]
+
+
+    # --- 1. BATCHING TESTS ---
+    def test_messages_written_on_flush(self):
+        """Verify queued messages reach the document only on flush, in order"""
+        self.console.log("first", now=0)
+        self.console.log("second", now=1)
+        self.assertEqual(self.console.toPlainText(), "")
+
+        self.assertEqual(self.console.flush(), 2)
+        self.assertEqual(self._lines(), ["first", "second"])
+        self.assertEqual(self.console.flush(), 0)
+
+
+    def test_repeats_collapse(self):
+        """Verify identical consecutive messages fold into one line, also across flushes"""
+        for i in range(3):
+            self.console.log("Data Error: bad frame", now=i)
+        self.console.flush()
+        self.assertEqual(self._lines(), ["Data Error: bad frame  (x3)"])
+
+        self.console.log("Data Error: bad frame", now=3)
+        self.console.log("Connected.", now=4)
+        self.assertEqual(self.console.flush(), 2)
+        self.assertEqual(self._lines(), ["Data Error: bad frame  (x4)", "Connected."])
+
+
+    # --- 2. BOUNDS TESTS ---
+    def test_heartbeat_rate_limited(self):
+        """Verify an interleaved heartbeat is logged at most once per interval"""
+        for i in range(10):
+            self.console.log("Stream Heartbeat: Waiting for data...", now=i * 5.0)
+            self.console.log(f"event {i}", now=i * 5.0)
+        self.console.flush()
+
+        self.assertEqual(self._lines().count("Stream Heartbeat: Waiting for data..."), 1)
+        self.assertEqual(self.console.suppressed, 9)
+
+
+    def test_line_count_bounded(self):
+        for i in range(500):
+            self.console.log(f"event {i}")
+            if i % 100 == 0:
+                self.console.flush()
+        self.console.flush()
+
+        self.assertEqual(self.console.document().blockCount(), 50)
+        self.assertEqual(self._lines()[-1], "event 499")
+
+
+    def test_clear(self):
+        self.console.log("event", now=0)
+        self.console.flush()
+        self.console.log("event", now=1)
+        self.console.clear()
+        self.console.log("event", now=2)
+        self.console.flush()
+        self.assertEqual(self._lines(), ["event"])
+
+
+if __name__ == '__main__':
+    unittest.main()
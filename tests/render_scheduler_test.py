@@ -0,0 +1,58 @@
+# Unit Tests for the RenderScheduler
+# This file contains automated test cases to verify that the
+# render loop in render_scheduler.py coalesces packets into
+# frames and honours the max FPS setting.
+
+
+
+import unittest
+from PyQt6.QtTest import QTest
+from PyQt6.QtCore import QCoreApplication
+from render_scheduler import RenderScheduler
+
+
+
+class TestRenderScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.frames = []
+        self.scheduler = RenderScheduler(lambda: self.frames.append(1), max_fps=50)
+
+
+    # --- 1. COALESCING TESTS ---
+    def test_packets_coalesced_into_one_frame(self):
+        """Verify many packets between two ticks produce a single render"""
+        for _ in range(5):
+            self.scheduler.mark_dirty()
+
+        self.scheduler.render_now()
+        self.scheduler.render_now()  # nothing new -> no second frame
+
+        self.assertEqual(len(self.frames), 1)
+        self.assertEqual(self.scheduler.frames_rendered, 1)
+        self.assertEqual(self.scheduler.packets_coalesced, 4)
+
+
+    # --- 2. TIMER TESTS ---
+    def test_timer_renders_dirty_state(self):
+        """Verify the QTimer repaints pending data without an explicit flush"""
+        self.scheduler.start()
+        self.scheduler.mark_dirty()
+        QTest.qWait(200)
+        self.scheduler.stop()
+
+        self.assertEqual(len(self.frames), 1)
+
+
+    def test_max_fps_setting(self):
+        """Verify the frame cap is clamped and exposed in stats"""
+        self.scheduler.set_max_fps(0)
+        self.assertEqual(self.scheduler.stats()['max_fps'], 1)
+
+        self.scheduler.set_max_fps(60)
+        self.assertEqual(self.scheduler.stats()['max_fps'], 60)
+
+
+if __name__ == '__main__':
+    unittest.main()
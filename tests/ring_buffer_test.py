@@ -0,0 +1,93 @@
+# Unit Tests for the plot history RingBuffer
+
+# This file contains automated test cases to verify the
+# RingBuffer class in ring_buffer.py: ordering, wrap-around,
+# time-window slicing and the zero-copy view guarantee.
+
+
+import unittest
+import numpy as np
+from ring_buffer import RingBuffer
+
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    # --- 1. APPEND / ORDER TESTS ---
+    def test_append_keeps_insertion_order(self):
+        """Verify samples come back oldest first before the buffer is full"""
+        buf = RingBuffer(5)
+        for i in range(3):
+            buf.append(float(i), i * 10)
+
+        times, values = buf.view()
+        self.assertEqual(len(buf), 3)
+        np.testing.assert_array_equal(times, [0.0, 1.0, 2.0])
+        np.testing.assert_array_equal(values, [0.0, 10.0, 20.0])
+        self.assertEqual(times.dtype, np.float64)
+        self.assertEqual(values.dtype, np.float32)
+
+
+    def test_wrap_around_drops_oldest(self):
+        """Verify the oldest samples are overwritten once capacity is reached"""
+        buf = RingBuffer(4)
+        for i in range(10):
+            buf.append(float(i), i)
+
+        times, values = buf.view()
+        self.assertEqual(len(buf), 4)
+        np.testing.assert_array_equal(times, [6.0, 7.0, 8.0, 9.0])
+        np.testing.assert_array_equal(values, [6.0, 7.0, 8.0, 9.0])
+
+
+    def test_extend_matches_append(self):
+        """Verify block appends produce the same contents as single appends"""
+        a, b = RingBuffer(7), RingBuffer(7)
+        for i in range(12):
+            a.append(float(i), i)
+        b.extend(np.arange(5, dtype=float), np.arange(5))
+        b.extend(np.arange(5, 12, dtype=float), np.arange(5, 12))
+
+        np.testing.assert_array_equal(a.view()[0], b.view()[0])
+        np.testing.assert_array_equal(a.view()[1], b.view()[1])
+
+
+    # --- 2. WINDOW / VIEW TESTS ---
+    def test_window_slices_by_time(self):
+        """Verify window() returns only samples newer than the cut-off"""
+        buf = RingBuffer(100)
+        for i in range(50):
+            buf.append(i * 0.5, i)
+
+        times, values = buf.window(20.0)
+        self.assertEqual(times[0], 20.0)
+        self.assertEqual(len(times), len(values))
+        self.assertEqual(times[-1], 24.5)
+
+        times, values = buf.window(20.0, until=21.0)
+        self.assertEqual(list(times), [20.0, 20.5, 21.0])
+
+
+    def test_views_are_zero_copy(self):
+        """Verify returned arrays are contiguous views of the backing storage"""
+        buf = RingBuffer(8)
+        for i in range(13):
+            buf.append(float(i), i)
+
+        times, values = buf.view()
+        self.assertTrue(times.flags['C_CONTIGUOUS'])
+        self.assertFalse(times.flags['OWNDATA'])
+        self.assertFalse(values.flags['OWNDATA'])
+
+
+    def test_clear(self):
+        buf = RingBuffer(3)
+        buf.append(1.0, 1.0)
+        buf.clear()
+
+        self.assertEqual(len(buf), 0)
+        self.assertEqual(len(buf.view()[0]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
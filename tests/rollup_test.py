@@ -0,0 +1,77 @@
+# Unit Tests for the rollup store
+
+# This file contains automated test cases to verify that
+# RollupStore in rollup.py aggregates readings into min/max/mean
+# buckets at every level, folds closed buckets into the coarser
+# levels, stays bounded and picks the level matching a trend span.
+
+
+import unittest
+import numpy as np
+from rollup import RollupStore, bucket_means
+
+
+
+class TestRollupStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = RollupStore(levels=((1.0, 100), (10.0, 100), (100.0, 100)))
+
+
+    def _feed(self, seconds, rate=4, start=1000.0):
+        # `rate` readings per second, value = elapsed seconds
+        for i in range(int(seconds * rate)):
+            self.store.add("Temp", start + i / rate, i / rate)
+
+
+    # --- 1. AGGREGATION TESTS ---
+    def test_fine_buckets(self):
+        """Verify min / max / mean / count of closed and partially filled 1 s buckets"""
+        self._feed(3)
+        resolution, buckets = self.store.query("Temp", 1000.0, max_points=10)
+
+        self.assertEqual(resolution, 1.0)
+        self.assertEqual(list(buckets["start"]), [1000.0, 1001.0, 1002.0])
+        self.assertEqual(list(buckets["count"]), [4, 4, 4])
+        self.assertEqual((buckets["min"][1], buckets["max"][1]), (1.0, 1.75))
+        self.assertAlmostEqual(bucket_means(buckets)[2], 2.375)
+
+
+    def test_coarse_levels_include_open_buckets(self):
+        """Verify a coarse query sums up closed coarse buckets and every finer bucket not folded yet"""
+        self._feed(250)
+        resolution, buckets = self.store.query("Temp", 1000.0, max_points=5)
+
+        self.assertEqual(resolution, 100.0)
+        self.assertEqual(list(buckets["start"]), [1000.0, 1100.0, 1200.0])
+        self.assertEqual(int(buckets["count"].sum()), 1000)
+        self.assertEqual((buckets["min"][2], buckets["max"][2]), (200.0, 249.75))
+
+
+    # --- 2. LEVEL SELECTION / BOUNDS TESTS ---
+    def test_level_picked_by_span(self):
+        self._feed(500)
+        self.assertEqual(self.store.query("Temp", 1450.0, max_points=60)[0], 1.0)
+        self.assertEqual(self.store.query("Temp", 1300.0, max_points=60)[0], 10.0)
+
+        # 1 s ring only holds 100 s, an older start falls back to a coarser level
+        self.assertEqual(self.store.query("Temp", 1300.0, max_points=1000)[0], 10.0)
+
+
+    def test_memory_bounded(self):
+        self._feed(5000, rate=1)
+        level = self.store._sensors["Temp"][0]
+        self.assertEqual(level.size, 100)
+        self.assertEqual(len(level.ring), 100)
+        self.assertTrue(np.all(np.diff(level.closed()["start"]) == 1.0))
+
+
+    def test_unknown_sensor_and_clear(self):
+        self.assertEqual(len(self.store.query("Flow", 0.0)[1]), 0)
+        self._feed(2)
+        self.store.clear()
+        self.assertEqual(self.store.names(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
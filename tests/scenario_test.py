@@ -0,0 +1,101 @@
+# Unit Tests for the ScenarioEngine
+
+# This file contains automated test cases to verify the vectorized
+# scenario generator in scenario.py: seeded reproducibility, block
+# generation and the behaviour of each per-sensor signal model.
+
+
+import unittest
+import numpy as np
+from scenario import ScenarioEngine
+from wire_protocol import STATUS_CODES
+
+
+
+class TestScenarioEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {
+            "Temp": {"low": 50.0, "high": 70.0, "variation": 8.0},
+            "Press": {"low": 65.0, "high": 85.0, "variation": 8.0, "model": "random_walk"},
+            "Speed": {"low": 40.0, "high": 60.0, "variation": 8.0, "model": "sine", "period": 10},
+            "Vib": {"low": 20.0, "high": 35.0, "variation": 8.0, "model": "step_fault", "fault_rate": 0.05},
+            "Hum": {"low": 30.0, "high": 50.0, "variation": 8.0, "model": "spike", "spike_rate": 0.05},
+        }
+
+
+    # --- 1. REPRODUCIBILITY TESTS ---
+    def test_same_seed_same_scenario(self):
+        """Verify two engines with the same seed produce identical frames"""
+        a = ScenarioEngine(self.config, seed=42).next_block(50)
+        b = ScenarioEngine(self.config, seed=42).next_block(50)
+        c = ScenarioEngine(self.config, seed=7).next_block(50)
+
+        np.testing.assert_array_equal(a[0], b[0])
+        self.assertFalse(np.array_equal(a[0], c[0]))
+
+
+    def test_block_shape_and_status(self):
+        """Verify a block has one row per frame and statuses match the limits"""
+        engine = ScenarioEngine(self.config, seed=1)
+        values, statuses = engine.next_block(200)
+
+        self.assertEqual(values.shape, (200, 5))
+        low = np.array([s["low"] for s in self.config.values()])
+        high = np.array([s["high"] for s in self.config.values()])
+        np.testing.assert_array_equal(statuses == STATUS_CODES["LOW ALARM"], values < low)
+        np.testing.assert_array_equal(statuses == STATUS_CODES["HIGH ALARM"], values > high)
+        self.assertEqual(engine.frame_index, 200)
+
+
+    # --- 2. SIGNAL MODEL TESTS ---
+    def test_random_walk_stays_in_range(self):
+        """Verify the walk reflects at the noise range and moves in small steps"""
+        values, _ = ScenarioEngine(self.config, seed=3).next_block(5000)
+        walk = values[:, 1]
+
+        self.assertGreaterEqual(walk.min(), 65.0 - 8.0 - 0.01)
+        self.assertLessEqual(walk.max(), 85.0 + 8.0 + 0.01)
+        self.assertLess(np.abs(np.diff(walk)).max(), 8.0)
+
+
+    def test_sine_crosses_limits(self):
+        """Verify the sine drift periodically crosses both limits"""
+        values, statuses = ScenarioEngine(self.config, seed=3, interval=0.5).next_block(40)
+
+        self.assertIn(STATUS_CODES["HIGH ALARM"], statuses[:, 2])
+        self.assertIn(STATUS_CODES["LOW ALARM"], statuses[:, 2])
+
+
+    def test_faults_and_spikes_alarm_only_during_events(self):
+        """Verify step-fault / spike sensors are in band outside their events"""
+        engine = ScenarioEngine(self.config, seed=5)
+        values, statuses = engine.next_block(1000)
+
+        for col in (3, 4):
+            alarm_ratio = np.mean(statuses[:, col] != STATUS_CODES["OK"])
+            self.assertGreater(alarm_ratio, 0.0)
+            self.assertLess(alarm_ratio, 0.9)
+
+
+    def test_unknown_model_rejected(self):
+        with self.assertRaises(ValueError):
+            ScenarioEngine({"X": {"low": 0, "high": 1, "model": "chaos"}})
+
+
+    # --- 3. OUTPUT FORMAT TESTS ---
+    def test_payload_and_records(self):
+        """Verify a frame converts to legacy dicts and binary records"""
+        engine = ScenarioEngine(self.config, seed=9)
+        values, statuses = engine.next_frame()
+
+        payload = engine.to_payload(values, statuses)
+        records = engine.to_records(values, statuses)
+
+        self.assertEqual([p["name"] for p in payload], list(self.config))
+        np.testing.assert_allclose(records["value"], values, rtol=1e-6)
+        np.testing.assert_array_equal(records["id"], np.arange(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
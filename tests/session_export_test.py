@@ -0,0 +1,88 @@
+# Unit Tests for the streaming session export
+
+# This file contains automated test cases to verify the export
+# formats in session_export.py (legacy JSON, NDJSON, gzip) and
+# progress / cancellation handling.
+
+
+import unittest
+import os
+import json
+import gzip
+import tempfile
+import shutil
+import session_export
+
+
+
+class TestSessionExport(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = [{"timestamp_unix": float(i), "sensors": [{"name": "Temp", "value": i, "status": "OK"}]}
+                        for i in range(1200)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+    # --- 1. FORMAT TESTS ---
+    def test_legacy_json_layout(self):
+        """Verify the streamed JSON matches json.dump(..., indent=4) byte for byte"""
+        path = os.path.join(self.directory, "out.json")
+        written = session_export.export_records(iter(self.records), path, session_export.FORMAT_JSON)
+
+        self.assertEqual(written, 1200)
+        with open(path) as f:
+            self.assertEqual(f.read(), json.dumps(self.records, indent=4))
+
+
+    def test_empty_json_export(self):
+        path = os.path.join(self.directory, "empty.json")
+        session_export.export_records(iter([]), path)
+        with open(path) as f:
+            self.assertEqual(json.load(f), [])
+
+
+    def test_ndjson_and_gzip(self):
+        """Verify NDJSON writes one compact record per line, gzip round-trips"""
+        plain = os.path.join(self.directory, "out.ndjson")
+        packed = os.path.join(self.directory, "out.ndjson.gz")
+        session_export.export_records(iter(self.records), plain, session_export.FORMAT_NDJSON)
+        session_export.export_records(iter(self.records), packed, session_export.FORMAT_NDJSON_GZ)
+
+        with open(plain) as f:
+            lines = f.read().splitlines()
+        with gzip.open(packed, 'rt') as f:
+            self.assertEqual(f.read().splitlines(), lines)
+        self.assertEqual(json.loads(lines[5]), self.records[5])
+        self.assertLess(os.path.getsize(packed), os.path.getsize(plain))
+
+
+    def test_format_for_path(self):
+        self.assertEqual(session_export.format_for_path("a/Session.ndjson.gz"), session_export.FORMAT_NDJSON_GZ)
+        self.assertEqual(session_export.format_for_path("Session.NDJSON"), session_export.FORMAT_NDJSON)
+        self.assertEqual(session_export.format_for_path("Session.txt"), session_export.FORMAT_JSON)
+
+
+    # --- 2. PROGRESS / CANCEL TESTS ---
+    def test_progress_reported(self):
+        calls = []
+        path = os.path.join(self.directory, "out.ndjson")
+        session_export.export_records(iter(self.records), path, session_export.FORMAT_NDJSON,
+                                      total=1200, progress=lambda done, total: calls.append(done))
+
+        self.assertEqual(calls, [500, 1000, 1200])
+
+
+    def test_cancel_removes_partial_file(self):
+        """Verify a cancelled export leaves no truncated file behind"""
+        path = os.path.join(self.directory, "out.json")
+        with self.assertRaises(session_export.ExportCancelled):
+            session_export.export_records(iter(self.records), path, should_stop=lambda: True)
+
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
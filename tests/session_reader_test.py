@@ -0,0 +1,106 @@
+# Unit Tests for the SessionReader
+
+# This file contains automated test cases to verify that the
+# streaming reader in session_reader.py parses legacy JSON arrays
+# and NDJSON exports, writes a reusable sidecar index and seeks
+# to any timestamp.
+
+
+import unittest
+import os
+import json
+import tempfile
+import shutil
+import session_reader
+from session_reader import SessionReader, INDEX_SUFFIX
+from session_export import export_records, FORMAT_JSON, FORMAT_NDJSON, FORMAT_NDJSON_GZ
+
+
+
+class TestSessionReader(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = [
+            {"timestamp_unix": 1000.0 + i * 0.5, "sensors": [{"name": "Temp", "value": i, "unit": "°C"}]}
+            for i in range(250)
+        ]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+    def _export(self, fmt, ext):
+        path = os.path.join(self.directory, "session" + ext)
+        export_records(self.records, path, fmt)
+        return path
+
+
+    # --- 1. STREAMING TESTS ---
+    def test_streams_legacy_json_array(self):
+        """Verify the pretty-printed JSON export is parsed record by record"""
+        path = self._export(FORMAT_JSON, ".json")
+        original_chunk = session_reader.READ_CHUNK
+        session_reader.READ_CHUNK = 97  # force records to span many reads
+        try:
+            records = list(SessionReader(path))
+        finally:
+            session_reader.READ_CHUNK = original_chunk
+
+        self.assertEqual(records, self.records)
+
+
+    def test_streams_ndjson_and_gzip(self):
+        for fmt, ext in ((FORMAT_NDJSON, ".ndjson"), (FORMAT_NDJSON_GZ, ".ndjson.gz")):
+            path = self._export(fmt, ext)
+            self.assertEqual(list(SessionReader(path)), self.records)
+
+
+    def test_empty_array(self):
+        path = os.path.join(self.directory, "empty.json")
+        with open(path, 'w') as f:
+            json.dump([], f)
+        self.assertEqual(list(SessionReader(path)), [])
+
+
+    # --- 2. INDEX TESTS ---
+    def test_full_pass_writes_reusable_index(self):
+        """Verify the first complete read leaves an index that later opens reuse"""
+        path = self._export(FORMAT_JSON, ".json")
+        self.assertIsNone(SessionReader(path).count)
+
+        list(SessionReader(path, index_every=50))
+        reader = SessionReader(path)
+
+        self.assertTrue(os.path.exists(path + INDEX_SUFFIX))
+        self.assertEqual(reader.count, 250)
+        self.assertEqual(reader.start_time, 1000.0)
+        self.assertEqual(reader.end_time, 1000.0 + 249 * 0.5)
+        self.assertEqual(len(reader.index["points"]), 5)
+
+
+    def test_stale_index_ignored(self):
+        """Verify an index is discarded once the session file changes"""
+        path = self._export(FORMAT_NDJSON, ".ndjson")
+        SessionReader(path).build_index()
+        with open(path, 'a') as f:
+            f.write(json.dumps({"timestamp_unix": 5000.0, "sensors": []}) + "\n")
+
+        self.assertIsNone(SessionReader(path).index)
+
+
+    # --- 3. RANDOM ACCESS TESTS ---
+    def test_seek_to_timestamp(self):
+        """Verify replay can start at any timestamp, for every format"""
+        for fmt, ext in ((FORMAT_JSON, ".json"), (FORMAT_NDJSON, ".ndjson"), (FORMAT_NDJSON_GZ, ".ndjson.gz")):
+            path = self._export(fmt, ext)
+            reader = SessionReader(path, index_every=20)
+
+            records = list(reader.records(start_time=1000.0 + 123 * 0.5 - 0.1))
+
+            self.assertEqual(records, self.records[123:])
+            self.assertEqual(reader.count, 250)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+# Unit Tests for the SessionRecorder
+
+# This file contains automated test cases to verify that the
+# disk-backed recorder in session_recorder.py keeps a bounded
+# in-memory tail, rotates chunk files and streams records back,
+# survives write errors, bounds its backlog, only prunes
+# closed sessions nobody reads and lets readers wait for
+# their records without blocking on the writer.
+
+
+import unittest
+import json
+import os
+import tempfile
+import threading
+import shutil
+from unittest import mock
+import session_recorder
+from session_recorder import SessionRecorder
+
+
+
+class TestSessionRecorder(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.recorder = SessionRecorder(self.directory, tail_size=5, chunk_records=10, keep_sessions=2)
+
+    def tearDown(self):
+        self.recorder.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+    def _record(self, count):
+        for i in range(count):
+            self.recorder.append({"timestamp_unix": float(i), "sensors": [{"name": "Temp", "value": i}]})
+
+
+    # --- 1. RECORDING TESTS ---
+    def test_records_stream_back_in_order(self):
+        """Verify every appended record is read back from disk, oldest first"""
+        self._record(25)
+        records = list(self.recorder.iter_records())
+
+        self.assertEqual(len(records), 25)
+        self.assertEqual([r["timestamp_unix"] for r in records], [float(i) for i in range(25)])
+
+
+    def test_chunks_rotate(self):
+        """Verify records are spread over append-only chunk files"""
+        self._record(25)
+        self.recorder.flush()
+
+        self.assertEqual(len(self.recorder.chunk_files()), 3)
+
+
+    def test_memory_tail_is_bounded(self):
+        """Verify only the newest tail_size records stay in memory"""
+        self._record(25)
+
+        self.assertEqual(len(self.recorder.tail), 5)
+        self.assertEqual(self.recorder.tail[-1]["timestamp_unix"], 24.0)
+        self.assertEqual(len(self.recorder), 25)
+
+
+    def test_iter_records_limit(self):
+        self._record(12)
+        self.assertEqual(len(list(self.recorder.iter_records(limit=4))), 4)
+
+
+    # --- 2. SESSION TESTS ---
+    def test_reset_starts_new_session(self):
+        """Verify reset empties the session and prunes old session folders"""
+        self._record(3)
+        for _ in range(3):
+            self.recorder.reset()
+        self._record(2)
+
+        self.assertEqual(len(list(self.recorder.iter_records())), 2)
+        sessions = [n for n in os.listdir(self.directory) if n.startswith("Session_")]
+        self.assertEqual(len(sessions), 2)
+
+
+    def test_live_and_held_sessions_not_pruned(self):
+        """Verify a second recorder in the same directory keeps the first one's live and exported sessions"""
+        self._record(3)
+        self.recorder.flush()
+        exported, _ = self.recorder.snapshot()
+        self.recorder.hold(exported)
+        self.recorder.reset()
+        self.recorder.reset()
+
+        other = SessionRecorder(self.directory, keep_sessions=1)
+        other.reset()
+        other.flush()
+        self.recorder.flush()
+        try:
+            self.assertTrue(os.path.isdir(self.recorder.session_dir))
+            self.assertTrue(os.path.isdir(exported))
+            self.assertEqual(len(list(self.recorder.iter_records(session_dir=exported, limit=3))), 3)
+        finally:
+            other.close()
+
+        self.recorder.release(exported)
+        self.recorder.reset()
+        self.recorder.flush()
+        self.assertFalse(os.path.isdir(exported))
+
+
+    # --- 3. FAILURE TESTS ---
+    def test_write_error_does_not_hang(self):
+        """Verify a failing disk puts the recorder in a failed state instead of killing the writer"""
+        self.recorder.flush()
+        os.makedirs(os.path.join(self.recorder.session_dir, "chunk_000000.ndjson"))  # open() fails
+        self._record(3)
+        self.recorder.flush()
+
+        self.assertTrue(self.recorder.failed)
+        self._record(2)
+        self.recorder.flush()
+        self.assertEqual(self.recorder.dropped, 5)
+
+        self.recorder.reset()  # a new session writes again
+        self._record(2)
+        self.assertEqual(len(list(self.recorder.iter_records())), 2)
+        self.assertFalse(self.recorder.failed)
+
+
+    def test_unserializable_record_skipped(self):
+        self.recorder.append({"timestamp_unix": 0.0, "sensors": object()})
+        self._record(2)
+
+        self.assertEqual(len(list(self.recorder.iter_records())), 2)
+        self.assertEqual((self.recorder.dropped, self.recorder.failed), (1, False))
+
+
+    def test_backlog_is_bounded(self):
+        """Verify records beyond max_pending are dropped and counted while the disk stalls"""
+        stalled, release = threading.Event(), threading.Event()
+        dumps = json.dumps
+
+        def slow_dumps(*args, **kwargs):
+            stalled.set()
+            release.wait(5)
+            return dumps(*args, **kwargs)
+
+        recorder = SessionRecorder(self.directory, max_pending=3)
+        try:
+            with mock.patch.object(session_recorder.json, "dumps", slow_dumps):
+                recorder.append({"timestamp_unix": 0.0})
+                stalled.wait(5)  # the writer holds the first record
+                for i in range(10):
+                    recorder.append({"timestamp_unix": float(i)})
+                self.assertEqual((recorder.count, recorder.dropped), (4, 7))
+                release.set()
+                recorder.flush()
+            self.assertEqual(recorder.stats()["pending"], 0)
+        finally:
+            release.set()
+            recorder.close()
+
+
+    # --- 4. READER TESTS ---
+    def test_snapshot_does_not_wait_for_disk(self):
+        """Verify snapshot returns while the writer stalls and readers only wait for their records"""
+        release = threading.Event()
+        dumps = json.dumps
+
+        def slow_dumps(*args, **kwargs):
+            release.wait(5)
+            return dumps(*args, **kwargs)
+
+        with mock.patch.object(session_recorder.json, "dumps", slow_dumps):
+            self._record(4)
+            session_dir, count = self.recorder.snapshot()  # the writer is still stuck on the first record
+            self.assertEqual(count, 4)
+            self.assertFalse(self.recorder.wait_durable(session_dir, count, timeout=0.05))
+
+            self._record(3)  # after the snapshot, not read
+            result = []
+            reader = threading.Thread(target=lambda: result.extend(self.recorder.iter_records(count, session_dir)))
+            reader.start()
+            release.set()
+            reader.join(5)
+
+        self.assertEqual([r["timestamp_unix"] for r in result], [0.0, 1.0, 2.0, 3.0])
+        self.recorder.reset()  # a closed session never makes a reader wait
+        self.assertEqual(len(list(self.recorder.iter_records(session_dir=session_dir))), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,7 +10,9 @@
 
 import unittest
 import json
-from simulator import load_config, generate_payload
+import asyncio
+from simulator import (load_config, generate_payload, TcpSimulatorServer, SLOW_CLIENT_SKIP, SLOW_CLIENT_DROP,
+                       LoadGeneratorServer, make_virtual_sensors, payload_engine)
 from unittest.mock import patch, mock_open
 
 
@@ -60,6 +62,16 @@ class TestSimulator(unittest.TestCase):
             self.assertIn('timestamp', sensor_data)
             self.assertIn('status', sensor_data)
     
+    def test_payload_model_state_carries_over(self):
+        """Verify calls with the same settings share one engine, so the models evolve between frames"""
+        config = {"Walk": {"low": 0.0, "high": 100.0, "model": "random_walk"}, "Other": {"low": 1.0, "high": 2.0}}
+        generate_payload(config)
+        generate_payload(json.loads(json.dumps(config)))  # equal settings, another dict
+
+        engine = payload_engine(config)
+        self.assertEqual(engine.frame_index, 2)
+        self.assertIsNot(engine, payload_engine({"Walk": config["Walk"]}))
+    
     # --- 3. ALARM LOGIC TESTS ---
     def test_alarm_logic(self):
         """Verify alarm status determination"""
@@ -129,5 +141,94 @@ class TestSimulator(unittest.TestCase):
         self.assertEqual(decoded_payload[0]['name'], "Temp")
 
 
+
+# --- 6. MULTI-CLIENT SERVER TESTS ---
+class TestTcpSimulatorServer(unittest.TestCase):
+    
+    def setUp(self):
+        self.sensors = {"Temp": {"low": 20, "high": 30}, "Press": {"low": 50, "high": 100}}
+    
+    
+    def _run(self, scenario, **options):
+        async def main():
+            server = TcpSimulatorServer("127.0.0.1", 0, self.sensors, 0.01, stats_interval=0, **options)
+            await server.start()
+            try:
+                return await scenario(server)
+            finally:
+                await server.stop()
+        return asyncio.run(main())
+    
+    
+    async def _connect(self, server, count):
+        clients = [await asyncio.open_connection("127.0.0.1", server.port) for _ in range(count)]
+        while len(server.clients) < count:  # wait out the hello timeout
+            await asyncio.sleep(0.05)
+        return clients
+    
+    
+    def test_fan_out_same_bytes(self):
+        """Verify every client receives the identical frame, encoded once"""
+        async def scenario(server):
+            clients = await self._connect(server, 3)
+            server.broadcast(*server.engine.next_frame())
+            lines = [await reader.readline() for reader, _ in clients]
+            for _, writer in clients:
+                writer.close()
+            return lines
+        
+        lines = self._run(scenario)
+        self.assertEqual(len(set(lines)), 1)
+        self.assertEqual(len(json.loads(lines[0])["sensors"]), 2)  # stamped envelope
+    
+    
+    def test_slow_client_skipped(self):
+        """Verify frames are skipped, not queued, when a client's buffer is full"""
+        async def scenario(server):
+            clients = await self._connect(server, 1)
+            server.broadcast(*server.engine.next_frame())
+            session = next(iter(server.clients))
+            clients[0][1].close()
+            return session.frames_sent, session.frames_skipped
+        
+        self.assertEqual(self._run(scenario, max_client_buffer=0, slow_client_policy=SLOW_CLIENT_SKIP), (0, 1))
+    
+    
+    def test_slow_client_dropped(self):
+        """Verify the drop policy disconnects a client whose buffer is full"""
+        async def scenario(server):
+            clients = await self._connect(server, 1)
+            server.broadcast(*server.engine.next_frame())
+            clients[0][1].close()
+            return len(server.clients)
+        
+        self.assertEqual(self._run(scenario, max_client_buffer=0, slow_client_policy=SLOW_CLIENT_DROP), 0)
+
+
+
+# --- 7. LOAD GENERATOR TESTS ---
+class TestLoadGenerator(unittest.TestCase):
+    
+    def test_virtual_sensors_from_templates(self):
+        """Verify N virtual sensors are synthesized from the config templates"""
+        templates = {"Temp": {"low": 20, "high": 30}, "Press": {"low": 50, "high": 100}}
+        sensors = make_virtual_sensors(5, templates)
+        
+        self.assertEqual(list(sensors), ["Temp_0000", "Press_0000", "Temp_0001", "Press_0001", "Temp_0002"])
+        self.assertEqual(sensors["Press_0001"], templates["Press"])
+    
+    
+    def test_generator_reaches_target_rate(self):
+        """Verify a short run generates frames at roughly the target rate"""
+        sensors = make_virtual_sensors(100, {"Temp": {"low": 20, "high": 30}})
+        server = LoadGeneratorServer("127.0.0.1", 0, sensors, fps=100, sensors_per_frame=10,
+                                     duration=0.5, stats_interval=0)
+        report = asyncio.run(server.serve_forever())
+        
+        self.assertEqual(report["sensors_per_frame"], 10)
+        self.assertGreater(report["achieved_ratio"], 0.8)
+        self.assertIn("cpu_percent", report)
+
+
 if __name__ == '__main__':
     unittest.main()
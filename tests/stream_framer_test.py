@@ -0,0 +1,78 @@
+# Unit Tests for the StreamFramer
+
+# This file contains automated test cases to verify that the
+# incremental framer in stream_framer.py reassembles lines that
+# straddle read boundaries and grows for frames bigger than its buffer.
+
+
+import unittest
+import json
+import socket
+from stream_framer import StreamFramer
+
+
+
+class TestStreamFramer(unittest.TestCase):
+
+    # --- 1. FRAMING TESTS ---
+    def test_line_split_across_reads(self):
+        """Verify a line delivered in two pieces is emitted once, complete"""
+        framer = StreamFramer(buffer_size=64)
+        framer.feed(b'[{"name": "Temp", ')
+        self.assertEqual(list(framer.frames()), [])
+
+        framer.feed(b'"value": 55.0}]\n')
+        frames = [bytes(f) for f in framer.frames()]
+        self.assertEqual(frames, [b'[{"name": "Temp", "value": 55.0}]'])
+        self.assertEqual(len(framer), 0)
+
+
+    def test_multiple_lines_in_one_read(self):
+        """Verify several lines (and a trailing partial) in one chunk"""
+        framer = StreamFramer()
+        framer.feed(b'[1]\n[2]\n\n[3')
+
+        self.assertEqual([bytes(f) for f in framer.frames()], [b'[1]', b'[2]'])
+        framer.feed(b']\n')
+        self.assertEqual([bytes(f) for f in framer.frames()], [b'[3]'])
+
+
+    def test_frame_larger_than_buffer(self):
+        """Verify the buffer grows for a frame bigger than its initial size"""
+        framer = StreamFramer(buffer_size=16)
+        line = json.dumps([{"name": f"S{i}", "value": i} for i in range(200)]).encode()
+
+        for i in range(0, len(line), 7):
+            framer.feed(line[i:i + 7])
+        framer.feed(b'\n')
+
+        self.assertEqual(json.loads(str(next(framer.frames()), 'utf-8'))[199]['value'], 199)
+
+
+    def test_max_frame_size(self):
+        framer = StreamFramer(buffer_size=8, max_frame_size=16)
+        with self.assertRaises(ValueError):
+            framer.feed(b'x' * 32)
+
+
+    # --- 2. SOCKET TESTS ---
+    def test_recv_into_from_socket(self):
+        """Verify recv_into reassembles lines sent in small pieces over a socket"""
+        a, b = socket.socketpair()
+        framer = StreamFramer(buffer_size=32)
+        payload = b''.join(json.dumps([i] * 20).encode() + b'\n' for i in range(5))
+        try:
+            a.sendall(payload)
+            a.close()
+
+            decoded = []
+            while framer.recv_into(b):
+                decoded.extend(json.loads(str(f, 'utf-8')) for f in framer.frames())
+        finally:
+            b.close()
+
+        self.assertEqual([d[0] for d in decoded], [0, 1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# Unit Tests for the connection supervisor
+
+# This file contains automated test cases to verify that
+# Backoff in supervisor.py grows reconnect delays exponentially
+# with bounded jitter, and that ConnectionSupervisor counts
+# reconnects and measures the downtime between connections.
+
+
+import unittest
+import random
+from supervisor import Backoff, ConnectionSupervisor
+
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+
+class TestBackoff(unittest.TestCase):
+
+    # --- 1. DELAY TESTS ---
+    def test_delays_double_up_to_maximum(self):
+        backoff = Backoff(initial=0.1, maximum=1.0, jitter=0.0)
+        self.assertEqual([round(backoff.next_delay(), 3) for _ in range(6)], [0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+        backoff.reset()
+        self.assertEqual(backoff.next_delay(), 0.1)
+
+
+    def test_jitter_only_shortens_delays(self):
+        """Verify jittered delays stay within [base * (1 - jitter), base]"""
+        backoff = Backoff(initial=1.0, maximum=1.0, jitter=0.5, rng=random.Random(3))
+        delays = [backoff.next_delay() for _ in range(200)]
+
+        self.assertTrue(all(0.5 <= d <= 1.0 for d in delays))
+        self.assertGreater(len(set(delays)), 100)
+
+
+
+
+class TestConnectionSupervisor(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.supervisor = ConnectionSupervisor(Backoff(initial=0.1, jitter=0.0), clock=self.clock)
+
+
+    # --- 1. RECONNECT TESTS ---
+    def test_first_connection_is_not_a_reconnect(self):
+        self.supervisor.retry_delay()  # simulator not up yet
+        self.assertIsNone(self.supervisor.connected())
+        self.assertEqual(self.supervisor.stats(),
+                         {"connected": True, "reconnects": 0, "failed_attempts": 0, "downtime_s": 0.0, "last_gap_s": None})
+
+
+    def test_reconnect_measures_gap_and_resets_backoff(self):
+        """Verify the outage length is reported and the next outage starts at the initial delay"""
+        self.supervisor.connected()
+        self.assertTrue(self.supervisor.disconnected())
+        self.assertFalse(self.supervisor.disconnected())  # already down
+
+        self.assertEqual([round(self.supervisor.retry_delay(), 3) for _ in range(3)], [0.1, 0.2, 0.4])
+        self.clock.now += 0.7
+        self.assertAlmostEqual(self.supervisor.downtime(), 0.7)
+
+        self.assertAlmostEqual(self.supervisor.connected(), 0.7)
+        self.assertEqual(self.supervisor.reconnects, 1)
+        self.assertEqual(round(self.supervisor.retry_delay(), 3), 0.1)
+
+
+    def test_downtime_accumulates(self):
+        for gap in (0.25, 0.5):
+            self.supervisor.connected()
+            self.clock.now += 10
+            self.supervisor.disconnected()
+            self.clock.now += gap
+        self.supervisor.connected()
+
+        stats = self.supervisor.stats()
+        self.assertEqual(stats["reconnects"], 2)
+        self.assertEqual(stats["downtime_s"], 0.75)
+        self.assertEqual(stats["last_gap_s"], 0.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
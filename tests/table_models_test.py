@@ -0,0 +1,165 @@
+# Unit Tests for the table models
+
+# This file contains automated test cases to verify that the
+# AlarmHistoryModel in table_models.py keeps a bounded, newest-first
+# alarm history, batches view notifications per flush and spills
+# evicted rows to the overflow file, and that LiveSensorModel only
+# reports the live table cells that actually changed.
+
+
+import unittest
+import os
+import tempfile
+import shutil
+from PyQt6.QtCore import QCoreApplication, Qt
+from table_models import AlarmHistoryModel, LiveSensorModel
+
+
+
+class TestAlarmHistoryModel(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+    def _add(self, model, count, start=0):
+        for i in range(start, start + count):
+            model.append(f"00:00:{i % 60:02d}", f"Sensor_{i % 3}", float(i), "HIGH ALARM" if i % 2 else "LOW ALARM")
+
+
+    # --- 1. HISTORY TESTS ---
+    def test_newest_first_after_flush(self):
+        """Verify queued alarms appear only after flush, newest in row 0"""
+        model = AlarmHistoryModel(capacity=10)
+        self._add(model, 3)
+        self.assertEqual(model.rowCount(), 0)
+
+        self.assertEqual(model.flush(), 3)
+        self.assertEqual(model.rowCount(), 3)
+        self.assertEqual(model.row(0), ("00:00:02", "Sensor_2", 2.0, "LOW ALARM"))
+        self.assertEqual(model.data(model.index(2, 2)), "0.00")
+        self.assertEqual(model.headerData(3, Qt.Orientation.Horizontal), "Type")
+
+
+    def test_one_insert_notification_per_flush(self):
+        """Verify a frame's alarms reach the view in a single rowsInserted batch"""
+        model = AlarmHistoryModel(capacity=100)
+        inserts = []
+        model.rowsInserted.connect(lambda parent, first, last: inserts.append((first, last)))
+
+        self._add(model, 25)
+        model.flush()
+        model.flush()  # nothing queued, no notification
+
+        self.assertEqual(inserts, [(0, 24)])
+
+
+    def test_capacity_is_bounded(self):
+        """Verify the oldest alarms drop off the bottom once the ring is full"""
+        model = AlarmHistoryModel(capacity=10)
+        for frame in range(5):
+            self._add(model, 4, start=frame * 4)
+            model.flush()
+
+        self.assertEqual(model.rowCount(), 10)
+        self.assertEqual(model.row(0)[2], 19.0)
+        self.assertEqual(model.row(9)[2], 10.0)
+
+        self._add(model, 25, start=100)  # more than the capacity in one frame
+        model.flush()
+        self.assertEqual([model.row(r)[2] for r in (0, 9)], [124.0, 115.0])
+
+
+    def test_clear(self):
+        model = AlarmHistoryModel(capacity=10)
+        self._add(model, 5)
+        model.flush()
+        model.clear()
+        self.assertEqual(model.rowCount(), 0)
+
+
+    # --- 2. OVERFLOW TESTS ---
+    def test_evicted_rows_spill_to_disk(self):
+        """Verify rows leaving the ring are appended to the overflow CSV, oldest first"""
+        path = os.path.join(self.directory, "alarms.csv")
+        model = AlarmHistoryModel(capacity=5, overflow_path=path)
+        self._add(model, 8)
+        model.flush()
+        self._add(model, 3, start=8)
+        model.flush()
+        model.close()
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(model.overflow_count, 6)
+        self.assertEqual(lines[0], "00:00:00,Sensor_0,0.00,LOW ALARM")
+        self.assertEqual(lines[-1], "00:00:05,Sensor_2,5.00,HIGH ALARM")
+
+
+
+
+class TestLiveSensorModel(unittest.TestCase):
+
+    def setUp(self):
+        self.app = QCoreApplication.instance() or QCoreApplication([])
+        self.model = LiveSensorModel(["Temp", "Press"])
+        self.changes = []
+        self.model.dataChanged.connect(
+            lambda top, bottom, roles: self.changes.append((top.row(), top.column(), bottom.column(), len(roles))))
+
+
+    # --- 1. UPDATE TESTS ---
+    def test_updates_coalesce_until_flush(self):
+        """Verify only the latest reading per sensor is applied on flush"""
+        self.model.update("Temp", 60.0, "OK", "12:00:00")
+        self.model.update("Temp", 61.0, "OK", "12:00:00")
+
+        self.assertEqual(self.changes, [])
+        self.assertEqual(self.model.flush(), 1)
+        self.assertEqual(self.model.data(self.model.index(0, 1)), "61.00")
+        self.assertEqual(len(self.changes), 1)
+
+
+    def test_only_changed_cells_reported(self):
+        """Verify dataChanged spans just the cells whose text or color changed"""
+        self.model.update("Temp", 60.0, "OK", "12:00:00")
+        self.model.flush()
+        self.changes.clear()
+
+        self.model.update("Temp", 60.0, "OK", "12:00:00")  # identical
+        self.model.flush()
+        self.assertEqual(self.changes, [])
+
+        self.model.update("Temp", 62.5, "OK", "12:00:00")  # reading only
+        self.model.flush()
+        self.assertEqual(self.changes, [(0, 1, 1, 1)])
+
+        self.model.update("Temp", 75.0, "HIGH ALARM", "12:00:01")  # color change repaints the row
+        self.model.flush()
+        self.assertEqual(self.changes[-1], (0, 0, 3, 2))
+        self.assertEqual(self.model.data(self.model.index(0, 3)), "FAULT")
+        self.assertEqual(self.model.data(self.model.index(0, 0), Qt.ItemDataRole.BackgroundRole),
+                         LiveSensorModel.ALARM_BACKGROUND)
+
+
+    def test_new_sensor_adds_row(self):
+        self.model.update("Flow", 1.0, "OK", "12:00:00")
+        self.model.flush()
+        self.assertEqual(self.model.rowCount(), 3)
+        self.assertEqual(self.model.row_of("Flow"), 2)
+
+
+    def test_clear_blanks_rows(self):
+        self.model.update("Temp", 60.0, "OK", "12:00:00")
+        self.model.flush()
+        self.model.clear()
+        self.assertEqual(self.model.data(self.model.index(0, 1)), "")
+        self.assertIsNone(self.model.data(self.model.index(0, 1), Qt.ItemDataRole.BackgroundRole))
+
+
+if __name__ == '__main__':
+    unittest.main()
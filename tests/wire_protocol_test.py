@@ -0,0 +1,98 @@
+# Unit Tests for the binary wire protocol
+
+# This file contains automated test cases to verify the
+# encoding, decoding and handshake helpers in wire_protocol.py.
+
+
+import unittest
+import asyncio
+import json
+import socket
+import wire_protocol
+from simulator import generate_payload
+from stream_framer import StreamFramer
+
+
+
+class TestWireProtocol(unittest.TestCase):
+
+    def setUp(self):
+        self.config = {"Temp": {"low": 20, "high": 30}, "Press": {"low": 50, "high": 100}}
+        self.names = list(self.config)
+        self.name_to_id = {name: i for i, name in enumerate(self.names)}
+
+
+    # --- 1. ROUND TRIP TESTS ---
+    def test_binary_round_trip(self):
+        """Verify a payload survives encode -> frame -> decode"""
+        payload = generate_payload(self.config)
+        frame = wire_protocol.encode_binary_frame(wire_protocol.payload_to_records(payload, self.name_to_id), 7, 123)
+
+        framer = StreamFramer()
+        framer.feed(frame)
+        seq, sent_ns, records = wire_protocol.decode_binary_frame(
+            next(framer.length_prefixed_frames(wire_protocol.FRAME_HEADER)))
+        decoded = wire_protocol.records_to_sensor_list(records, self.names)
+
+        self.assertEqual((seq, sent_ns), (7, 123))  # latency instrumentation, once per frame
+
+        for sent, received in zip(payload, decoded):
+            self.assertEqual(sent['name'], received['name'])
+            self.assertEqual(sent['status'], received['status'])
+            self.assertAlmostEqual(sent['value'], received['value'], places=2)
+            self.assertEqual(len(received['timestamp']), 8)  # HH:MM:SS
+            self.assertNotIn('seq', received)
+
+
+    def test_json_envelope(self):
+        """Verify stamped JSON frames carry seq / sent_ns once and plain arrays still decode"""
+        payload = generate_payload(self.config)
+        frame = wire_protocol.parse_json_frame(json.loads(wire_protocol.encode_json_frame(payload, 3, 456)))
+
+        self.assertEqual((frame.seq, frame.sent_ns, list(frame)), (3, 456, payload))
+        self.assertEqual(wire_protocol.parse_json_frame(json.loads(wire_protocol.encode_json_frame(payload))), payload)
+
+
+    def test_binary_frame_is_compact(self):
+        """Verify a binary frame is much smaller than the JSON frame"""
+        payload = generate_payload(self.config)
+        binary = wire_protocol.encode_binary_frame(wire_protocol.payload_to_records(payload, self.name_to_id))
+        text = wire_protocol.encode_json_frame(payload)
+
+        self.assertEqual(len(binary), 4 + wire_protocol.FRAME_STAMP.size + 2 * wire_protocol.RECORD_DTYPE.itemsize)
+        self.assertLess(len(binary) * 3, len(text))
+
+
+    def test_truncated_payload_rejected(self):
+        with self.assertRaises(ValueError):
+            wire_protocol.decode_binary_frame(b"\x00" * (wire_protocol.FRAME_STAMP.size + wire_protocol.RECORD_DTYPE.itemsize + 1))
+
+
+    # --- 2. HANDSHAKE TESTS ---
+    def _read_hello(self, client_bytes, timeout=wire_protocol.HELLO_TIMEOUT):
+        async def scenario():
+            server, client = socket.socketpair()
+            try:
+                client.sendall(client_bytes)
+                reader, writer = await asyncio.open_connection(sock=server)
+                protocol = await wire_protocol.read_hello_async(reader, timeout)
+                writer.close()
+                return protocol
+            finally:
+                client.close()
+        return asyncio.run(scenario())
+
+
+    def test_hello_negotiates_binary(self):
+        """Verify the server reads a binary hello from the client"""
+        hello = wire_protocol.hello_line(wire_protocol.PROTOCOL_BINARY)
+        self.assertEqual(self._read_hello(hello), wire_protocol.PROTOCOL_BINARY)
+
+
+    def test_silent_client_defaults_to_json(self):
+        """Verify legacy clients that send nothing get JSON after the hello timeout"""
+        self.assertEqual(self._read_hello(b"", timeout=0.05), wire_protocol.PROTOCOL_JSON)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,7 +9,18 @@
 import unittest
 from PyQt6.QtTest import QTest
 from PyQt6.QtCore import QCoreApplication
-from sensor_worker import SensorWorker
+import time
+import os
+import socket
+import threading
+import tempfile
+import shutil
+from unittest import mock
+from sensor_worker import SensorWorker, FrameBatcher, OfflineReplayWorker
+from alarm_engine import AlarmEngine
+from ingest_core import IngestCore, SensorStore
+from session_export import export_records
+from session_reader import SessionReader
 from simulator import load_config
 
 
@@ -28,7 +39,7 @@ class TestSensorWorker(unittest.TestCase):
         
         self.assertIsNotNone(worker)
         self.assertFalse(worker.isRunning())
-        self.assertTrue(worker._run_flag)
+        self.assertTrue(worker.source._run_flag)
     
     
     # --- 2. SIGNAL EMISSION TESTS ---
@@ -71,6 +82,182 @@ class TestSensorWorker(unittest.TestCase):
         worker.wait(5000)  # 5-second timeout
         
         self.assertFalse(worker.isRunning())
+    
+    
+    def test_reconnects_after_simulator_restart(self):
+        """Verify the same worker reconnects within a second when the simulator drops the connection"""
+        listener = socket.create_server(("127.0.0.1", 0))
+        connection = {**self.config['connection'], "host": "127.0.0.1", "tcp_port": listener.getsockname()[1],
+                      "protocol": "json", "batch_interval_ms": 10, "reconnect_initial_s": 0.05}
+        
+        reconnected, stopped = threading.Event(), threading.Event()
+        
+        def simulator():
+            for attempt in range(2):  # the first connection is closed, as on a simulator restart
+                client, _ = listener.accept()
+                client.sendall(b'[{"name": "Temp", "value": 1.0, "status": "OK"}]\n')
+                time.sleep(0.2)
+                if attempt:
+                    reconnected.set()
+                    stopped.wait(5)
+                client.close()
+        
+        thread = threading.Thread(target=simulator, daemon=True)
+        thread.start()
+        worker = SensorWorker(connection)
+        frames = []
+        worker.batch_received.connect(frames.extend)
+        worker.start()
+        reconnected.wait(5)
+        worker.stop()
+        worker.wait(5000)
+        stopped.set()
+        QTest.qWait(50)  # deliver the queued batches
+        listener.close()
+        
+        stats = worker.supervisor.stats()
+        self.assertEqual(stats["reconnects"], 1)
+        self.assertLess(stats["last_gap_s"], 1.0)
+        self.assertEqual(len(frames), 2)
+    
+    
+    # --- 4. FRAME BATCHING TESTS ---
+    def test_batch_flushes_on_frame_count(self):
+        """Verify a batch is due once max_frames frames are queued"""
+        batcher = FrameBatcher(interval_ms=10000, max_frames=3)
+        
+        self.assertFalse(batcher.add([1]))
+        self.assertFalse(batcher.add([2]))
+        self.assertTrue(batcher.add([3]))
+        self.assertEqual(batcher.take(), [[1], [2], [3]])
+        self.assertIsNone(batcher.time_left())
+    
+    
+    def test_batch_flushes_on_interval(self):
+        """Verify a partial batch becomes due after the batch interval"""
+        batcher = FrameBatcher(interval_ms=20, max_frames=100)
+        batcher.add([1])
+        
+        self.assertFalse(batcher.due())
+        time.sleep(0.03)
+        self.assertTrue(batcher.due())
+
+
+
+
+class TestOfflineReplayWorker(unittest.TestCase):
+    
+    def setUp(self):
+        self.app = QCoreApplication([])
+        self.directory = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+    
+    
+    def _session(self, count, spacing):
+        path = os.path.join(self.directory, "session.ndjson")
+        records = [{"timestamp_unix": 1000.0 + i * spacing, "sensors": [{"name": "Temp", "value": i}]} for i in range(count)]
+        export_records(records, path, "ndjson")
+        return path
+    
+    
+    def _replay(self, worker, timeout_ms=5000):
+        values = []
+        worker.batch_received.connect(lambda batch: values.extend(frame[0]["value"] for frame in batch))
+        worker.start()
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while worker.isRunning() and time.monotonic() < deadline:
+            QTest.qWait(20)
+        QTest.qWait(50)  # deliver the last queued batch
+        return values
+    
+    
+    # --- 1. PACING TESTS ---
+    def test_replay_follows_recorded_timestamps(self):
+        """Verify entries are paced by timestamp_unix divided by the speed"""
+        worker = OfflineReplayWorker(self._session(6, 0.5), speed=10.0)
+        started = time.monotonic()
+        values = self._replay(worker)
+        elapsed = time.monotonic() - started
+        
+        self.assertEqual(values, list(range(6)))
+        self.assertGreaterEqual(elapsed, 0.25)  # 2.5 recorded seconds at 10x
+        self.assertLess(elapsed, 2.0)
+    
+    
+    def test_max_speed_replays_without_pacing(self):
+        worker = OfflineReplayWorker(self._session(2000, 0.5), speed=OfflineReplayWorker.SPEED_MAX)
+        values = self._replay(worker, timeout_ms=3000)
+        
+        self.assertEqual(values, list(range(2000)))
+    
+    
+    def test_alarms_independent_of_speed(self):
+        """Verify rate and debounce alarms follow the recorded times, not the replay speed"""
+        values = [50, 50, 60, 70, 80, 84, 86, 95, 96, 97, 97, 97, 93, 89, 89, 89, 89]  # a climb, a high alarm, back
+        records = [{"timestamp_unix": 1000.0 + i * 0.0625,
+                    "sensors": [{"name": "Temp", "value": v, "timestamp": "12:00:00", "status": "OK"}]}
+                   for i, v in enumerate(values)]
+        path = os.path.join(self.directory, "alarms.ndjson")
+        export_records(records, path, "ndjson")
+        
+        transitions = {}
+        for speed in (1.0, OfflineReplayWorker.SPEED_MAX):
+            limits = {"Temp": {"low": 0.0, "high": 90.0, "rate_limit": 100.0, "debounce_s": 0.125}}
+            core = IngestCore(SensorStore(limits, alarms=AlarmEngine(limits)))
+            changes = transitions[speed] = []
+            worker = OfflineReplayWorker(path, speed=speed)
+            worker.batch_received.connect(lambda batch: changes.extend(
+                [(u.alarms, u.cleared) for u in core.process_batch(batch)]))
+            self._replay(worker)
+            self.assertEqual(core.frames, len(values))
+        
+        self.assertEqual(transitions[1.0], transitions[OfflineReplayWorker.SPEED_MAX])
+        statuses = [alarm[3] for alarms, _ in transitions[1.0] for alarm in alarms]
+        self.assertEqual(statuses, ["RATE ALARM", "HIGH ALARM"])
+        self.assertEqual(sum(len(cleared) for _, cleared in transitions[1.0]), 1)
+    
+    
+    # --- 2. CONTROL TESTS ---
+    def test_seek_jumps_to_timestamp(self):
+        """Verify a seek continues the replay from the requested recorded time"""
+        worker = OfflineReplayWorker(self._session(40, 1.0), speed=1.0)
+        worker.seek(1035.0)
+        values = self._replay(worker, timeout_ms=8000)
+        
+        self.assertEqual(values, list(range(35, 40)))
+    
+    
+    def test_index_built_once(self):
+        """Verify a seek during indexing scans forward instead of indexing the file a second time"""
+        saves = []
+        save_index = SessionReader._save_index
+        def counting_save(reader, *args):
+            saves.append(threading.current_thread().name)
+            save_index(reader, *args)
+
+        with mock.patch.object(SessionReader, "_save_index", counting_save):
+            worker = OfflineReplayWorker(self._session(3000, 1.0), speed=OfflineReplayWorker.SPEED_MAX)
+            worker.seek(3995.0)
+            values = self._replay(worker)
+
+        self.assertEqual(values, list(range(2995, 3000)))
+        self.assertEqual(saves, ["ReplayIndexer"])
+    
+    
+    def test_pause_blocks_and_stop_wakes(self):
+        """Verify a paused replay emits nothing and stops promptly"""
+        worker = OfflineReplayWorker(self._session(10, 0.1), speed=1.0)
+        worker.toggle_pause()
+        values = []
+        worker.batch_received.connect(values.extend)
+        worker.start()
+        QTest.qWait(300)
+        
+        self.assertEqual(values, [])
+        worker.stop()
+        self.assertTrue(worker.wait(1000))
 
 
 if __name__ == '__main__':
@@ -0,0 +1,199 @@
+import asyncio
+import json
+import struct
+import time
+
+import numpy as np
+
+
+# --- 1. PROTOCOL CONSTANTS ---
+# JSON (default): one newline-terminated JSON frame per line, an array of sensor dicts or the
+# simulator's envelope {"seq": ..., "sent_ns": ..., "sensors": [...]}.
+# Binary: <uint32 payload length>, the frame stamp, then packed records, one per sensor.
+
+PROTOCOL_JSON = "json"
+PROTOCOL_BINARY = "binary"
+
+STATUS_NAMES = ["OK", "LOW ALARM", "HIGH ALARM"]
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+
+# Packed record: sensor id (index in the server's sensor list), value, sample timestamp, status enum
+RECORD_DTYPE = np.dtype([
+    ("id", "<u2"),
+    ("value", "<f4"),
+    ("timestamp_ns", "<i8"),
+    ("status", "u1"),
+])
+
+FRAME_HEADER = struct.Struct("<I")  # payload length in bytes
+FRAME_STAMP = struct.Struct("<Iq")  # frame sequence number and send time (unix ns), once per frame
+
+HELLO_TIMEOUT = 0.3  # how long the server waits for a client hello before defaulting to JSON
+
+
+
+# --- 2. HANDSHAKE ---
+# The client may send {"protocol": "binary"} right after connecting. The server answers
+# with {"protocol": "binary", "sensors": [...]} so ids can be mapped back to names.
+# Clients that send nothing (or servers that ignore the hello) keep using JSON.
+
+def hello_line(protocol):
+    return (json.dumps({"protocol": protocol}) + "\n").encode('utf-8')
+
+
+def hello_reply(sensor_names):
+    return (json.dumps({"protocol": PROTOCOL_BINARY, "sensors": list(sensor_names)}) + "\n").encode('utf-8')
+
+
+def parse_hello(line):
+    """Return the protocol requested by a hello line, JSON for anything unexpected."""
+    try:
+        request = json.loads(line)
+    except ValueError:
+        return PROTOCOL_JSON
+    if isinstance(request, dict) and request.get("protocol") == PROTOCOL_BINARY:
+        return PROTOCOL_BINARY
+    return PROTOCOL_JSON
+
+
+async def read_hello_async(reader, timeout=HELLO_TIMEOUT):
+    """Server side: wait briefly for a hello line on an asyncio stream."""
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except (asyncio.TimeoutError, ValueError):
+        return PROTOCOL_JSON
+    if not line.endswith(b"\n"):
+        return PROTOCOL_JSON
+    return parse_hello(line)
+
+
+
+# --- 3. ENCODING ---
+
+def payload_to_records(payload, name_to_id, timestamp_ns=None):
+    """Pack a list of sensor dicts (generate_payload output) into a record array."""
+    records = np.empty(len(payload), dtype=RECORD_DTYPE)
+    records["id"] = [name_to_id[sensor["name"]] for sensor in payload]
+    records["value"] = [sensor["value"] for sensor in payload]
+    records["timestamp_ns"] = time.time_ns() if timestamp_ns is None else timestamp_ns
+    records["status"] = [STATUS_CODES.get(sensor["status"], 0) for sensor in payload]
+    return records
+
+
+def encode_binary_frame(records, seq=0, sent_ns=None):
+    stamp = FRAME_STAMP.pack(seq, time.time_ns() if sent_ns is None else sent_ns)
+    return FRAME_HEADER.pack(len(stamp) + records.nbytes) + stamp + records.tobytes()
+
+
+def json_envelope(payload, seq, sent_ns):
+    """A JSON frame carrying the latency stamps once, next to the sensor list."""
+    return {"seq": seq, "sent_ns": sent_ns, "sensors": payload}
+
+
+def encode_json_frame(payload, seq=None, sent_ns=None):
+    """A JSON line, the plain sensor array unless a sequence number is given."""
+    frame = payload if seq is None else json_envelope(payload, seq, time.time_ns() if sent_ns is None else sent_ns)
+    return (json.dumps(frame) + "\n").encode('utf-8')
+
+
+
+# --- 4. DECODING ---
+
+def decode_binary_frame(payload):
+    """(seq, sent_ns, records) of a binary frame payload.
+
+    The record array is a zero-copy view, valid as long as the buffer is.
+    """
+    size = len(payload) - FRAME_STAMP.size
+    if size < 0 or size % RECORD_DTYPE.itemsize:
+        raise ValueError(f"Binary frame of {len(payload)} bytes is not a stamp and whole records")
+    seq, sent_ns = FRAME_STAMP.unpack_from(payload)
+    return seq, sent_ns, np.frombuffer(payload, dtype=RECORD_DTYPE, offset=FRAME_STAMP.size)
+
+
+def parse_json_frame(message):
+    """Sensor list of a parsed JSON frame, a SensorFrame for the simulator's envelope."""
+    if isinstance(message, dict):
+        return SensorFrame(message["sensors"], message.get("seq"), message.get("sent_ns"))
+    return message
+
+
+def records_to_sensor_list(records, sensor_names):
+    """Expand a record array into the sensor dict list the dashboard consumes."""
+    names = [sensor_names[i] for i in records["id"].tolist()]
+    values = records["value"].astype(np.float64).round(2).tolist()
+    statuses = [STATUS_NAMES[code] for code in records["status"].tolist()]
+
+    # All sensors in a frame normally share one timestamp, format each distinct second once
+    seconds = (records["timestamp_ns"] // 1_000_000_000).tolist()
+    labels = {s: time.strftime("%H:%M:%S", time.localtime(s)) for s in set(seconds)}
+
+    return [
+        {"name": name, "value": value, "timestamp": labels[sec], "status": status}
+        for name, value, sec, status in zip(names, values, seconds, statuses)
+    ]
+
+
+
+# --- 5. DECODED FRAMES ---
+# Both carry the frame stamps (seq, sent_ns; None when the feed sends none) as attributes,
+# the sensor dicts themselves never do: they are archived as they are.
+
+# Sensor dict list of a JSON envelope frame, or of a replayed entry with its recorded
+# timestamp_unix.
+class SensorFrame(list):
+    __slots__ = ("seq", "sent_ns", "timestamp_unix")
+
+    def __init__(self, sensors=(), seq=None, sent_ns=None, timestamp_unix=None):
+        super().__init__(sensors)
+        self.seq = seq
+        self.sent_ns = sent_ns
+        self.timestamp_unix = timestamp_unix
+
+
+# A binary frame kept as its record array. The ingest pipeline reads the names,
+# values and timestamps as columns; the sensor dict list of the JSON protocol is
+# only built when a legacy consumer iterates or indexes the frame (data_received
+# listeners, the session archive on its writer thread).
+class RecordFrame:
+    __slots__ = ("records", "sensor_names", "seq", "sent_ns", "_columns", "_sensors")
+
+    def __init__(self, records, sensor_names, seq=None, sent_ns=None):
+        self.records = records  # owned copy, the framer buffer is reused on the next read
+        self.sensor_names = sensor_names
+        self.seq = seq
+        self.sent_ns = sent_ns
+        self._columns = None
+        self._sensors = None
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.sensor_list())
+
+    def __getitem__(self, index):
+        return self.sensor_list()[index]
+
+    @property
+    def first_name(self):
+        return self.sensor_names[int(self.records["id"][0])]
+
+    def columns(self):
+        """(names, values, timestamp labels) of the records, values rounded like the JSON feed."""
+        if self._columns is None:
+            records = self.records
+            names = [self.sensor_names[i] for i in records["id"].tolist()]
+            values = records["value"].astype(np.float64).round(2).tolist()
+            seconds = (records["timestamp_ns"] // 1_000_000_000).tolist()
+            labels = {s: time.strftime("%H:%M:%S", time.localtime(s)) for s in set(seconds)}
+            self._columns = (names, values, [labels[s] for s in seconds])
+        return self._columns
+
+    def sensor_list(self):
+        if self._sensors is None:
+            self._sensors = records_to_sensor_list(self.records, self.sensor_names)
+        return self._sensors
+
+    def to_json(self):
+        return self.sensor_list()